@@ -0,0 +1,58 @@
+# benchmarks/bench_game_hydration.py
+"""
+Mede quantas consultas e quanto tempo as listas de jogos levam conforme a
+biblioteca cresce. O número de consultas deve ficar constante (sem N+1).
+
+Uso, na raiz do projeto:  python -m benchmarks.bench_game_hydration [tamanhos...]
+"""
+
+import sys
+import time
+import logging
+
+from core.game_manager import GameManager
+from tests.support import temporary_database, seed_library, capture_statements
+
+DEFAULT_SIZES = (100, 1000, 3000)
+REPEATS = 5
+
+
+def measure(size):
+    with temporary_database() as conn:
+        seed_library(conn, size)
+        manager = GameManager()
+        results = {}
+        for name, call in (("get_all_games", manager.get_all_games),
+                           ("get_filtered_games", lambda: manager.get_filtered_games("", sort_by="Jogado Recentemente")),
+                           ("get_favorite_games", manager.get_favorite_games),
+                           ("get_recent_games", manager.get_recent_games)):
+            with capture_statements(conn) as statements:
+                call()
+            queries = sum(1 for sql in statements if sql.lstrip().upper().startswith("SELECT"))
+            started = time.perf_counter()
+            for _ in range(REPEATS):
+                call()
+            results[name] = (queries, (time.perf_counter() - started) / REPEATS * 1000)
+        return results
+
+
+def main(argv):
+    logging.disable(logging.INFO)
+    sizes = [int(arg) for arg in argv] or DEFAULT_SIZES
+    queries_by_method = {}
+    print(f"{'jogos':>6}  {'método':<20} {'consultas':>9} {'tempo (ms)':>11}")
+    for size in sizes:
+        for name, (queries, elapsed_ms) in measure(size).items():
+            queries_by_method.setdefault(name, set()).add(queries)
+            print(f"{size:>6}  {name:<20} {queries:>9} {elapsed_ms:>11.1f}")
+
+    growing = [name for name, counts in queries_by_method.items() if len(counts) > 1]
+    if growing:
+        print(f"ERRO: o número de consultas cresce com a biblioteca em: {', '.join(growing)}")
+        return 1
+    print("OK: número de consultas constante em todos os métodos.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,113 @@
+# benchmarks/bench_igdb_multiquery.py
+"""
+Compara a busca de metadados um jogo por vez (search_games) com a busca em
+lote por /multiquery (search_games_many), contra um servidor local que imita o
+IGDB com uma latência fixa por requisição. Os dois caminhos passam pelo mesmo
+limitador de 4 requisições por segundo do cliente.
+
+Uso, na raiz do projeto:
+    python -m benchmarks.bench_igdb_multiquery [--games 500] [--latency 0.2] [--skip-sequential]
+"""
+
+import sys
+import json
+import math
+import time
+import types
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from tests.support import temporary_database
+
+try:
+    import config  # noqa: F401
+except ImportError:
+    # O config.py com as credenciais da Twitch é local de cada instalação; o benchmark não chega a usá-las
+    sys.modules["config"] = types.SimpleNamespace(TWITCH_CLIENT_ID="benchmark", TWITCH_CLIENT_SECRET="benchmark")
+
+from core.igdb_api import IGDB_API, MULTIQUERY_MAX_QUERIES
+from core.igdb_cache import get_igdb_cache
+
+
+class _StubIGDBHandler(BaseHTTPRequestHandler):
+    """Responde /games e /multiquery com um jogo por busca, depois de esperar a latência configurada."""
+    latency = 0.0
+    request_count = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode("utf-8")
+        with self.lock:
+            type(self).request_count += 1
+        time.sleep(self.latency)
+        if self.path.endswith("/multiquery"):
+            names = [part.split('"', 1)[0] for part in body.split('query games "')[1:]]
+            payload = [{"name": name, "result": [{"id": index, "name": f"Resultado {name}"}]} for index, name in enumerate(names)]
+        else:
+            payload = [{"id": 1, "name": "Resultado"}]
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _run(label, call):
+    _StubIGDBHandler.request_count = 0
+    started = time.perf_counter()
+    results = call()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {_StubIGDBHandler.request_count:>10} {elapsed:>10.1f}s")
+    return results, elapsed, _StubIGDBHandler.request_count
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.2, help="latência simulada por requisição, em segundos")
+    parser.add_argument("--skip-sequential", action="store_true", help="mede só a busca em lote")
+    args = parser.parse_args(argv)
+    logging.disable(logging.WARNING)
+
+    _StubIGDBHandler.latency = args.latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubIGDBHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    names = {game_id: f"Jogo de Teste {game_id}" for game_id in range(1, args.games + 1)}
+
+    with temporary_database():
+        api = IGDB_API()
+        api._api_url = f"http://127.0.0.1:{server.server_address[1]}/"
+        api._access_token = "benchmark"
+        api._token_expiration_time = time.time() + 3600
+        try:
+            print(f"{args.games} jogos, {args.latency * 1000:.0f} ms por requisição")
+            print(f"{'modo':<28} {'requisições':>10} {'tempo':>11}")
+            sequential_time = None
+            if not args.skip_sequential:
+                _, sequential_time, _ = _run("um por vez (search_games)", lambda: [api.search_games(name) for name in names.values()])
+                get_igdb_cache().clear()
+            results, batched_time, batched_requests = _run("em lote (search_games_many)", lambda: api.search_games_many(names))
+        finally:
+            api.shutdown()
+            get_igdb_cache().shutdown()
+            server.shutdown()
+
+    if sequential_time:
+        print(f"Ganho: {sequential_time / batched_time:.1f}x")
+    expected_requests = math.ceil(args.games / MULTIQUERY_MAX_QUERIES)
+    missing = [game_id for game_id, found in results.items() if not found]
+    if batched_requests != expected_requests or missing:
+        print(f"ERRO: esperadas {expected_requests} requisições com todos os jogos resolvidos; "
+              f"foram {batched_requests}, {len(missing)} jogo(s) sem resultado.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,259 @@
+# core/artwork_fetcher.py
+
+import os
+import time
+import tempfile
+import logging
+import sqlite3
+import threading
+from urllib.parse import urlsplit
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from core.database import get_db_connection, transaction
+
+MAX_WORKERS = 8
+# Limites por servidor: downloads simultâneos e ritmo máximo de novas requisições
+PER_HOST_CONCURRENCY = 4
+PER_HOST_REQUESTS_PER_SECOND = 10
+REQUEST_TIMEOUT = (5, 20)  # (conexão, leitura) em segundos
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Situações possíveis de um download
+FETCH_DOWNLOADED = "downloaded"      # arquivo novo ou atualizado
+FETCH_NOT_MODIFIED = "not_modified"  # o servidor respondeu 304; o arquivo local continua valendo
+FETCH_CACHED = "cached"              # o arquivo já existia e não houve requisição
+FETCH_MISSING = "missing"            # o servidor não tem essa arte
+FETCH_FAILED = "failed"              # erro de rede ou de disco
+
+FETCH_OK_STATUSES = (FETCH_DOWNLOADED, FETCH_NOT_MODIFIED, FETCH_CACHED)
+
+# Uma arte que o servidor disse não existir (4xx) só é pedida de novo depois deste intervalo
+MISSING_RETRY_SECONDS = 60 * 60 * 24 * 7
+
+
+class _HostRateLimiter:
+    """Limita as requisições a um servidor: no máximo N ao mesmo tempo e um intervalo mínimo entre elas."""
+    def __init__(self, concurrency, requests_per_second):
+        self._semaphore = threading.BoundedSemaphore(concurrency)
+        self._interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def __enter__(self):
+        self._semaphore.acquire()
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self._interval
+        if wait > 0:
+            time.sleep(wait)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._semaphore.release()
+        return False
+
+
+class ArtworkFetcher:
+    """
+    Motor de download das artes dos jogos.
+
+    Usa uma única requests.Session (reaproveita conexões HTTP), um pool limitado
+    de threads, limite de ritmo por servidor e novas tentativas com backoff para
+    erros temporários (429/5xx). Quando pedido para revalidar um arquivo que já
+    existe, envia If-None-Match/If-Modified-Since com os validadores guardados na
+    tabela 'artwork_http_cache' e só baixa de novo se a arte tiver mudado.
+    """
+    def __init__(self, max_workers=MAX_WORKERS, per_host_concurrency=PER_HOST_CONCURRENCY,
+                 per_host_rate=PER_HOST_REQUESTS_PER_SECOND):
+        self.per_host_concurrency = per_host_concurrency
+        self.per_host_rate = per_host_rate
+        self.session = self._create_session(max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="artwork")
+        self._limiters = {}
+        self._limiters_lock = threading.Lock()
+        # Downloads em andamento por arquivo de destino: quem pedir o mesmo arquivo espera o primeiro
+        self._in_flight = {}
+        self._in_flight_lock = threading.Lock()
+
+    def _create_session(self, max_workers):
+        retry = Retry(
+            total=3, connect=3, read=2, backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=max_workers, max_retries=retry)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _limiter_for(self, url):
+        host = urlsplit(url).hostname or ""
+        with self._limiters_lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = _HostRateLimiter(self.per_host_concurrency, self.per_host_rate)
+                self._limiters[host] = limiter
+            return limiter
+
+    def fetch(self, url, dest_path, revalidate=False):
+        """
+        Baixa 'url' para 'dest_path'. Retorna {"status": ..., "path": ...}.
+        Se o arquivo já existir, só faz a requisição (condicional) com revalidate=True.
+        Se o mesmo destino já estiver sendo baixado (ex.: o preview de uma sugestão
+        e a aplicação dela), espera esse download e devolve o resultado dele.
+        """
+        in_flight_key = os.path.abspath(dest_path)
+        with self._in_flight_lock:
+            future = self._in_flight.get(in_flight_key)
+            is_leader = future is None
+            if is_leader:
+                future = self._in_flight[in_flight_key] = Future()
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = self._fetch(url, dest_path, revalidate)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._in_flight_lock:
+                self._in_flight.pop(in_flight_key, None)
+
+    def _fetch(self, url, dest_path, revalidate):
+        file_exists = os.path.exists(dest_path)
+        if file_exists and not revalidate:
+            return {"status": FETCH_CACHED, "path": dest_path}
+
+        if not file_exists and self._is_known_missing(url):
+            return {"status": FETCH_MISSING, "path": None}
+
+        headers = {}
+        if file_exists:
+            validators = self._get_validators(url)
+            if validators and validators["etag"]: headers["If-None-Match"] = validators["etag"]
+            if validators and validators["last_modified"]: headers["If-Modified-Since"] = validators["last_modified"]
+
+        try:
+            with self._limiter_for(url):
+                with self.session.get(url, headers=headers, stream=True, timeout=REQUEST_TIMEOUT) as response:
+                    if response.status_code == 304 and file_exists:
+                        self._save_validators(url, dest_path, response.headers.get("ETag") or headers.get("If-None-Match"),
+                                              response.headers.get("Last-Modified") or headers.get("If-Modified-Since"))
+                        return {"status": FETCH_NOT_MODIFIED, "path": dest_path}
+                    # Verifica se a imagem existe (status 200) e se o conteúdo não é uma página de erro
+                    if response.status_code != 200 or 'text/html' in response.headers.get('content-type', ''):
+                        logging.warning(f"Arte não encontrada em {url} (Status: {response.status_code})")
+                        # Erros do servidor (5xx) podem ser passageiros; só 4xx/página de erro contam como "não existe"
+                        if response.status_code < 500:
+                            self._mark_missing(url)
+                        return {"status": FETCH_MISSING, "path": dest_path if file_exists else None}
+                    self._write_file(response, dest_path)
+                    self._save_validators(url, dest_path, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        except requests.RequestException as e:
+            logging.error(f"Erro de rede ao baixar {url}: {e}")
+            return {"status": FETCH_FAILED, "path": dest_path if file_exists else None}
+        except OSError as e:
+            logging.error(f"Erro ao salvar a arte de {url} em '{dest_path}': {e}")
+            return {"status": FETCH_FAILED, "path": dest_path if file_exists else None}
+
+        logging.info(f"Arte baixada com sucesso: {dest_path}")
+        return {"status": FETCH_DOWNLOADED, "path": dest_path}
+
+    def fetch_many(self, jobs, progress_callback=None, revalidate=False):
+        """
+        Baixa vários arquivos em paralelo. 'jobs' é uma lista de (chave, url, caminho).
+        Retorna {chave: resultado}. progress_callback(concluídos, total, chave, resultado)
+        é chamado na thread de quem chamou fetch_many, a cada arquivo concluído.
+        """
+        jobs = list(jobs)
+        futures = {self._executor.submit(self.fetch, url, dest_path, revalidate): key for key, url, dest_path in jobs}
+        results = {}
+        for completed, future in enumerate(as_completed(futures), start=1):
+            key = futures[future]
+            results[key] = future.result()
+            if progress_callback:
+                try:
+                    progress_callback(completed, len(jobs), key, results[key])
+                except Exception as e:
+                    logging.error(f"Erro no callback de progresso dos downloads: {e}", exc_info=True)
+        return results
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+    def _write_file(self, response, dest_path):
+        os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+        # Grava num temporário (com nome único) e renomeia: um download interrompido
+        # não deixa arquivo pela metade, e dois downloads não apagam o temporário um do outro
+        temp_file = tempfile.NamedTemporaryFile(dir=os.path.dirname(dest_path) or ".", prefix=os.path.basename(dest_path) + ".",
+                                                suffix=".part", delete=False)
+        try:
+            with temp_file:
+                for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    temp_file.write(chunk)
+            os.replace(temp_file.name, dest_path)
+        finally:
+            if os.path.exists(temp_file.name):
+                os.remove(temp_file.name)
+
+    def _get_validators(self, url):
+        try:
+            conn = get_db_connection()
+            return conn.execute("SELECT etag, last_modified FROM artwork_http_cache WHERE url = ?", (url,)).fetchone()
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao ler o cache HTTP das artes: {e}")
+            return None
+
+    def _is_known_missing(self, url):
+        try:
+            row = get_db_connection().execute("SELECT checked_at FROM artwork_missing WHERE url = ?", (url,)).fetchone()
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao ler o cache de artes inexistentes: {e}")
+            return False
+        return row is not None and time.time() - row['checked_at'] < MISSING_RETRY_SECONDS
+
+    def _mark_missing(self, url):
+        try:
+            with transaction() as conn:
+                conn.execute("INSERT OR REPLACE INTO artwork_missing (url, checked_at) VALUES (?, ?)", (url, int(time.time())))
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao salvar o cache de artes inexistentes: {e}")
+
+    def _save_validators(self, url, dest_path, etag, last_modified):
+        try:
+            with transaction() as conn:
+                conn.execute(
+                    """INSERT INTO artwork_http_cache (url, local_path, etag, last_modified, fetched_at)
+                       VALUES (?, ?, ?, ?, ?)
+                       ON CONFLICT(url) DO UPDATE SET
+                           local_path = excluded.local_path, etag = excluded.etag,
+                           last_modified = excluded.last_modified, fetched_at = excluded.fetched_at""",
+                    (url, dest_path, etag, last_modified, int(time.time()))
+                )
+                conn.execute("DELETE FROM artwork_missing WHERE url = ?", (url,))
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao salvar o cache HTTP das artes: {e}")
+
+
+_artwork_fetcher = None
+_artwork_fetcher_lock = threading.Lock()
+
+def get_artwork_fetcher():
+    """Instância compartilhada por todo o processo (uma só Session e um só pool)."""
+    global _artwork_fetcher
+    with _artwork_fetcher_lock:
+        if _artwork_fetcher is None:
+            _artwork_fetcher = ArtworkFetcher()
+        return _artwork_fetcher
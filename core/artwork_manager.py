@@ -1,54 +1,78 @@
 # core/artwork_manager.py
 
 import os
-import requests
 import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from core.artwork_fetcher import get_artwork_fetcher, FETCH_OK_STATUSES
 
 # Define o diretório base para salvar as artes da Steam
 ARTWORK_BASE_DIR = os.path.join("assets", "steam")
 
-def download_steam_artwork(app_id):
+STEAM_ARTWORK_URLS = {
+    "image_path": "https://cdn.akamai.steamstatic.com/steam/apps/{app_id}/library_600x900.jpg",
+    "header_path": "https://cdn.akamai.steamstatic.com/steam/apps/{app_id}/header.jpg",
+    "background_path": "https://cdn.akamai.steamstatic.com/steam/apps/{app_id}/library_hero.jpg"
+}
+
+def get_steam_artwork_job(app_id, key):
+    """(url, caminho local) de uma das artes ('image_path', 'header_path', 'background_path') de um AppID."""
+    # Define o nome do arquivo local (ex: image.jpg, header.jpg)
+    file_name = f"{key.split('_')[0]}.jpg"
+    return STEAM_ARTWORK_URLS[key].format(app_id=app_id), os.path.join(ARTWORK_BASE_DIR, str(app_id), file_name)
+
+def _steam_artwork_jobs(app_id):
+    """Lista de downloads (chave, url, caminho local) da capa, do header e do hero de um AppID."""
+    for key in STEAM_ARTWORK_URLS:
+        yield (str(app_id), key), *get_steam_artwork_job(app_id, key)
+
+def download_steam_artwork(app_id, revalidate=False):
     """
     Baixa a capa, o header e o hero de um jogo da Steam usando seu AppID.
     Retorna um dicionário com os caminhos locais para as imagens baixadas.
     """
     if not app_id:
         return {}
+    return download_steam_artwork_batch([app_id], revalidate=revalidate).get(str(app_id), {})
 
-    # Cria o diretório específico para este AppID, se não existir
-    game_artwork_dir = os.path.join(ARTWORK_BASE_DIR, str(app_id))
-    os.makedirs(game_artwork_dir, exist_ok=True)
+def download_steam_artwork_batch(app_ids, progress_callback=None, revalidate=False):
+    """
+    Baixa as artes de vários jogos da Steam em paralelo.
+    Retorna {app_id: {chave: caminho}}; progress_callback(concluídos, total) é
+    chamado a cada arquivo terminado.
+    """
+    jobs = [job for app_id in dict.fromkeys(str(a) for a in app_ids if a) for job in _steam_artwork_jobs(app_id)]
+    if not jobs:
+        return {}
 
-    urls = {
-        "image_path": f"https://cdn.akamai.steamstatic.com/steam/apps/{app_id}/library_600x900.jpg",
-        "header_path": f"https://cdn.akamai.steamstatic.com/steam/apps/{app_id}/header.jpg",
-        "background_path": f"https://cdn.akamai.steamstatic.com/steam/apps/{app_id}/library_hero.jpg"
-    }
+    def on_progress(completed, total, key, result):
+        if progress_callback: progress_callback(completed, total)
 
-    local_paths = {}
+    results = get_artwork_fetcher().fetch_many(jobs, progress_callback=on_progress, revalidate=revalidate)
+    artwork = {}
+    for (app_id, key), result in results.items():
+        if result["status"] in FETCH_OK_STATUSES and result["path"]:
+            artwork.setdefault(app_id, {})[key] = result["path"]
+    logging.info(f"Artes da Steam: {len(artwork)} de {len(jobs) // len(STEAM_ARTWORK_URLS)} jogo(s) com pelo menos uma imagem.")
+    return artwork
 
-    for key, url in urls.items():
-        # Define o nome do arquivo local (ex: cover.jpg, header.jpg)
-        file_name = f"{key.split('_')[0]}.jpg"
-        local_path = os.path.join(game_artwork_dir, file_name)
+# Fila de downloads em segundo plano: um lote por vez, cada um usando o pool do ArtworkFetcher
+_artwork_queue = ThreadPoolExecutor(max_workers=1, thread_name_prefix="artwork-queue")
 
-        # Se o arquivo já não existir, tenta fazer o download
-        if not os.path.exists(local_path):
+def queue_steam_artwork_download(app_ids, callback=None):
+    """
+    Agenda download_steam_artwork_batch numa thread de fundo e retorna o Future.
+    callback(artes) é chamado nessa mesma thread quando o lote termina.
+    """
+    app_ids = list(app_ids)
+
+    def run():
+        artwork = download_steam_artwork_batch(app_ids)
+        if callback:
             try:
-                response = requests.get(url, stream=True, timeout=10)
-                # Verifica se a imagem existe (status 200) e se o conteúdo não é uma página de erro
-                if response.status_code == 200 and 'text/html' not in response.headers.get('content-type', ''):
-                    with open(local_path, 'wb') as f:
-                        for chunk in response.iter_content(1024):
-                            f.write(chunk)
-                    logging.info(f"Arte baixada com sucesso: {local_path}")
-                    local_paths[key] = local_path
-                else:
-                    logging.warning(f"Não foi possível encontrar a arte para {app_id} em {url} (Status: {response.status_code})")
-            except requests.RequestException as e:
-                logging.error(f"Erro de rede ao baixar {url}: {e}")
-        else:
-            # Se o arquivo já existe, apenas adiciona seu caminho ao dicionário de retorno
-            local_paths[key] = local_path
-            
-    return local_paths
+                callback(artwork)
+            except Exception as e:
+                logging.error(f"Erro ao aplicar as artes baixadas em segundo plano: {e}", exc_info=True)
+        return artwork
+
+    return _artwork_queue.submit(run)
@@ -2,16 +2,86 @@
 
 import sqlite3
 import logging
+import threading
 import time
+from contextlib import contextmanager
 
 DATABASE_FILE = "launcher.db"
 
-def get_db_connection():
-    """Cria e retorna uma conexão com o banco de dados."""
-    conn = sqlite3.connect(DATABASE_FILE)
+# PRAGMAs aplicados uma única vez, quando cada conexão é aberta
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA mmap_size = 268435456",  # 256 MB
+    "PRAGMA cache_size = -65536",    # 64 MB (valores negativos são em KiB)
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 5000",
+)
+
+# Cada thread mantém suas próprias conexões persistentes (uma por arquivo de banco)
+_thread_state = threading.local()
+
+def _open_connection(database_file):
+    """Abre uma nova conexão e aplica as configurações de desempenho."""
+    # isolation_level=None desativa as transações implícitas do módulo sqlite3;
+    # toda escrita em lote deve passar por transaction().
+    conn = sqlite3.connect(database_file, isolation_level=None)
     conn.row_factory = sqlite3.Row # Permite acessar colunas pelo nome
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+def get_db_connection():
+    """
+    Retorna a conexão persistente da thread atual, criando-a na primeira chamada.
+    A conexão é reutilizada entre chamadas e não deve ser fechada por quem a usa.
+    """
+    connections = getattr(_thread_state, "connections", None)
+    if connections is None:
+        connections = _thread_state.connections = {}
+    conn = connections.get(DATABASE_FILE)
+    if conn is None:
+        conn = _open_connection(DATABASE_FILE)
+        connections[DATABASE_FILE] = conn
     return conn
 
+@contextmanager
+def transaction():
+    """
+    Executa um bloco dentro de uma transação na conexão da thread atual.
+    Faz COMMIT ao final ou ROLLBACK em caso de exceção. Chamadas aninhadas
+    usam SAVEPOINTs, permitindo compor métodos que já abrem transações.
+    """
+    conn = get_db_connection()
+    depth = getattr(_thread_state, "transaction_depth", 0)
+    savepoint = f"sp_{depth}"
+    # BEGIN IMMEDIATE pega o lock de escrita já no início: uma transação que lê e
+    # depois escreve não precisa promover o lock (o que falharia na hora com
+    # SQLITE_BUSY, sem respeitar o busy_timeout, se outra thread estivesse escrevendo).
+    conn.execute("BEGIN IMMEDIATE" if depth == 0 else f"SAVEPOINT {savepoint}")
+    _thread_state.transaction_depth = depth + 1
+    try:
+        yield conn
+    except BaseException:
+        if depth == 0:
+            conn.execute("ROLLBACK")
+        else:
+            conn.execute(f"ROLLBACK TO {savepoint}")
+            conn.execute(f"RELEASE {savepoint}")
+        raise
+    else:
+        conn.execute("COMMIT" if depth == 0 else f"RELEASE {savepoint}")
+    finally:
+        _thread_state.transaction_depth = depth
+
+def close_db_connection():
+    """Fecha as conexões abertas pela thread atual (usado no encerramento do app)."""
+    connections = getattr(_thread_state, "connections", None) or {}
+    for conn in connections.values():
+        conn.close()
+    connections.clear()
+
 def _table_exists(cursor, table_name):
     """Verifica se uma tabela existe no banco de dados."""
     cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
@@ -26,9 +96,16 @@ def _column_exists(cursor, table_name, column_name):
 def initialize_database():
     """Cria as tabelas iniciais do banco de dados, se elas não existirem."""
     logging.info("Verificando e inicializando o banco de dados...")
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    with transaction() as conn:
+        _create_tables(conn.cursor())
+    logging.info("Banco de dados inicializado com sucesso.")
+    
+    update_database_schema()
+    migrate_data_if_needed()
+    apply_schema_migrations()
 
+def _create_tables(cursor):
+    """Cria as tabelas que ainda não existem."""
     # Tabela de Jogos com a nova estrutura completa
     if not _table_exists(cursor, "games"):
         cursor.execute("""
@@ -114,19 +191,12 @@ def initialize_database():
         );
         """)
 
-    conn.commit()
-    conn.close()
-    logging.info("Banco de dados inicializado com sucesso.")
-    
-    update_database_schema()
-    migrate_data_if_needed()
-
 def update_database_schema():
     """Adiciona novas colunas a tabelas existentes de forma segura para compatibilidade."""
     logging.info("Verificando e atualizando o schema do banco de dados...")
     conn = get_db_connection()
     cursor = conn.cursor()
-    
+
     schema_updates = {
         "profile": [
             ("real_name", "TEXT"),
@@ -145,8 +215,6 @@ def update_database_schema():
                 except sqlite3.OperationalError as e:
                     logging.error(f"Não foi possível adicionar a coluna {column_name} à tabela {table}: {e}")
 
-    conn.commit()
-    conn.close()
     logging.info("Verificação de schema concluída.")
 
 def migrate_data_if_needed():
@@ -157,63 +225,354 @@ def migrate_data_if_needed():
     # A migração só é necessária se a coluna antiga 'total_playtime' existir.
     if _column_exists(cursor, "games", "total_playtime"):
         logging.info("Detectada estrutura antiga da tabela 'games'. Iniciando migração...")
+        # A reconstrução da tabela exige as chaves estrangeiras desligadas, e o modo
+        # legado do ALTER TABLE impede que as referências das tabelas filhas
+        # ('executables', 'game_tags') sejam reescritas para 'games_old'.
+        conn.execute("PRAGMA foreign_keys = OFF;")
+        conn.execute("PRAGMA legacy_alter_table = ON;")
         try:
-            # 1. Renomear a tabela antiga
-            cursor.execute("ALTER TABLE games RENAME TO games_old;")
-
-            # 2. Criar a nova tabela 'games' com a estrutura correta
-            cursor.execute("""
-            CREATE TABLE games (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                source TEXT NOT NULL,
-                app_id TEXT,
-                igdb_id TEXT,
-                summary TEXT,
-                genres TEXT,
-                release_date TEXT,
-                cover_url TEXT,
-                screenshot_urls TEXT,
-                image_path TEXT,
-                background_path TEXT,
-                header_path TEXT,
-                favorite INTEGER NOT NULL DEFAULT 0,
-                status TEXT NOT NULL DEFAULT 'INSTALLED', -- Jogos existentes estavam instalados
-                install_dir TEXT, -- Será preenchido pelo scanner
-                playtime_steam INTEGER NOT NULL DEFAULT 0,
-                playtime_local INTEGER NOT NULL DEFAULT 0,
-                last_played_timestamp INTEGER
-            );
-            """)
-
-            # 3. Copiar os dados da tabela antiga para a nova, mapeando as colunas
-            # Nota: last_played_timestamp é deixado como NULL pois a conversão de TEXT para INTEGER é complexa
-            cursor.execute("""
-            INSERT INTO games (
-                id, name, source, app_id, igdb_id, summary, genres, release_date,
-                cover_url, screenshot_urls, image_path, background_path, header_path,
-                favorite, playtime_local
-            )
-            SELECT
-                id, name, source, app_id, igdb_id, summary, genres, release_date,
-                cover_url, screenshot_urls, image_path, background_path, header_path,
-                favorite, total_playtime
-            FROM games_old;
-            """)
+            with transaction():
+                # 1. Renomear a tabela antiga
+                cursor.execute("ALTER TABLE games RENAME TO games_old;")
+
+                # 2. Criar a nova tabela 'games' com a estrutura correta
+                cursor.execute("""
+                CREATE TABLE games (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    app_id TEXT,
+                    igdb_id TEXT,
+                    summary TEXT,
+                    genres TEXT,
+                    release_date TEXT,
+                    cover_url TEXT,
+                    screenshot_urls TEXT,
+                    image_path TEXT,
+                    background_path TEXT,
+                    header_path TEXT,
+                    favorite INTEGER NOT NULL DEFAULT 0,
+                    status TEXT NOT NULL DEFAULT 'INSTALLED', -- Jogos existentes estavam instalados
+                    install_dir TEXT, -- Será preenchido pelo scanner
+                    playtime_steam INTEGER NOT NULL DEFAULT 0,
+                    playtime_local INTEGER NOT NULL DEFAULT 0,
+                    last_played_timestamp INTEGER
+                );
+                """)
+
+                # 3. Copiar os dados da tabela antiga para a nova, mapeando as colunas
+                # Nota: last_played_timestamp é deixado como NULL pois a conversão de TEXT para INTEGER é complexa
+                cursor.execute("""
+                INSERT INTO games (
+                    id, name, source, app_id, igdb_id, summary, genres, release_date,
+                    cover_url, screenshot_urls, image_path, background_path, header_path,
+                    favorite, playtime_local
+                )
+                SELECT
+                    id, name, source, app_id, igdb_id, summary, genres, release_date,
+                    cover_url, screenshot_urls, image_path, background_path, header_path,
+                    favorite, total_playtime
+                FROM games_old;
+                """)
             
-            # 4. Remover a tabela antiga
-            cursor.execute("DROP TABLE games_old;")
+                # 4. Remover a tabela antiga
+                cursor.execute("DROP TABLE games_old;")
             
-            conn.commit()
             logging.info("Tabela 'games' migrada com sucesso para a nova estrutura.")
 
         except sqlite3.Error as e:
             logging.error(f"Ocorreu um erro durante a migração da tabela 'games': {e}")
-            conn.rollback() # Desfaz as alterações em caso de erro
+            # transaction() já desfez as alterações parciais
+        finally:
+            conn.execute("PRAGMA legacy_alter_table = OFF;")
+            conn.execute("PRAGMA foreign_keys = ON;")
     else:
         logging.info("Nenhuma migração de dados necessária para a tabela 'games'.")
 
-    conn.close()
+# Colunas copiadas de uma duplicata quando o registro mantido não tem valor
+_MERGED_METADATA_COLUMNS = (
+    "igdb_id", "summary", "genres", "release_date", "cover_url", "screenshot_urls",
+    "image_path", "background_path", "header_path", "install_dir",
+)
+
+def _merge_duplicate_steam_games(cursor):
+    """
+    Une os jogos da Steam com o mesmo AppID ao registro de menor id e apaga os
+    demais, sem perder dados: executáveis e tags passam para o registro mantido,
+    o tempo de jogo local é somado, favorito e instalado valem se qualquer um for,
+    a última partida é a mais recente e artes/metadados vazios são preenchidos.
+    """
+    cursor.execute("DROP TABLE IF EXISTS temp.steam_duplicate_map")
+    cursor.execute("""
+        CREATE TEMP TABLE steam_duplicate_map AS
+        SELECT g.id AS duplicate_id, k.keep_id
+        FROM games g
+        JOIN (
+            SELECT app_id, MIN(id) AS keep_id FROM games
+            WHERE source = 'steam' AND app_id IS NOT NULL
+            GROUP BY app_id HAVING COUNT(*) > 1
+        ) k ON k.app_id = g.app_id
+        WHERE g.source = 'steam' AND g.id <> k.keep_id
+    """)
+    duplicate_count = cursor.execute("SELECT COUNT(*) FROM steam_duplicate_map").fetchone()[0]
+    if duplicate_count:
+        duplicates_of = "SELECT {column} FROM games d JOIN steam_duplicate_map m ON m.duplicate_id = d.id WHERE m.keep_id = games.id"
+        metadata_updates = ",\n".join(
+            f"{column} = COALESCE({column}, ({duplicates_of.format(column='d.' + column)} AND d.{column} IS NOT NULL ORDER BY d.id LIMIT 1))"
+            for column in _MERGED_METADATA_COLUMNS
+        )
+        cursor.execute(f"""
+            UPDATE games SET
+                favorite = MAX(favorite, ({duplicates_of.format(column='MAX(d.favorite)')})),
+                status = CASE WHEN status = 'INSTALLED' OR EXISTS ({duplicates_of.format(column='1')} AND d.status = 'INSTALLED')
+                              THEN 'INSTALLED' ELSE status END,
+                playtime_local = playtime_local + ({duplicates_of.format(column='CAST(TOTAL(d.playtime_local) AS INTEGER)')}),
+                -- O tempo da Steam é o total informado pela conta, não uma parcela: fica o maior
+                playtime_steam = MAX(playtime_steam, ({duplicates_of.format(column='MAX(d.playtime_steam)')})),
+                last_played_timestamp = NULLIF(MAX(
+                    COALESCE(last_played_timestamp, 0),
+                    COALESCE(({duplicates_of.format(column='MAX(d.last_played_timestamp)')}), 0)
+                ), 0),
+                {metadata_updates}
+            WHERE id IN (SELECT keep_id FROM steam_duplicate_map)
+        """)
+        cursor.execute("""
+            UPDATE executables SET game_id = (SELECT keep_id FROM steam_duplicate_map WHERE duplicate_id = executables.game_id)
+            WHERE game_id IN (SELECT duplicate_id FROM steam_duplicate_map)
+        """)
+        cursor.execute("""
+            INSERT OR IGNORE INTO game_tags (game_id, tag_id)
+            SELECT m.keep_id, gt.tag_id FROM game_tags gt JOIN steam_duplicate_map m ON m.duplicate_id = gt.game_id
+        """)
+        cursor.execute("""
+            UPDATE profile SET showcased_favorite_id = (SELECT keep_id FROM steam_duplicate_map WHERE duplicate_id = showcased_favorite_id)
+            WHERE showcased_favorite_id IN (SELECT duplicate_id FROM steam_duplicate_map)
+        """)
+        cursor.execute("DELETE FROM games WHERE id IN (SELECT duplicate_id FROM steam_duplicate_map)")
+        logging.warning(f"{duplicate_count} jogo(s) da Steam duplicado(s) unido(s) ao registro original antes de criar os índices.")
+    cursor.execute("DROP TABLE steam_duplicate_map")
+
+def _migration_v1_indexes(cursor):
+    """Cria os índices secundários usados pelas consultas do GameManager."""
+    # O índice único de (source, app_id) não pode ser criado se houver jogos da
+    # Steam duplicados; os dados de cada duplicata são unidos ao registro mais antigo.
+    _merge_duplicate_steam_games(cursor)
+
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_games_steam_app_id ON games (source, app_id) WHERE source = 'steam'")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_games_name_nocase ON games (name COLLATE NOCASE)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_games_favorite_name ON games (name COLLATE NOCASE) WHERE favorite = 1")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_games_installed_name ON games (name COLLATE NOCASE) WHERE status = 'INSTALLED'")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_games_last_played ON games (last_played_timestamp)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_games_playtime_local ON games (playtime_local)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_executables_game_id ON executables (game_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_game_tags_tag_id ON game_tags (tag_id)")
+
+def _migration_v2_search_index(cursor):
+    """
+    Cria as tabelas FTS5 usadas pela busca da biblioteca e os triggers que as
+    mantêm sincronizadas com 'games', 'tags' e 'game_tags'.
+    """
+    try:
+        # Índice principal: nome, resumo, gêneros e tags, com suporte a prefixos
+        cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS games_fts USING fts5(
+            name, summary, genres, tags,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        );
+        """)
+    except sqlite3.OperationalError as e:
+        logging.warning(f"FTS5 indisponível nesta versão do SQLite; a busca continuará usando LIKE: {e}")
+        return
+
+    try:
+        # Índice de trigramas dos nomes: busca por trechos e tolerância a erros de digitação
+        cursor.execute("CREATE VIRTUAL TABLE IF NOT EXISTS games_fts_trigram USING fts5(name, tokenize = 'trigram');")
+        has_trigram = True
+    except sqlite3.OperationalError as e:
+        logging.warning(f"Tokenizador 'trigram' indisponível; a busca aproximada será desativada: {e}")
+        has_trigram = False
+
+    tags_of_game = """(
+        SELECT group_concat(t.name, ' ') FROM game_tags gt
+        JOIN tags t ON t.id = gt.tag_id
+        WHERE gt.game_id = {game_id}
+    )"""
+
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS games_fts_after_insert AFTER INSERT ON games BEGIN
+        INSERT INTO games_fts (rowid, name, summary, genres, tags)
+        VALUES (new.id, new.name, new.summary, new.genres, {tags_of_game.format(game_id='new.id')});
+        {"INSERT INTO games_fts_trigram (rowid, name) VALUES (new.id, new.name);" if has_trigram else ""}
+    END;
+    """)
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS games_fts_after_update AFTER UPDATE OF name, summary, genres ON games BEGIN
+        UPDATE games_fts SET name = new.name, summary = new.summary, genres = new.genres WHERE rowid = new.id;
+        {"UPDATE games_fts_trigram SET name = new.name WHERE rowid = new.id;" if has_trigram else ""}
+    END;
+    """)
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS games_fts_after_delete AFTER DELETE ON games BEGIN
+        DELETE FROM games_fts WHERE rowid = old.id;
+        {"DELETE FROM games_fts_trigram WHERE rowid = old.id;" if has_trigram else ""}
+    END;
+    """)
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS game_tags_fts_after_insert AFTER INSERT ON game_tags BEGIN
+        UPDATE games_fts SET tags = {tags_of_game.format(game_id='new.game_id')} WHERE rowid = new.game_id;
+    END;
+    """)
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS game_tags_fts_after_delete AFTER DELETE ON game_tags BEGIN
+        UPDATE games_fts SET tags = {tags_of_game.format(game_id='old.game_id')} WHERE rowid = old.game_id;
+    END;
+    """)
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS tags_fts_after_update AFTER UPDATE OF name ON tags BEGIN
+        UPDATE games_fts SET tags = {tags_of_game.format(game_id='games_fts.rowid')}
+        WHERE rowid IN (SELECT game_id FROM game_tags WHERE tag_id = new.id);
+    END;
+    """)
+
+    # Popula os índices com os jogos já existentes
+    cursor.execute("DELETE FROM games_fts;")
+    cursor.execute(f"""
+    INSERT INTO games_fts (rowid, name, summary, genres, tags)
+    SELECT g.id, g.name, g.summary, g.genres, {tags_of_game.format(game_id='g.id')}
+    FROM games g;
+    """)
+    if has_trigram:
+        cursor.execute("DELETE FROM games_fts_trigram;")
+        cursor.execute("INSERT INTO games_fts_trigram (rowid, name) SELECT id, name FROM games;")
+
+def _migration_v3_artwork_http_cache(cursor):
+    """Guarda os validadores HTTP (ETag/Last-Modified) das artes baixadas, para requisições condicionais."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS artwork_http_cache (
+            url TEXT PRIMARY KEY,
+            local_path TEXT NOT NULL,
+            etag TEXT,
+            last_modified TEXT,
+            fetched_at INTEGER NOT NULL
+        )
+    """)
+
+def _migration_v4_steam_manifest_state(cursor):
+    """Guarda o estado de cada manifesto da Steam já lido, para as varreduras incrementais."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS steam_manifest_state (
+            path TEXT PRIMARY KEY,
+            library_path TEXT NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            app_id TEXT,
+            name TEXT,
+            install_dir TEXT
+        )
+    """)
+
+def _migration_v5_local_scan_index(cursor):
+    """Índice das pastas já varridas pela busca local, para pular as que não mudaram."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS local_scan_index (
+            path TEXT PRIMARY KEY,
+            mtime_ns INTEGER NOT NULL,
+            executables TEXT NOT NULL, -- JSON: [[nome, tamanho], ...] dos .exe da pasta
+            subdirs TEXT NOT NULL      -- JSON: nomes das subpastas
+        )
+    """)
+
+def _migration_v6_pe_inspection_cache(cursor):
+    """Resultado da inspeção do cabeçalho PE de cada executável, por caminho, data e tamanho."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS pe_inspection_cache (
+            path TEXT PRIMARY KEY,
+            mtime_ns INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            info TEXT NOT NULL -- JSON com subsistema e strings de versão
+        )
+    """)
+
+def _migration_v7_steam_apps(cursor):
+    """Lista de aplicativos da Steam, com o nome normalizado indexado para as buscas por nome."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS steam_apps (
+            app_id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            normalized_name TEXT NOT NULL
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_steam_apps_normalized_name ON steam_apps (normalized_name)")
+
+def _migration_v8_igdb_response_cache(cursor):
+    """Respostas da API do IGDB, por consulta normalizada, para não repetir buscas idênticas."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS igdb_response_cache (
+            cache_key TEXT PRIMARY KEY,
+            endpoint TEXT NOT NULL,
+            response TEXT NOT NULL, -- JSON devolvido pela API
+            fetched_at INTEGER NOT NULL
+        )
+    """)
+
+def _migration_v9_translation_cache(cursor):
+    """Traduções já feitas, por hash do texto original e idioma de destino."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS translation_cache (
+            source_hash TEXT NOT NULL,
+            dest_language TEXT NOT NULL,
+            translated_text TEXT NOT NULL,
+            created_at INTEGER NOT NULL,
+            PRIMARY KEY (source_hash, dest_language)
+        )
+    """)
+
+def _migration_v10_artwork_missing(cursor):
+    """URLs de artes que o servidor informou não existir, para não pedi-las de novo a cada sincronização."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS artwork_missing (
+            url TEXT PRIMARY KEY,
+            checked_at INTEGER NOT NULL
+        )
+    """)
+
+def _migration_v11_lookup_indexes(cursor):
+    """Índices que faltavam para a lista de tags e para esquecer manifestos da Steam por AppID."""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tags_name_nocase ON tags (name COLLATE NOCASE)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_steam_manifest_state_app_id ON steam_manifest_state (app_id)")
+
+# Migrações versionadas, aplicadas em ordem conforme o PRAGMA user_version do banco.
+# Novas alterações de schema devem ser adicionadas ao final com a próxima versão.
+SCHEMA_MIGRATIONS = [
+    (1, _migration_v1_indexes),
+    (2, _migration_v2_search_index),
+    (3, _migration_v3_artwork_http_cache),
+    (4, _migration_v4_steam_manifest_state),
+    (5, _migration_v5_local_scan_index),
+    (6, _migration_v6_pe_inspection_cache),
+    (7, _migration_v7_steam_apps),
+    (8, _migration_v8_igdb_response_cache),
+    (9, _migration_v9_translation_cache),
+    (10, _migration_v10_artwork_missing),
+    (11, _migration_v11_lookup_indexes),
+]
+
+def apply_schema_migrations():
+    """Aplica as migrações versionadas que ainda não foram executadas neste banco."""
+    conn = get_db_connection()
+    current_version = conn.execute("PRAGMA user_version").fetchone()[0]
+
+    for version, migration in SCHEMA_MIGRATIONS:
+        if version <= current_version:
+            continue
+        logging.info(f"Aplicando migração de schema v{version}...")
+        with transaction() as conn:
+            migration(conn.cursor())
+            conn.execute(f"PRAGMA user_version = {version}")
+        current_version = version
+
+    logging.info(f"Schema do banco de dados na versão {current_version}.")
 
 
 # Ao executar este script diretamente, ele inicializa o banco de dados.
@@ -3,8 +3,31 @@
 import os
 import logging
 import platform
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import vdf
 
+from core.database import transaction
+from core.scan_state_manager import ScanStateManager
+from core.pe_inspector import get_pe_inspector
+
+# Threads usadas para listar as bibliotecas e ler os manifestos (trabalho dominado por E/S de disco)
+MANIFEST_SCAN_WORKERS = 8
+
+# Varredura de pastas locais: uma thread por subpasta de primeiro nível, até este limite
+LOCAL_SCAN_WORKERS = 8
+# Profundidade máxima da busca completa, contada a partir de cada subpasta
+DEEP_SCAN_MAX_DEPTH = 6
+# Idade mínima (desde a última modificação) para uma pasta entrar no índice da busca local
+INDEX_MIN_AGE_NS = 2 * 1_000_000_000
+# Pastas que nunca contêm o executável principal de um jogo (comparadas em minúsculas)
+PRUNED_DIRECTORIES = {
+    "_commonredist", "commonredist", "redist", "redists", "redistributables", "__redist",
+    "directx", "dotnet", "vcredist", "installers", "__installer", "support",
+    "__pycache__", "$recycle.bin", "system volume information",
+}
+
 class SteamScanner:
     """
     Classe focada exclusivamente em encontrar e sincronizar jogos da Steam
@@ -12,6 +35,7 @@ class SteamScanner:
     """
     def __init__(self, game_manager):
         self.game_manager = game_manager
+        self.scan_state = ScanStateManager()
 
     def _find_steam_library_paths(self):
         """Encontra todos os diretórios de biblioteca da Steam no sistema."""
@@ -71,39 +95,128 @@ class SteamScanner:
             logging.error(f"Erro ao processar o arquivo ACF '{acf_path}': {e}")
             return None
 
-    def sync_steam_games(self):
+    def _list_manifests(self, lib_path):
+        """{caminho: (biblioteca, mtime_ns, tamanho)} dos appmanifest_*.acf de uma biblioteca."""
+        manifests = {}
+        try:
+            with os.scandir(lib_path) as entries:
+                for entry in entries:
+                    if not (entry.name.startswith('appmanifest_') and entry.name.endswith('.acf')): continue
+                    try:
+                        if not entry.is_file(): continue
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    manifests[entry.path] = (lib_path, stat.st_mtime_ns, stat.st_size)
+        except OSError as e:
+            logging.error(f"Erro ao listar a biblioteca da Steam em '{lib_path}': {e}")
+        return manifests
+
+    def _scan_manifest(self, acf_path, lib_path, mtime_ns, size):
+        """Lê um manifesto e devolve o estado a ser guardado (app_id fica None se a leitura falhar)."""
+        state = {'path': acf_path, 'library_path': lib_path, 'mtime_ns': mtime_ns, 'size': size,
+                 'app_id': None, 'name': None, 'install_dir': None}
+        game_info = self._parse_acf_file(acf_path)
+        if game_info and game_info.get('appid'):
+            state['app_id'] = str(game_info['appid'])
+            state['name'] = game_info.get('name') or state['app_id']
+            state['install_dir'] = os.path.join(lib_path, 'common', game_info.get('installdir') or '')
+        return state
+
+    def sync_steam_games(self, on_artwork_ready=None, full_rescan=False, library_paths=None):
         """
         Sincroniza o banco de dados com os jogos da Steam instalados localmente.
+
+        A varredura é incremental: cada manifesto é comparado (data de modificação
+        e tamanho) com o estado salvo na última varredura, e só os novos ou
+        alterados são lidos, em paralelo. Manifestos que sumiram marcam seus jogos
+        como desinstalados. Jogos e estado são gravados numa única transação; as
+        artes que faltarem são baixadas em segundo plano, e on_artwork_ready() é
+        chamado (na thread de fundo) quando terminarem.
+
+        'library_paths' restringe a varredura a algumas bibliotecas (usado pelo
+        monitoramento de pastas). Retorna o conjunto de AppIDs que mudaram.
         """
         logging.info("Iniciando sincronização de jogos da Steam...")
-        library_paths = self._find_steam_library_paths()
-        if not library_paths:
-            logging.warning("Nenhuma biblioteca da Steam foi encontrada. Sincronização cancelada.")
-            return
+        scan_all_libraries = library_paths is None
+        if scan_all_libraries:
+            library_paths = self._find_steam_library_paths()
+            if not library_paths:
+                logging.warning("Nenhuma biblioteca da Steam foi encontrada. Sincronização cancelada.")
+                return set()
 
-        installed_app_ids = set()
-        for lib_path in library_paths:
-            logging.info(f"Escaneando biblioteca da Steam em: {lib_path}")
-            for filename in os.listdir(lib_path):
-                if filename.startswith('appmanifest_') and filename.endswith('.acf'):
-                    acf_path = os.path.join(lib_path, filename)
-                    game_info = self._parse_acf_file(acf_path)
-                    if game_info and game_info.get('appid'):
-                        app_id = game_info['appid']
-                        installed_app_ids.add(app_id)
-                        install_dir = os.path.join(lib_path, 'common', game_info['installdir'])
-                        self.game_manager.add_or_update_steam_game(
-                            app_id=app_id, name=game_info['name'],
-                            install_dir=install_dir, status='INSTALLED'
-                        )
-        logging.info(f"Encontrados {len(installed_app_ids)} jogos da Steam instalados.")
-        self.game_manager.update_uninstalled_steam_games(installed_app_ids)
+        logging.info(f"Escaneando {len(library_paths)} biblioteca(s) da Steam: {', '.join(library_paths)}")
+        scanned_libraries = set(library_paths)
+        all_states = self.scan_state.get_manifest_states()
+        stored_states = {path: state for path, state in all_states.items()
+                         if scan_all_libraries or state['library_path'] in scanned_libraries}
+        # Manifestos de bibliotecas fora desta varredura continuam valendo como estão
+        other_states = {path: state for path, state in all_states.items() if path not in stored_states}
+        previous_states = {} if full_rescan else stored_states
+
+        with ThreadPoolExecutor(max_workers=MANIFEST_SCAN_WORKERS, thread_name_prefix="steam-scan") as executor:
+            current_manifests = {}
+            for manifests in executor.map(self._list_manifests, library_paths):
+                current_manifests.update(manifests)
+
+            changed_paths = [
+                path for path, (_, mtime_ns, size) in current_manifests.items()
+                if path not in previous_states
+                or previous_states[path]['mtime_ns'] != mtime_ns or previous_states[path]['size'] != size
+            ]
+            changed_states = list(executor.map(lambda path: self._scan_manifest(path, *current_manifests[path]), changed_paths))
+
+        removed_paths = [path for path in stored_states if path not in current_manifests]
+        if previous_states and not changed_states and not removed_paths:
+            logging.info(f"Nenhum manifesto da Steam mudou ({len(current_manifests)} verificados).")
+            return set()
+
+        current_states = dict(other_states)
+        current_states.update((path, state) for path, state in previous_states.items() if path in current_manifests)
+        current_states.update((state['path'], state) for state in changed_states)
+        current_app_ids = {state['app_id'] for state in current_states.values() if state['app_id']}
+
+        installed_games = {}
+        for state in changed_states:
+            # Um jogo presente em duas bibliotecas fica com o primeiro manifesto encontrado
+            if state['app_id'] and state['app_id'] not in installed_games:
+                installed_games[state['app_id']] = (state['app_id'], state['name'], state['install_dir'])
+
+        if previous_states or not scan_all_libraries:
+            # AppIDs cujo manifesto sumiu (ou mudou de jogo) e que não aparecem em nenhum outro
+            old_app_ids = {stored_states[path]['app_id'] for path in removed_paths}
+            old_app_ids.update(previous_states[state['path']]['app_id'] for state in changed_states if state['path'] in previous_states)
+            uninstalled_app_ids = {app_id for app_id in old_app_ids if app_id and app_id not in current_app_ids}
+            # Jogo que continua instalado em outra biblioteca: passa a apontar para o manifesto restante
+            for state in current_states.values():
+                if state['app_id'] in old_app_ids and state['app_id'] not in installed_games:
+                    installed_games[state['app_id']] = (state['app_id'], state['name'], state['install_dir'])
+        else:
+            # Primeira varredura (ou completa): reconcilia todos os jogos da Steam do banco
+            uninstalled_app_ids = None
+
+        logging.info(f"Manifestos da Steam: {len(changed_states)} novo(s) ou alterado(s), {len(removed_paths)} removido(s); "
+                     f"{len(current_app_ids)} jogos instalados.")
+        with transaction():
+            missing_artwork = self.game_manager.sync_installed_steam_games(list(installed_games.values()), uninstalled_app_ids)
+            # Se os jogos não foram gravados, o estado também não é, e a próxima varredura tenta de novo
+            if missing_artwork is not None:
+                self.scan_state.save_manifest_states(changed_states, removed_paths)
+        if missing_artwork is None:
+            return set()
+        self.game_manager.queue_steam_artwork(missing_artwork, on_finished=on_artwork_ready)
         logging.info("Sincronização da Steam concluída.")
+        return set(installed_games) | (uninstalled_app_ids or set())
 
 
 class LocalGameScanner:
     """
     Escaneia pastas genéricas em busca de jogos locais (não-Steam).
+    Cada subpasta de primeiro nível é tratada como um possível jogo e percorrida
+    por uma thread do pool, com os.scandir e poda das pastas que nunca contêm
+    o executável principal. Um índice persistente das pastas evita reler as
+    que não mudaram desde a varredura anterior, e o executável principal é
+    escolhido pela pontuação do PEInspector (cabeçalho PE e strings de versão).
     """
     def __init__(self, game_manager):
         self.game_manager = game_manager
@@ -111,6 +224,8 @@ class LocalGameScanner:
             "uninstall", "unins000", "setup", "redist", "dxsetup",
             "vcredist", "crashreport", "config", "settings", "launcher", "report"
         ]
+        self.max_depth = DEEP_SCAN_MAX_DEPTH
+        self.scan_state = ScanStateManager()
 
     def _is_valid_exe(self, file_path, existing_paths):
         if os.path.normcase(file_path) in existing_paths:
@@ -118,26 +233,81 @@ class LocalGameScanner:
         file_name_no_ext = os.path.splitext(os.path.basename(file_path))[0].lower()
         return not any(excluded in file_name_no_ext for excluded in self.exclude_list)
 
-    def _scan_subfolder(self, folder, existing_paths, is_deep_scan):
+    def _is_pruned_directory(self, name):
+        name = name.lower()
+        return name in PRUNED_DIRECTORIES or name.startswith('.')
+
+    def _list_directory(self, directory):
+        """Lê uma pasta: ([(nome, tamanho)] dos .exe, [nomes das subpastas])."""
+        executables, subdirs = [], []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.name)
+                    elif entry.name.lower().endswith('.exe'):
+                        # No Windows o DirEntry já traz o tamanho, sem outra chamada ao sistema
+                        executables.append((entry.name, entry.stat().st_size))
+                except OSError:
+                    continue
+        return executables, subdirs
+
+    def _scan_subfolder(self, folder, existing_paths, max_depth, cancel_events=()):
+        """
+        Procura executáveis em 'folder' até 'max_depth' níveis abaixo dela
+        (0 = só os arquivos da própria pasta). Retorna o jogo encontrado ou None.
+        Para no meio da busca se algum dos 'cancel_events' for sinalizado.
+
+        Pastas cuja data de modificação não mudou desde a última varredura não
+        são relidas: o conteúdo vem do índice salvo pelo ScanStateManager.
+        """
+        index = self.scan_state.get_directory_index(folder)
+        index_updates, removed_dirs = {}, []
+        # Pastas alteradas há menos que isso não entram no índice: a data pode não ter resolução para mudanças seguidas
+        recent_limit_ns = time.time_ns() - INDEX_MIN_AGE_NS
         potential_exes = []
+        pending_dirs = [(folder, 0)]
         try:
-            walk_target = os.walk(folder) if is_deep_scan else [(os.path.dirname(folder), [], [os.path.basename(folder)])]
-            for root, _, files in walk_target:
-                for file in files:
-                    if file.lower().endswith('.exe'):
-                        file_path = os.path.join(root, file)
-                        if self._is_valid_exe(file_path, existing_paths):
-                            try:
-                                size = os.path.getsize(file_path)
-                                potential_exes.append({'path': file_path, 'size': size})
-                            except FileNotFoundError:
-                                continue
-        except PermissionError:
-            logging.warning(f"Permissão negada para acessar a pasta: {folder}")
-            return None
+            while pending_dirs:
+                if any(event.is_set() for event in cancel_events):
+                    return None
+                current_dir, depth = pending_dirs.pop()
+                cached = index.get(current_dir)
+                try:
+                    mtime_ns = os.stat(current_dir).st_mtime_ns
+                    if cached and cached['mtime_ns'] == mtime_ns:
+                        executables, subdirs = cached['executables'], cached['subdirs']
+                    else:
+                        executables, subdirs = self._list_directory(current_dir)
+                        if mtime_ns < recent_limit_ns:
+                            index_updates[current_dir] = {'mtime_ns': mtime_ns, 'executables': executables, 'subdirs': subdirs}
+                        if cached:
+                            removed_dirs.extend(os.path.join(current_dir, name) for name in set(cached['subdirs']) - set(subdirs))
+                except PermissionError:
+                    logging.warning(f"Permissão negada para acessar a pasta: {current_dir}")
+                    if current_dir == folder: return None
+                    continue
+                except OSError as e:
+                    logging.warning(f"Não foi possível ler a pasta '{current_dir}': {e}")
+                    if current_dir == folder: return None
+                    continue
+
+                for name, size in executables:
+                    file_path = os.path.join(current_dir, name)
+                    if self._is_valid_exe(file_path, existing_paths):
+                        potential_exes.append({'path': file_path, 'size': size, 'depth': depth})
+                if depth < max_depth:
+                    pending_dirs.extend((os.path.join(current_dir, name), depth + 1)
+                                        for name in subdirs if not self._is_pruned_directory(name))
+        finally:
+            # Mesmo numa varredura cancelada, o que já foi lido fica para a próxima
+            if index_updates or removed_dirs:
+                self.scan_state.save_directory_index(index_updates, removed_dirs)
 
         if potential_exes:
-            main_exe = max(potential_exes, key=lambda x: x['size'])
+            ranked = get_pe_inspector().rank_executables(potential_exes, folder)
+            # Sem nenhum PE legível (ex.: arquivos bloqueados), volta ao critério do maior arquivo
+            main_exe = ranked[0] if ranked else max(potential_exes, key=lambda x: x['size'])
             return {
                 "name": os.path.splitext(os.path.basename(main_exe['path']))[0],
                 "path": main_exe['path'],
@@ -145,23 +315,66 @@ class LocalGameScanner:
             }
         return None
 
-    def scan_folder(self, path, is_deep_scan=False):
-        """Executa a varredura para jogos locais."""
+    def iter_scan_folder(self, path, is_deep_scan=False, max_depth=None, cancel_event=None):
+        """
+        Executa a varredura para jogos locais, entregando os resultados conforme
+        aparecem: gera (pasta, jogo, concluídas, total) a cada subpasta terminada,
+        com jogo None se nada foi encontrado nela.
+        A busca rápida olha só os arquivos de cada subpasta; a completa desce até
+        'max_depth' níveis (padrão: self.max_depth). A varredura para cedo se
+        'cancel_event' (threading.Event) for sinalizado ou se o gerador for fechado.
+        """
         scan_type = "COMPLETA" if is_deep_scan else "RÁPIDA"
         logging.info(f"Iniciando varredura local {scan_type} em: {path}")
-        found_games = []
+        if max_depth is None:
+            max_depth = self.max_depth if is_deep_scan else 0
+        # Evento próprio: também é sinalizado quando quem consome o gerador desiste dele
+        stop_event = threading.Event()
+        # Os workers olham os dois: o cancelamento de quem chamou interrompe também as buscas em andamento
+        cancel_events = (stop_event,) if cancel_event is None else (stop_event, cancel_event)
         existing_paths = self.game_manager.get_all_executable_paths()
 
         try:
-            subfolders = [f.path for f in os.scandir(path) if f.is_dir()]
+            with os.scandir(path) as entries:
+                subfolders = [entry.path for entry in entries
+                              if entry.is_dir() and not self._is_pruned_directory(entry.name)]
         except (FileNotFoundError, PermissionError) as e:
             logging.error(f"Erro ao acessar '{path}': {e}")
-            return []
+            return
+
+        found_count = 0
+        finished = False
+        executor = ThreadPoolExecutor(max_workers=LOCAL_SCAN_WORKERS, thread_name_prefix="local-scan")
+        futures = {executor.submit(self._scan_subfolder, folder, existing_paths, max_depth, cancel_events): folder
+                   for folder in subfolders}
+        try:
+            for completed, future in enumerate(as_completed(futures), start=1):
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+                game_data = future.result()
+                if game_data: found_count += 1
+                yield futures[future], game_data, completed, len(subfolders)
+            else:
+                finished = True
+        finally:
+            if not finished:
+                stop_event.set()
+                for future in futures: future.cancel()
+            executor.shutdown(wait=True)
+            if finished:
+                logging.info(f"Varredura local {scan_type} concluída. {found_count} potenciais jogos encontrados.")
+            else:
+                logging.info(f"Varredura local {scan_type} cancelada. {found_count} potenciais jogos encontrados até então.")
 
-        for folder in subfolders:
-            game_data = self._scan_subfolder(folder, existing_paths, is_deep_scan)
+    def scan_folder(self, path, is_deep_scan=False, max_depth=None, cancel_event=None, on_folder_scanned=None):
+        """
+        Versão bloqueante de iter_scan_folder: retorna a lista de jogos encontrados.
+        on_folder_scanned(pasta, jogo, concluídas, total) é chamado a cada subpasta terminada.
+        """
+        found_games = []
+        for folder, game_data, completed, total in self.iter_scan_folder(path, is_deep_scan, max_depth, cancel_event):
             if game_data:
                 found_games.append(game_data)
-        
-        logging.info(f"Varredura local {scan_type} concluída. {len(found_games)} potenciais jogos encontrados.")
+            if on_folder_scanned:
+                on_folder_scanned(folder, game_data, completed, total)
         return found_games
@@ -1,43 +1,152 @@
 # core/game_manager.py
 
 import os
+import re
+import json
 import logging
 import sqlite3
 import time
+from collections import defaultdict
+from difflib import SequenceMatcher
 from datetime import datetime
-from core.database import get_db_connection
-from core.artwork_manager import download_steam_artwork
+from core.database import get_db_connection, transaction
+from core.artwork_manager import download_steam_artwork, download_steam_artwork_batch, queue_steam_artwork_download
+from core.scan_state_manager import ScanStateManager
+
+# Pesos do bm25 para as colunas de games_fts: name, summary, genres, tags
+SEARCH_COLUMN_WEIGHTS = (10.0, 1.0, 2.0, 4.0)
+# Fração mínima de trigramas da busca que um nome precisa conter na busca aproximada
+FUZZY_SEARCH_MIN_OVERLAP = 0.5
+# Semelhança mínima (SequenceMatcher) entre a busca e um trecho do nome com o mesmo número de palavras:
+# pega letras trocadas de lugar ("wticher"), que quebram quase todos os trigramas de uma palavra curta
+FUZZY_SEARCH_MIN_RATIO = 0.75
+FUZZY_SEARCH_CANDIDATES = 200
 
 class GameManager:
     def __init__(self):
-        pass
+        self._search_tables = None
 
-    def _game_from_row(self, row):
-        if not row:
-            return None
-        game = dict(row)
-        game['paths'] = self.get_executables_for_game(game['id'])
-        game['tags'] = self._get_tags_for_game(game['id'])
-        return game
+    def _hydrate_games(self, conn, rows):
+        """
+        Monta os dicionários dos jogos em lote: uma consulta para os executáveis
+        e outra para as tags de todas as linhas, unidas em memória.
+        """
+        games = [dict(row) for row in rows if row]
+        if not games:
+            return games
 
-    def _get_tags_for_game(self, game_id):
-        conn = get_db_connection()
-        rows = conn.execute("""
-            SELECT t.name FROM tags t
-            JOIN game_tags gt ON t.id = gt.tag_id
-            WHERE gt.game_id = ?
-        """, (game_id,)).fetchall()
-        conn.close()
-        return [row['name'] for row in rows]
+        # Os IDs são passados como um único array JSON, mantendo o número de
+        # consultas constante independentemente do tamanho da biblioteca.
+        game_ids_json = json.dumps([game['id'] for game in games])
+
+        paths_by_game = defaultdict(list)
+        executables = conn.execute("""
+            SELECT game_id, path, display_name FROM executables
+            WHERE game_id IN (SELECT value FROM json_each(?))
+            ORDER BY id
+        """, (game_ids_json,)).fetchall()
+        for row in executables:
+            paths_by_game[row['game_id']].append({'path': row['path'], 'display_name': row['display_name']})
+
+        tags_by_game = defaultdict(list)
+        tags = conn.execute("""
+            SELECT gt.game_id, t.name FROM game_tags gt
+            JOIN tags t ON t.id = gt.tag_id
+            WHERE gt.game_id IN (SELECT value FROM json_each(?))
+        """, (game_ids_json,)).fetchall()
+        for row in tags:
+            tags_by_game[row['game_id']].append(row['name'])
+
+        for game in games:
+            game['paths'] = paths_by_game.get(game['id'], [])
+            game['tags'] = tags_by_game.get(game['id'], [])
+        return games
 
     def get_executables_for_game(self, game_id):
         conn = get_db_connection()
-        try:
-            executables = conn.execute("SELECT path, display_name FROM executables WHERE game_id = ?", (game_id,)).fetchall()
-            return [dict(row) for row in executables]
-        finally:
-            conn.close()
+        executables = conn.execute("SELECT path, display_name FROM executables WHERE game_id = ?", (game_id,)).fetchall()
+        return [dict(row) for row in executables]
     
+    def _available_search_tables(self, conn):
+        """Retorna quais tabelas FTS existem no banco (o FTS5 pode não estar disponível)."""
+        if self._search_tables is None:
+            rows = conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ('games_fts', 'games_fts_trigram')"
+            ).fetchall()
+            self._search_tables = {row['name'] for row in rows}
+        return self._search_tables
+
+    def _search_game_ids(self, conn, search_text):
+        """
+        Busca no índice FTS e retorna os IDs encontrados, do mais ao menos relevante.
+        Retorna None quando o índice não está disponível e a busca deve usar LIKE.
+        """
+        search_tables = self._available_search_tables(conn)
+        terms = re.findall(r"\w+", search_text)
+        if "games_fts" not in search_tables or not terms:
+            return None
+
+        # Cada termo vira um prefixo ("term"*); termos separados por espaço são combinados com AND
+        match_query = " ".join(f'"{term}"*' for term in terms)
+        weights = ", ".join(str(weight) for weight in SEARCH_COLUMN_WEIGHTS)
+        rows = conn.execute(f"""
+            SELECT rowid FROM games_fts WHERE games_fts MATCH ?
+            ORDER BY bm25(games_fts, {weights})
+        """, (match_query,)).fetchall()
+        game_ids = [row['rowid'] for row in rows]
+
+        text = search_text.strip()
+        if "games_fts_trigram" in search_tables and len(text) >= 3:
+            # Trechos no meio do nome (ex.: "craft" em "Minecraft"), como o antigo LIKE '%termo%'
+            found = set(game_ids)
+            rows = conn.execute(
+                "SELECT rowid FROM games_fts_trigram WHERE games_fts_trigram MATCH ? ORDER BY rank",
+                ('"' + text.replace('"', '""') + '"',)
+            ).fetchall()
+            game_ids.extend(row['rowid'] for row in rows if row['rowid'] not in found)
+            if not game_ids:
+                game_ids = self._fuzzy_search_game_ids(conn, text)
+        return game_ids
+
+    def _fuzzy_search_game_ids(self, conn, text):
+        """Busca tolerante a erros de digitação pelos trigramas do nome."""
+        text = text.lower()
+        trigrams = {text[i:i + 3] for i in range(len(text) - 2)}
+        match_query = " OR ".join('"' + trigram.replace('"', '""') + '"' for trigram in trigrams)
+        rows = conn.execute(
+            "SELECT rowid, name FROM games_fts_trigram WHERE games_fts_trigram MATCH ? ORDER BY rank LIMIT ?",
+            (match_query, FUZZY_SEARCH_CANDIDATES)
+        ).fetchall()
+
+        query_words = text.split()
+        scored = []
+        for position, row in enumerate(rows):
+            name = row['name'].lower()
+            overlap = sum(1 for trigram in trigrams if trigram in name) / len(trigrams)
+            # Os trigramas em comum só pré-selecionam; a nota final também considera a distância de edição
+            words = re.findall(r"\w+", name)
+            span = len(query_words)
+            ratio = max((SequenceMatcher(None, text, " ".join(words[i:i + span])).ratio()
+                         for i in range(max(1, len(words) - span + 1))), default=0.0)
+            if overlap >= FUZZY_SEARCH_MIN_OVERLAP or ratio >= FUZZY_SEARCH_MIN_RATIO:
+                scored.append((-max(overlap, ratio), position, row['rowid']))
+        return [game_id for _, _, game_id in sorted(scored)]
+
+    def _build_search_clause(self, conn, search_text, alias):
+        """
+        Monta o trecho de consulta que filtra os jogos pela busca textual.
+        Retorna (join, condição, parâmetros, ordem_de_relevância); None no lugar do
+        join indica que nenhum jogo casou com a busca.
+        """
+        game_ids = self._search_game_ids(conn, search_text)
+        if game_ids is None:
+            return "", f"{alias}.name LIKE ?", [f"%{search_text}%"], None
+        if not game_ids:
+            return None, None, [], None
+        # A posição no array JSON (coluna 'key') preserva a ordem de relevância
+        join = f"JOIN json_each(?) s ON s.value = {alias}.id"
+        return join, None, [json.dumps(game_ids)], "s.key"
+
     def _get_base_game_query_fields(self, alias=None):
         fields = [
             "id", "name", "source", "app_id", "igdb_id", "summary", "genres", 
@@ -53,33 +162,27 @@ class GameManager:
             return ", ".join(fields)
 
     def add_game(self, name, paths, image_path=None, background_path=None, header_path=None, tags=None, source='local', app_id=None):
-        conn = get_db_connection()
-        cursor = conn.cursor()
         try:
-            cursor.execute("""
-                INSERT INTO games (name, source, app_id, image_path, background_path, header_path)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (name, source, app_id, image_path, background_path, header_path))
-            game_id = cursor.lastrowid
-            for exe in paths:
+            with transaction() as conn:
+                cursor = conn.cursor()
                 cursor.execute("""
-                    INSERT INTO executables (game_id, path, display_name)
-                    VALUES (?, ?, ?)
-                """, (game_id, exe['path'], exe['display_name']))
-            conn.commit()
+                    INSERT INTO games (name, source, app_id, image_path, background_path, header_path)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (name, source, app_id, image_path, background_path, header_path))
+                game_id = cursor.lastrowid
+                for exe in paths:
+                    cursor.execute("""
+                        INSERT INTO executables (game_id, path, display_name)
+                        VALUES (?, ?, ?)
+                    """, (game_id, exe['path'], exe['display_name']))
             logging.info(f"Jogo '{name}' adicionado ao banco de dados com ID {game_id}.")
             return True
         except sqlite3.IntegrityError:
             logging.warning(f"Tentativa de adicionar um jogo com executável duplicado: {paths}")
-            conn.rollback()
             return False
-        finally:
-            conn.close()
 
     def update_game(self, old_game_data, new_game_data):
         game_id = old_game_data['id']
-        conn = get_db_connection()
-        cursor = conn.cursor()
         genres_value = new_game_data.get('genres')
         if genres_value is None:
             genres_value = old_game_data.get('genres')
@@ -92,174 +195,196 @@ class GameManager:
         image_to_save = new_game_data.get('image_path') or new_game_data.get('image') or old_game_data.get('image_path')
         background_to_save = new_game_data.get('background_path') or new_game_data.get('background') or old_game_data.get('background_path')
         header_to_save = new_game_data.get('header_path') or new_game_data.get('header') or old_game_data.get('header_path')
-        cursor.execute("""
-            UPDATE games SET
-                name = ?, image_path = ?, background_path = ?, header_path = ?, source = ?,
-                summary = ?, genres = ?, release_date = ?, igdb_id = ?
-            WHERE id = ?
-        """, (
-            new_game_data.get('name', old_game_data.get('name')),
-            image_to_save, background_to_save, header_to_save,
-            new_game_data.get('source', old_game_data.get('source')),
-            new_game_data.get('summary', old_game_data.get('summary')),
-            genres_to_save,
-            new_game_data.get('release_date', old_game_data.get('release_date')),
-            new_game_data.get('igdb_id', old_game_data.get('igdb_id')),
-            game_id
-        ))
-        cursor.execute("DELETE FROM executables WHERE game_id = ?", (game_id,))
-        for exe in new_game_data.get('paths', []):
-            cursor.execute("INSERT INTO executables (game_id, path, display_name) VALUES (?, ?, ?)", (game_id, exe['path'], exe['display_name']))
-        cursor.execute("DELETE FROM game_tags WHERE game_id = ?", (game_id,))
-        tags_list = new_game_data.get("tags", [])
-        for tag_name in tags_list:
-            cursor.execute("INSERT OR IGNORE INTO tags (name) VALUES (?)", (tag_name,))
-            cursor.execute("SELECT id FROM tags WHERE name = ?", (tag_name,))
-            tag_row = cursor.fetchone()
-            if tag_row:
-                tag_id = tag_row['id']
-                cursor.execute("INSERT INTO game_tags (game_id, tag_id) VALUES (?, ?)", (game_id, tag_id))
-        conn.commit()
-        conn.close()
+        with transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE games SET
+                    name = ?, image_path = ?, background_path = ?, header_path = ?, source = ?,
+                    summary = ?, genres = ?, release_date = ?, igdb_id = ?
+                WHERE id = ?
+            """, (
+                new_game_data.get('name', old_game_data.get('name')),
+                image_to_save, background_to_save, header_to_save,
+                new_game_data.get('source', old_game_data.get('source')),
+                new_game_data.get('summary', old_game_data.get('summary')),
+                genres_to_save,
+                new_game_data.get('release_date', old_game_data.get('release_date')),
+                new_game_data.get('igdb_id', old_game_data.get('igdb_id')),
+                game_id
+            ))
+            cursor.execute("DELETE FROM executables WHERE game_id = ?", (game_id,))
+            for exe in new_game_data.get('paths', []):
+                cursor.execute("INSERT INTO executables (game_id, path, display_name) VALUES (?, ?, ?)", (game_id, exe['path'], exe['display_name']))
+            cursor.execute("DELETE FROM game_tags WHERE game_id = ?", (game_id,))
+            tags_list = new_game_data.get("tags", [])
+            for tag_name in tags_list:
+                cursor.execute("INSERT OR IGNORE INTO tags (name) VALUES (?)", (tag_name,))
+                cursor.execute("SELECT id FROM tags WHERE name = ?", (tag_name,))
+                tag_row = cursor.fetchone()
+                if tag_row:
+                    tag_id = tag_row['id']
+                    cursor.execute("INSERT INTO game_tags (game_id, tag_id) VALUES (?, ?)", (game_id, tag_id))
         logging.info(f"Jogo ID {game_id} atualizado.")
         return True
 
     def delete_game(self, game_id):
-        conn = get_db_connection()
         try:
-            conn.execute("PRAGMA foreign_keys = ON;")
-            conn.execute("DELETE FROM games WHERE id = ?", (game_id,))
-            conn.commit()
+            # As chaves estrangeiras (ON DELETE CASCADE) já vêm ativadas em todas as conexões
+            with transaction() as conn:
+                row = conn.execute("SELECT app_id FROM games WHERE id = ? AND source = 'steam'", (game_id,)).fetchone()
+                if row:
+                    # Se o jogo voltar numa sincronização, o manifesto precisa ser relido para marcá-lo como instalado
+                    ScanStateManager().forget_manifest_states([row['app_id']])
+                conn.execute("DELETE FROM games WHERE id = ?", (game_id,))
             logging.info(f"Jogo ID {game_id} e seus dados associados foram deletados.")
             return True
         except Exception as e:
-            conn.rollback()
             logging.error(f"Erro ao deletar o jogo ID {game_id}: {e}")
             return False
-        finally:
-            conn.close()
     
     def get_all_games(self):
         conn = get_db_connection()
         fields = self._get_base_game_query_fields()
         rows = conn.execute(f"SELECT {fields} FROM games ORDER BY name COLLATE NOCASE ASC").fetchall()
-        conn.close()
-        return [self._game_from_row(row) for row in rows]
+        return self._hydrate_games(conn, rows)
 
     def get_game_by_id(self, game_id):
         if not game_id: return None
         conn = get_db_connection()
         fields = self._get_base_game_query_fields()
         row = conn.execute(f"SELECT {fields} FROM games WHERE id = ?", (game_id,)).fetchone()
-        conn.close()
-        return self._game_from_row(row)
+        games = self._hydrate_games(conn, [row])
+        return games[0] if games else None
+
+    def get_steam_games_by_app_ids(self, app_ids):
+        if not app_ids: return []
+        conn = get_db_connection()
+        fields = self._get_base_game_query_fields()
+        rows = conn.execute(
+            f"SELECT {fields} FROM games WHERE source = 'steam' AND app_id IN (SELECT value FROM json_each(?))",
+            (json.dumps([str(app_id) for app_id in app_ids]),)
+        ).fetchall()
+        return self._hydrate_games(conn, rows)
 
     # --- INÍCIO DA ALTERAÇÃO ---
     def get_filtered_games(self, search_text, tag=None, sort_by="Nome (A-Z)", status_filter="Todos"):
         conn = get_db_connection()
         fields = self._get_base_game_query_fields(alias='g')
         
-        query = f"""
-            SELECT DISTINCT {fields}
-            FROM games g
-            LEFT JOIN game_tags gt ON g.id = gt.game_id
-            LEFT JOIN tags t ON gt.tag_id = t.id
-        """
+        query = f"SELECT {fields} FROM games g"
         
         conditions = []
         params = []
+        relevance_order = None
 
         if search_text:
-            conditions.append("g.name LIKE ?")
-            params.append(f"%{search_text}%")
+            join, condition, search_params, relevance_order = self._build_search_clause(conn, search_text, 'g')
+            if join is None:
+                return []
+            if join:
+                query += f" {join}"
+            if condition:
+                conditions.append(condition)
+            params.extend(search_params)
         
         if tag:
-            conditions.append("t.name = ?")
+            conditions.append("""g.id IN (
+                SELECT gt.game_id FROM game_tags gt
+                JOIN tags t ON t.id = gt.tag_id
+                WHERE t.name = ?
+            )""")
             params.append(tag)
 
-        # Adiciona a nova condição para o filtro de status
+        # Adiciona a nova condição para o filtro de status. O valor é literal
+        # para que o índice parcial de jogos instalados possa ser usado.
         if status_filter == "Instalados":
-            conditions.append("g.status = ?")
-            params.append("INSTALLED")
+            conditions.append("g.status = 'INSTALLED'")
 
         if conditions:
             query += " WHERE " + " AND ".join(conditions)
         
-        if sort_by == "Nome (A-Z)": query += " ORDER BY g.name COLLATE NOCASE ASC"
-        elif sort_by == "Mais Jogado": query += " ORDER BY g.playtime_local DESC"
-        elif sort_by == "Jogado Recentemente": query += " ORDER BY g.last_played_timestamp DESC"
+        order_by = []
+        if sort_by == "Nome (A-Z)": order_by.append("g.name COLLATE NOCASE ASC")
+        elif sort_by == "Mais Jogado": order_by.append("g.playtime_local DESC")
+        elif sort_by == "Jogado Recentemente": order_by.append("g.last_played_timestamp DESC")
+        # A ordenação escolhida pelo usuário prevalece; a relevância da busca desempata
+        if relevance_order:
+            order_by.append(relevance_order)
+        if order_by:
+            query += " ORDER BY " + ", ".join(order_by)
             
         rows = conn.execute(query, params).fetchall()
-        conn.close()
-        return [self._game_from_row(row) for row in rows]
+        return self._hydrate_games(conn, rows)
 
     def get_all_unique_tags(self):
         conn = get_db_connection()
         rows = conn.execute("SELECT name FROM tags ORDER BY name COLLATE NOCASE ASC").fetchall()
-        conn.close()
         return [row['name'] for row in rows]
 
-    def get_favorite_games(self, status_filter="Todos"):
+    def get_favorite_games(self, status_filter="Todos", search_text=None):
         conn = get_db_connection()
-        fields = self._get_base_game_query_fields()
+        fields = self._get_base_game_query_fields(alias='g')
         
-        query = f"SELECT {fields} FROM games WHERE favorite = 1"
+        query = f"SELECT {fields} FROM games g"
+        conditions = ["g.favorite = 1"]
         params = []
+        relevance_order = None
+
+        if search_text:
+            join, condition, search_params, relevance_order = self._build_search_clause(conn, search_text, 'g')
+            if join is None:
+                return []
+            if join:
+                query += f" {join}"
+            if condition:
+                conditions.append(condition)
+            params.extend(search_params)
 
         # Adiciona a condição de status também aos favoritos
         if status_filter == "Instalados":
-            query += " AND status = ?"
-            params.append("INSTALLED")
+            conditions.append("g.status = 'INSTALLED'")
             
-        query += " ORDER BY name COLLATE NOCASE ASC"
+        query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY g.name COLLATE NOCASE ASC"
+        if relevance_order:
+            query += f", {relevance_order}"
         
         rows = conn.execute(query, params).fetchall()
-        conn.close()
-        return [self._game_from_row(row) for row in rows]
+        return self._hydrate_games(conn, rows)
     # --- FIM DA ALTERAÇÃO ---
         
     def get_recent_games(self):
         conn = get_db_connection()
         fields = self._get_base_game_query_fields()
         rows = conn.execute(f"SELECT {fields} FROM games WHERE last_played_timestamp IS NOT NULL ORDER BY last_played_timestamp DESC").fetchall()
-        conn.close()
-        return [self._game_from_row(row) for row in rows]
+        return self._hydrate_games(conn, rows)
 
     def toggle_favorite(self, game_id):
-        conn = get_db_connection()
-        current_status = conn.execute("SELECT favorite FROM games WHERE id = ?", (game_id,)).fetchone()['favorite']
-        new_fav_status = 1 if not current_status else 0
-        conn.execute("UPDATE games SET favorite = ? WHERE id = ?", (new_fav_status, game_id))
-        conn.commit()
-        conn.close()
+        with transaction() as conn:
+            current_status = conn.execute("SELECT favorite FROM games WHERE id = ?", (game_id,)).fetchone()['favorite']
+            new_fav_status = 1 if not current_status else 0
+            conn.execute("UPDATE games SET favorite = ? WHERE id = ?", (new_fav_status, game_id))
 
     def add_playtime(self, game_id, seconds_played):
-        conn = get_db_connection()
-        current_playtime = conn.execute("SELECT playtime_local FROM games WHERE id = ?", (game_id,)).fetchone()['playtime_local'] or 0
-        new_playtime_local = current_playtime + seconds_played
-        conn.execute("UPDATE games SET playtime_local = ? WHERE id = ?", (new_playtime_local, game_id))
-        conn.commit()
-        conn.close()
+        with transaction() as conn:
+            current_playtime = conn.execute("SELECT playtime_local FROM games WHERE id = ?", (game_id,)).fetchone()['playtime_local'] or 0
+            new_playtime_local = current_playtime + seconds_played
+            conn.execute("UPDATE games SET playtime_local = ? WHERE id = ?", (new_playtime_local, game_id))
         logging.info(f"Adicionado {seconds_played}s para o jogo ID {game_id}. Total: {new_playtime_local}s")
 
     def update_last_played(self, game_id):
-        conn = get_db_connection()
-        try:
-            current_timestamp = int(time.time())
+        current_timestamp = int(time.time())
+        with transaction() as conn:
             conn.execute("UPDATE games SET last_played_timestamp = ? WHERE id = ?", (current_timestamp, game_id))
-            conn.commit()
-        finally:
-            conn.close()
 
     def get_all_executable_paths(self):
         conn = get_db_connection()
         rows = conn.execute("SELECT path FROM executables").fetchall()
-        conn.close()
         return {os.path.normcase(row['path']) for row in rows}
 
-    def get_most_common_genre(self):
+    def get_most_common_genre(self, all_games=None):
         from collections import Counter
-        all_games = self.get_all_games()
+        if all_games is None: all_games = self.get_all_games()
         if not all_games: return "N/A"
         genre_list = []
         for game in all_games:
@@ -271,22 +396,11 @@ class GameManager:
         return most_common[0][0]
 
     def add_or_update_steam_game(self, app_id, name, install_dir, status):
-        conn = get_db_connection()
         try:
-            cursor = conn.cursor()
-            game = cursor.execute("SELECT id, image_path FROM games WHERE source = 'steam' AND app_id = ?", (app_id,)).fetchone()
-            if game:
-                game_id = game['id']
-                cursor.execute("UPDATE games SET status = ?, install_dir = ?, name = ? WHERE id = ?", (status, install_dir, name, game_id))
-            else:
-                cursor.execute("INSERT INTO games (name, source, app_id, install_dir, status) VALUES (?, 'steam', ?, ?, ?)", (name, app_id, install_dir, status))
-                game_id = cursor.lastrowid
-            if game_id:
-                executable_path = f"steam://run/{app_id}"
-                exec_exists = cursor.execute("SELECT id FROM executables WHERE game_id = ? AND path = ?", (game_id, executable_path)).fetchone()
-                if not exec_exists:
-                    cursor.execute("INSERT INTO executables (game_id, path, display_name) VALUES (?, ?, ?)", (game_id, executable_path, "Iniciar via Steam"))
-            conn.commit()
+            with transaction() as conn:
+                game = conn.execute("SELECT image_path FROM games WHERE source = 'steam' AND app_id = ?", (app_id,)).fetchone()
+                self._upsert_steam_games(conn, [(app_id, name, install_dir)], status)
+                game_id = conn.execute("SELECT id FROM games WHERE source = 'steam' AND app_id = ?", (app_id,)).fetchone()['id']
             if game_id and (not game or not game['image_path']):
                 logging.info(f"Buscando artes para o jogo '{name}' (AppID: {app_id})...")
                 artwork_paths = download_steam_artwork(app_id)
@@ -294,10 +408,68 @@ class GameManager:
                     self.update_game_artwork(game_id, app_id, **artwork_paths)
         except sqlite3.Error as e:
             logging.error(f"Erro ao adicionar/atualizar jogo da Steam (AppID: {app_id}): {e}")
-        finally:
-            conn.close()
+
+    def sync_installed_steam_games(self, installed_games, uninstalled_app_ids=None):
+        """
+        Aplica numa única transação o resultado de uma varredura dos manifestos:
+        'installed_games' é uma lista de (app_id, nome, pasta de instalação).
+        Sem 'uninstalled_app_ids', todos os jogos da Steam fora da lista passam a
+        'UNINSTALLED'; com ela, só os AppIDs informados.
+        Retorna {app_id: game_id} dos jogos da lista que ainda não têm capa, ou
+        None se a gravação falhar.
+        """
+        installed_app_ids = {str(app_id) for app_id, _, _ in installed_games}
+        try:
+            with transaction() as conn:
+                self._upsert_steam_games(conn, installed_games, 'INSTALLED')
+                if uninstalled_app_ids is None:
+                    self._mark_uninstalled_steam_games(conn, installed_app_ids)
+                elif uninstalled_app_ids:
+                    conn.executemany("UPDATE games SET status = 'UNINSTALLED' WHERE source = 'steam' AND app_id = ?",
+                                     [(str(app_id),) for app_id in uninstalled_app_ids])
+                rows = conn.execute("SELECT id, app_id FROM games WHERE source = 'steam' AND status = 'INSTALLED' AND image_path IS NULL").fetchall()
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao sincronizar os jogos instalados da Steam: {e}")
+            return None
+        return {row['app_id']: row['id'] for row in rows if row['app_id'] in installed_app_ids}
+
+    def _upsert_steam_games(self, conn, games, status):
+        conn.executemany(
+            """INSERT INTO games (name, source, app_id, install_dir, status) VALUES (?, 'steam', ?, ?, ?)
+               ON CONFLICT(source, app_id) WHERE source = 'steam' DO UPDATE
+                   SET status = excluded.status, install_dir = excluded.install_dir, name = excluded.name""",
+            [(name, str(app_id), install_dir, status) for app_id, name, install_dir in games]
+        )
+        # O caminho do executável é único na tabela: OR IGNORE pula os jogos que já o têm
+        conn.executemany(
+            """INSERT OR IGNORE INTO executables (game_id, path, display_name)
+               SELECT id, ?, 'Iniciar via Steam' FROM games WHERE source = 'steam' AND app_id = ?""",
+            [(f"steam://run/{app_id}", str(app_id)) for app_id, _, _ in games]
+        )
+
+    def queue_steam_artwork(self, game_ids_by_app_id, on_finished=None):
+        """
+        Baixa em segundo plano as artes dos jogos informados ({app_id: game_id}) e
+        grava os caminhos no banco. on_finished() é chamado na thread de fundo ao final.
+        """
+        if not game_ids_by_app_id: return
+        game_ids_by_app_id = dict(game_ids_by_app_id)
+
+        def apply_artwork(artwork_by_app_id):
+            self._apply_steam_artwork(game_ids_by_app_id, artwork_by_app_id)
+            if on_finished: on_finished()
+
+        logging.info(f"Artes de {len(game_ids_by_app_id)} jogo(s) da Steam agendadas para download.")
+        queue_steam_artwork_download(game_ids_by_app_id.keys(), apply_artwork)
 
     def update_uninstalled_steam_games(self, installed_app_ids):
+        try:
+            with transaction() as conn:
+                self._mark_uninstalled_steam_games(conn, installed_app_ids)
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao atualizar status de jogos desinstalados da Steam: {e}")
+
+    def _mark_uninstalled_steam_games(self, conn, installed_app_ids):
         if not installed_app_ids:
             query = "UPDATE games SET status = 'UNINSTALLED' WHERE source = 'steam'"
             params = []
@@ -305,64 +477,92 @@ class GameManager:
             placeholder = ', '.join('?' for _ in installed_app_ids)
             query = f"UPDATE games SET status = 'UNINSTALLED' WHERE source = 'steam' AND app_id NOT IN ({placeholder})"
             params = list(installed_app_ids)
-        conn = get_db_connection()
-        try:
-            conn.execute(query, params)
-            conn.commit()
-        except sqlite3.Error as e:
-            logging.error(f"Erro ao atualizar status de jogos desinstalados da Steam: {e}")
-        finally:
-            conn.close()
+        conn.execute(query, params)
 
     def update_game_artwork(self, game_id, app_id, image_path=None, background_path=None, header_path=None):
-        conn = get_db_connection()
         try:
-            conn.execute(
-                """UPDATE games SET 
-                   app_id = ?, image_path = ?, background_path = ?, header_path = ?
-                   WHERE id = ?""",
-                (app_id, image_path, background_path, header_path, game_id)
-            )
-            conn.commit()
+            with transaction() as conn:
+                conn.execute(
+                    """UPDATE games SET 
+                       app_id = ?, image_path = ?, background_path = ?, header_path = ?
+                       WHERE id = ?""",
+                    (app_id, image_path, background_path, header_path, game_id)
+                )
             logging.info(f"Artes atualizadas para o jogo ID {game_id} com o AppID {app_id}.")
         except sqlite3.Error as e:
             logging.error(f"Erro ao atualizar artes para o jogo ID {game_id}: {e}")
-        finally:
-            conn.close()
 
-    def sync_full_steam_library(self, owned_games_list):
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        added_count = 0
-        updated_count = 0
-        cursor.execute("SELECT app_id FROM games WHERE source = 'steam'")
-        existing_app_ids = {row['app_id'] for row in cursor.fetchall()}
+    def sync_full_steam_library(self, owned_games_list, progress_callback=None):
+        """
+        Reconcilia a biblioteca com a lista de jogos da conta Steam.
+        Os dados da API vão para uma tabela temporária e a reconciliação é feita
+        com comandos em lote numa única transação; as artes são baixadas depois,
+        fora da transação.
+        """
+        staged_rows = {}
         for game_data in owned_games_list:
-            app_id = str(game_data.get('appid'))
+            app_id = game_data.get('appid')
             name = game_data.get('name')
-            playtime_minutes = game_data.get('playtime_forever', 0)
             if not app_id or not name:
                 continue
-            if app_id not in existing_app_ids:
-                logging.info(f"Novo jogo da biblioteca encontrado: '{name}'. Adicionando...")
-                cursor.execute(
-                    """INSERT INTO games (name, source, app_id, status, playtime_steam)
-                       VALUES (?, 'steam', ?, 'UNINSTALLED', ?)""",
-                    (name, app_id, playtime_minutes)
-                )
-                game_id = cursor.lastrowid
-                conn.commit()
-                artwork_paths = download_steam_artwork(app_id)
-                if artwork_paths:
-                    self.update_game_artwork(game_id, app_id, **artwork_paths)
-                added_count += 1
-                existing_app_ids.add(app_id)
-            else:
-                cursor.execute(
-                    "UPDATE games SET playtime_steam = ? WHERE app_id = ? AND source = 'steam'",
-                    (playtime_minutes, app_id)
-                )
-                updated_count += 1
-        conn.commit()
-        conn.close()
+            staged_rows[str(app_id)] = (str(app_id), name, game_data.get('playtime_forever', 0) or 0)
+
+        try:
+            with transaction() as conn:
+                conn.execute("""
+                    CREATE TEMP TABLE IF NOT EXISTS steam_owned_staging (
+                        app_id TEXT PRIMARY KEY,
+                        name TEXT NOT NULL,
+                        playtime_steam INTEGER NOT NULL
+                    )
+                """)
+                conn.execute("DELETE FROM steam_owned_staging")
+                conn.executemany("INSERT INTO steam_owned_staging (app_id, name, playtime_steam) VALUES (?, ?, ?)", staged_rows.values())
+                added_app_ids = [row['app_id'] for row in conn.execute("""
+                    SELECT s.app_id FROM steam_owned_staging s
+                    WHERE NOT EXISTS (SELECT 1 FROM games g WHERE g.source = 'steam' AND g.app_id = s.app_id)
+                """)]
+                added_count = len(added_app_ids)
+                # O "WHERE true" evita que o SQLite leia o ON CONFLICT como parte de um JOIN
+                # rowcount conta só as linhas inseridas/atualizadas pelo comando, não as escritas pelos gatilhos da busca
+                upserted_count = conn.execute("""
+                    INSERT INTO games (name, source, app_id, status, playtime_steam)
+                    SELECT name, 'steam', app_id, 'UNINSTALLED', playtime_steam FROM steam_owned_staging WHERE true
+                    ON CONFLICT(source, app_id) WHERE source = 'steam' DO UPDATE
+                        SET playtime_steam = excluded.playtime_steam
+                        WHERE games.playtime_steam IS NOT excluded.playtime_steam
+                """).rowcount
+                updated_count = upserted_count - added_count
+                # Jogos (re)adicionados: o manifesto deles é relido na próxima varredura, mesmo sem ter mudado
+                ScanStateManager().forget_manifest_states(added_app_ids)
+                # Jogos da conta ainda sem capa: os novos e os que falharam numa sincronização anterior
+                missing_artwork = {row['app_id']: row['id'] for row in conn.execute("""
+                    SELECT g.id, g.app_id FROM games g
+                    JOIN steam_owned_staging s ON s.app_id = g.app_id
+                    WHERE g.source = 'steam' AND g.image_path IS NULL
+                """)}
+                conn.execute("DELETE FROM steam_owned_staging")
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao sincronizar a biblioteca completa da Steam: {e}")
+            return
         logging.info(f"Sincronização da biblioteca completa: {added_count} novos jogos adicionados, {updated_count} jogos atualizados.")
+
+        if missing_artwork:
+            # Artes que a Steam não tem (404) ficam registradas pelo ArtworkFetcher e não são pedidas de novo tão cedo
+            logging.info(f"Baixando artes de {len(missing_artwork)} jogo(s)...")
+            artwork_by_app_id = download_steam_artwork_batch(missing_artwork.keys(), progress_callback=progress_callback)
+            self._apply_steam_artwork(missing_artwork, artwork_by_app_id)
+
+    def _apply_steam_artwork(self, game_ids_by_app_id, artwork_by_app_id):
+        """Grava numa única transação os caminhos das artes baixadas para vários jogos."""
+        updates = [
+            (paths.get('image_path'), paths.get('background_path'), paths.get('header_path'), game_ids_by_app_id[app_id])
+            for app_id, paths in artwork_by_app_id.items() if app_id in game_ids_by_app_id
+        ]
+        if not updates: return
+        try:
+            with transaction() as conn:
+                conn.executemany("UPDATE games SET image_path = ?, background_path = ?, header_path = ? WHERE id = ?", updates)
+            logging.info(f"Artes atualizadas para {len(updates)} jogo(s) da Steam.")
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao gravar as artes dos jogos da Steam: {e}")
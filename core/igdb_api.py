@@ -3,133 +3,337 @@
 import os
 import requests
 import time
-from PIL import Image
-from io import BytesIO
+import logging
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from config import TWITCH_CLIENT_ID, TWITCH_CLIENT_SECRET
 
-from googletrans import Translator
-
-def _translate_text(text, dest_language='pt'):
-    """Função auxiliar para traduzir um texto, com tratamento de erro."""
-    if not text:
-        return ""
-    try:
-        translator = Translator()
-        # O argumento 'timeout' foi REMOVIDO da chamada abaixo
-        translated = translator.translate(text, dest=dest_language)
-        
-        if translated and translated.text:
-            print(f"Texto traduzido com sucesso para: {translated.text[:50]}...")
-            return translated.text
-        else:
-            # Caso a API retorne algo inesperado, mas sem erro
-            raise Exception("A API de tradução retornou uma resposta vazia.")
+from core.artwork_fetcher import get_artwork_fetcher, FETCH_OK_STATUSES
+from core.igdb_cache import get_igdb_cache, make_cache_key
+from core.translation import translate_texts, DEFAULT_DEST_LANGUAGE
+from core.settings_manager import SettingsManager
+from core.database import transaction
 
-    except Exception as e:
-        print(f"Erro na tradução: {e}")
-        return text # Em caso de erro, retorna o texto original
+GAME_SEARCH_FIELDS = "name, summary, genres.name, first_release_date, cover.url, screenshots.url"
+GAME_SEARCH_FILTER = "where category = 0"
 
-def download_and_save_images(game_data):
-    # Esta função continua a mesma
-    if not game_data or not game_data.get("igdb_id"):
-        return {}
+# Limites da API do IGDB: 4 requisições por segundo e até 10 consultas por /multiquery
+IGDB_REQUESTS_PER_SECOND = 4
+MULTIQUERY_MAX_QUERIES = 10
+# Lotes de /multiquery enviados ao mesmo tempo (o IGDB aceita até 8 requisições abertas)
+MULTIQUERY_CONCURRENCY = 4
+REQUEST_TIMEOUT = (5, 30)  # (conexão, leitura) em segundos
 
-    artwork_folder = os.path.join("game_artwork", str(game_data["igdb_id"]))
-    os.makedirs(artwork_folder, exist_ok=True)
+# Token de acesso guardado na tabela 'settings', para valer entre execuções
+ACCESS_TOKEN_SETTING = "igdb_access_token"
+TOKEN_EXPIRES_AT_SETTING = "igdb_token_expires_at"
+# Margem antes do vencimento em que o token é renovado em segundo plano
+TOKEN_REFRESH_MARGIN_SECONDS = 60 * 60
+# Maior espera de um único timer: no Windows, esperas acima de ~49 dias (threading.TIMEOUT_MAX)
+# estouram; o timer dispara antes e reagenda se ainda não for hora de renovar
+MAX_REFRESH_TIMER_SECONDS = 60 * 60 * 24
 
-    saved_paths = {}
 
+class _TokenBucket:
+    """Limitador de ritmo: até 'capacity' requisições de uma vez, repostas a 'rate' por segundo."""
+    def __init__(self, rate, capacity):
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self._rate
+            time.sleep(wait)
+
+# Compartilhado por todas as instâncias: o limite do IGDB vale para a aplicação inteira
+_rate_limiter = _TokenBucket(IGDB_REQUESTS_PER_SECOND, IGDB_REQUESTS_PER_SECOND)
+
+
+class _RateLimitedRetry(Retry):
+    """Retry do urllib3 que também passa pelo limitador antes de cada nova tentativa."""
+    def sleep(self, response=None):
+        super().sleep(response)
+        _rate_limiter.acquire()
+
+def _quote(text):
+    """Escapa um texto para usar entre aspas numa consulta do IGDB."""
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+def _format_game(game):
+    # O resumo fica no idioma original; translate_game_summaries traduz o do jogo escolhido
+    summary = game.get("summary")
+
+    return {
+        "igdb_id": game.get("id"),
+        "name": game.get("name"),
+        "summary": summary or "Nenhuma descrição encontrada.",
+        "summary_translated": not summary,
+        "genres": [genre["name"] for genre in game.get("genres", [])],
+        "release_date": time.strftime('%Y-%m-%d', time.gmtime(game.get("first_release_date", 0))),
+        "cover_url": game.get("cover", {}).get("url", "").replace("/t_thumb/", "/t_cover_big/"),
+        "screenshot_urls": [ss["url"].replace("/t_thumb/", "/t_screenshot_huge/") for ss in game.get("screenshots", [])]
+    }
+
+def translate_game_summaries(games, dest_language=DEFAULT_DEST_LANGUAGE):
+    """
+    Traduz os resumos dos resultados do IGDB escolhidos pelo usuário (todos numa
+    chamada) e devolve cópias com o resumo traduzido. As buscas trazem o resumo
+    original; a tradução só acontece aqui, para os jogos que serão usados.
+    """
+    games = [dict(game) for game in games]
+    to_translate = [game for game in games if game.get("summary") and not game.get("summary_translated")]
+    if to_translate:
+        for game, translated in zip(to_translate, translate_texts([game["summary"] for game in to_translate], dest_language)):
+            game["summary"] = translated
+            game["summary_translated"] = True
+    return games
+
+def get_igdb_artwork_jobs(game_data):
+    """Downloads (chave, url, caminho local) da capa e do primeiro screenshot de um resultado do IGDB."""
+    if not game_data or not game_data.get("igdb_id"):
+        return []
+
+    artwork_folder = os.path.join("game_artwork", str(game_data["igdb_id"]))
+    jobs = []
     cover_url = game_data.get("cover_url")
     if cover_url:
-        try:
-            full_url = "https:" + cover_url
-            response = requests.get(full_url, stream=True)
-            response.raise_for_status()
-            image = Image.open(BytesIO(response.content))
-            save_path = os.path.join(artwork_folder, "poster.jpg")
-            image.convert("RGB").save(save_path, "JPEG", quality=90)
-            saved_paths["image"] = save_path
-            print(f"Capa salva em: {save_path}")
-        except requests.exceptions.RequestException as e:
-            print(f"Erro ao baixar a capa de {full_url}: {e}")
-
+        jobs.append(("image", "https:" + cover_url, os.path.join(artwork_folder, "poster.jpg")))
     screenshot_urls = game_data.get("screenshot_urls", [])
     if screenshot_urls:
-        try:
-            full_url = "https:" + screenshot_urls[0]
-            response = requests.get(full_url, stream=True)
-            response.raise_for_status()
-            image = Image.open(BytesIO(response.content))
-            save_path = os.path.join(artwork_folder, "background.jpg")
-            image.convert("RGB").save(save_path, "JPEG", quality=85)
-            saved_paths["background"] = save_path
-            saved_paths["header"] = save_path
-            print(f"Screenshot salvo em: {save_path}")
-        except requests.exceptions.RequestException as e:
-            print(f"Erro ao baixar o screenshot de {full_url}: {e}")
+        jobs.append(("background", "https:" + screenshot_urls[0], os.path.join(artwork_folder, "background.jpg")))
+
+    return jobs
+
+def download_and_save_images(game_data, progress_callback=None):
+    jobs = get_igdb_artwork_jobs(game_data)
+    if not jobs:
+        return {}
+
+    # A capa e o primeiro screenshot são baixados em paralelo pelo mesmo motor das artes da Steam
+    saved_paths = {}
+    # revalidate: se a arte já existir, uma requisição condicional confirma se ela mudou no IGDB
+    results = get_artwork_fetcher().fetch_many(jobs, progress_callback=progress_callback, revalidate=True)
+    for key, result in results.items():
+        if result["status"] in FETCH_OK_STATUSES and result["path"]:
+            saved_paths[key] = result["path"]
+            print(f"Imagem '{key}' salva em: {result['path']}")
+        else:
+            print(f"Erro ao baixar a imagem '{key}' do jogo {game_data['igdb_id']}.")
+    if "background" in saved_paths:
+        saved_paths["header"] = saved_paths["background"]
 
     return saved_paths
 
 class IGDB_API:
-    # O resto da classe continua o mesmo
+    """
+    Cliente da API do IGDB, compartilhado pela aplicação (ver get_igdb_api).
+
+    Usa uma requests.Session (reaproveita conexões), guarda o token de acesso
+    com o vencimento na tabela 'settings' e o renova em segundo plano antes de
+    vencer. Um lock garante que só uma thread peça token novo por vez; se a API
+    responder 401, o token é renovado e a requisição repetida uma vez.
+    """
     def __init__(self):
         self._client_id = TWITCH_CLIENT_ID
         self._client_secret = TWITCH_CLIENT_SECRET
         self._access_token = None
         self._token_expiration_time = 0
         self._api_url = "https://api.igdb.com/v4/"
+        self._token_lock = threading.Lock()
+        self._refresh_timer = None
+        self.session = self._create_session()
+        self._load_saved_token()
+
+    def _create_session(self):
+        # As consultas do IGDB só leem dados: repetir um POST após 429/5xx é seguro
+        retry = _RateLimitedRetry(
+            total=3, connect=3, read=2, backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "POST"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=MULTIQUERY_CONCURRENCY * 2, max_retries=retry)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        return session
+
+    def _load_saved_token(self):
+        settings = SettingsManager()
+        token = settings.get_setting(ACCESS_TOKEN_SETTING)
+        try:
+            expires_at = float(settings.get_setting(TOKEN_EXPIRES_AT_SETTING) or 0)
+        except ValueError:
+            expires_at = 0
+        if token and expires_at > time.time():
+            self._access_token = token
+            self._token_expiration_time = expires_at
+            self._schedule_refresh()
 
     def _get_access_token(self):
+        """Pede um token novo à Twitch e o salva. Deve ser chamado com _token_lock."""
         try:
             url = "https://id.twitch.tv/oauth2/token"
             params = { "client_id": self._client_id, "client_secret": self._client_secret, "grant_type": "client_credentials" }
-            response = requests.post(url, params=params)
+            response = self.session.post(url, params=params, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             data = response.json()
             self._access_token = data["access_token"]
             self._token_expiration_time = time.time() + data["expires_in"] - 60
             print("Novo token de acesso do IGDB obtido com sucesso.")
-            return True
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, KeyError, ValueError) as e:
             print(f"Erro ao obter token de acesso do IGDB: {e}")
             return False
 
-    def _get_headers(self):
-        if not self._access_token or time.time() >= self._token_expiration_time:
+        try:
+            # Gravado direto (sem SettingsManager.save_setting) para o token não aparecer no log
+            with transaction() as conn:
+                conn.executemany("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", [
+                    (ACCESS_TOKEN_SETTING, self._access_token),
+                    (TOKEN_EXPIRES_AT_SETTING, str(self._token_expiration_time)),
+                ])
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao salvar o token de acesso do IGDB: {e}")
+        self._schedule_refresh()
+        return True
+
+    def _schedule_refresh(self):
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+        delay = max(0, self._token_expiration_time - TOKEN_REFRESH_MARGIN_SECONDS - time.time())
+        delay = min(delay, MAX_REFRESH_TIMER_SECONDS)
+        self._refresh_timer = threading.Timer(delay, self._refresh_in_background)
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
+
+    def _refresh_in_background(self):
+        with self._token_lock:
+            # Ainda não é hora (timer limitado a MAX_REFRESH_TIMER_SECONDS, ou outra thread já renovou)
+            if self._token_expiration_time - time.time() > TOKEN_REFRESH_MARGIN_SECONDS:
+                self._schedule_refresh()
+                return
             if not self._get_access_token():
-                return None
-        return { "Client-ID": self._client_id, "Authorization": f"Bearer {self._access_token}" }
+                logging.warning("Renovação antecipada do token do IGDB falhou; ele será pedido de novo quando necessário.")
 
-    def search_games(self, game_name, limit=5):
-        headers = self._get_headers()
-        if not headers:
-            return None
+    def _get_headers(self, rejected_token=None):
+        """Cabeçalhos com um token válido. 'rejected_token' é o token que a API acabou de recusar (401)."""
+        with self._token_lock:
+            expired = not self._access_token or time.time() >= self._token_expiration_time
+            if expired or (rejected_token and rejected_token == self._access_token):
+                if not self._get_access_token():
+                    return None
+            return { "Client-ID": self._client_id, "Authorization": f"Bearer {self._access_token}" }
+
+    def _post(self, endpoint, query_data):
+        """Envia uma consulta ao IGDB e devolve o JSON; lança requests.RequestException em caso de erro."""
+        rejected_token = None
+        for _ in range(2):
+            headers = self._get_headers(rejected_token)
+            if not headers:
+                raise requests.exceptions.RequestException("Token de acesso do IGDB indisponível.")
+            _rate_limiter.acquire()
+            response = self.session.post(self._api_url + endpoint, headers=headers, data=query_data, timeout=REQUEST_TIMEOUT)
+            if response.status_code != 401: break
+            # Token revogado ou vencido antes da hora: renova e tenta mais uma vez
+            rejected_token = headers["Authorization"].split(" ", 1)[1]
+            logging.warning("O IGDB recusou o token de acesso (401); renovando.")
+        response.raise_for_status()
+        return response.json()
+
+    def shutdown(self):
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
 
-        query_data = f'search "{game_name}"; fields name, summary, genres.name, first_release_date, cover.url, screenshots.url; limit {limit}; where category = 0;'
+    def _search_cache_key(self, game_name, limit):
+        # Nomes iguais (após normalização) reaproveitam a resposta em cache
+        return make_cache_key("games", game_name, GAME_SEARCH_FIELDS, f"limit {limit}; {GAME_SEARCH_FILTER}")
+
+    def search_games(self, game_name, limit=5):
+        query_data = f'search {_quote(game_name)}; fields {GAME_SEARCH_FIELDS}; limit {limit}; {GAME_SEARCH_FILTER};'
+        cache_key = self._search_cache_key(game_name, limit)
 
         try:
-            response = requests.post(self._api_url + "games", headers=headers, data=query_data)
-            response.raise_for_status()
-            found_games = response.json()
-            
-            formatted_games = []
-            for game in found_games:
-                original_summary = game.get("summary", "Nenhuma descrição encontrada.")
-                translated_summary = _translate_text(original_summary)
-
-                formatted_game = {
-                    "igdb_id": game.get("id"),
-                    "name": game.get("name"),
-                    "summary": translated_summary,
-                    "genres": [genre["name"] for genre in game.get("genres", [])],
-                    "release_date": time.strftime('%Y-%m-%d', time.gmtime(game.get("first_release_date", 0))),
-                    "cover_url": game.get("cover", {}).get("url", "").replace("/t_thumb/", "/t_cover_big/"),
-                    "screenshot_urls": [ss["url"].replace("/t_thumb/", "/t_screenshot_huge/") for ss in game.get("screenshots", [])]
-                }
-                formatted_games.append(formatted_game)
-
-            return formatted_games
+            found_games = get_igdb_cache().get_or_fetch(cache_key, "games", lambda: self._post("games", query_data))
+            return [_format_game(game) for game in found_games]
 
         except requests.exceptions.RequestException as e:
             print(f"Erro ao buscar jogos no IGDB: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    def search_games_many(self, names_by_key, limit=5):
+        """
+        Busca vários jogos de uma vez. 'names_by_key' é {chave: nome} (ex.: game_id -> nome)
+        e o retorno é {chave: resultados}, com None para as buscas que falharam.
+        Respostas válidas vêm do cache; as demais são agrupadas em requisições
+        /multiquery de até 10 buscas, algumas em paralelo, dentro do limite de ritmo do IGDB.
+        """
+        cache = get_igdb_cache()
+        raw_by_name = {}
+        stale_by_name = {}
+        missing = []
+        for name in dict.fromkeys(names_by_key.values()):
+            cached = cache.lookup(self._search_cache_key(name, limit))
+            if cached and cached[1]:
+                raw_by_name[name] = cached[0]
+                continue
+            if cached: stale_by_name[name] = cached[0]
+            missing.append(name)
+
+        batches = [missing[i:i + MULTIQUERY_MAX_QUERIES] for i in range(0, len(missing), MULTIQUERY_MAX_QUERIES)]
+        if batches:
+            print(f"Buscando {len(missing)} jogo(s) no IGDB em {len(batches)} requisição(ões) /multiquery...")
+            with ThreadPoolExecutor(max_workers=MULTIQUERY_CONCURRENCY, thread_name_prefix="igdb-multiquery") as executor:
+                for batch, results in zip(batches, executor.map(lambda batch: self._multiquery_search(batch, limit), batches)):
+                    for name in batch:
+                        if results is not None and name in results:
+                            raw_by_name[name] = results[name]
+                            cache.store(self._search_cache_key(name, limit), "games", results[name])
+                        elif name in stale_by_name:
+                            # Lote falhou: a resposta antiga do cache é melhor que nenhuma
+                            raw_by_name[name] = stale_by_name[name]
+
+        formatted_by_name = {name: [_format_game(game) for game in games] for name, games in raw_by_name.items()}
+        return {key: formatted_by_name.get(name) for key, name in names_by_key.items()}
+
+    def _multiquery_search(self, names, limit):
+        """Uma requisição /multiquery com uma busca por nome. Retorna {nome: jogos} ou None se falhar."""
+        query_data = "".join(
+            f'query games "q{i}" {{ search {_quote(name)}; fields {GAME_SEARCH_FIELDS}; limit {limit}; {GAME_SEARCH_FILTER}; }};'
+            for i, name in enumerate(names)
+        )
+        try:
+            response = self._post("multiquery", query_data)
+        except requests.exceptions.RequestException as e:
+            print(f"Erro ao buscar jogos no IGDB (multiquery): {e}")
+            return None
+        results = {}
+        for item in response:
+            index = item.get("name", "")[1:]
+            if index.isdigit() and int(index) < len(names):
+                results[names[int(index)]] = item.get("result", [])
+        return results
+
+
+_igdb_api = None
+_igdb_api_lock = threading.Lock()
+
+def get_igdb_api():
+    """Cliente compartilhado: um só token, uma só sessão e um só limite de ritmo para a aplicação."""
+    global _igdb_api
+    with _igdb_api_lock:
+        if _igdb_api is None:
+            _igdb_api = IGDB_API()
+        return _igdb_api
@@ -0,0 +1,156 @@
+# core/igdb_cache.py
+
+import json
+import time
+import logging
+import sqlite3
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from core.database import get_db_connection, transaction
+from core.title_matcher import normalize_title
+
+# Por quanto tempo uma resposta é usada sem consultar o IGDB
+CACHE_TTL_SECONDS = 60 * 60 * 24 * 7
+# Buscas sem resultado expiram antes: o jogo pode ser cadastrado no IGDB depois
+EMPTY_RESULT_TTL_SECONDS = 60 * 60 * 24
+# Depois do TTL e até esse limite, a resposta antiga ainda é devolvida na hora
+# enquanto uma nova é buscada em segundo plano (stale-while-revalidate)
+MAX_STALE_SECONDS = 60 * 60 * 24 * 30
+# Intervalo mínimo entre as limpezas das respostas mais velhas que MAX_STALE_SECONDS
+PRUNE_INTERVAL_SECONDS = 60 * 60
+
+
+def make_cache_key(endpoint, search, fields, extra=""):
+    """Chave de uma consulta: endpoint, termo de busca normalizado, campos e o resto da consulta."""
+    normalized_fields = ",".join(sorted(field.strip() for field in fields.split(",")))
+    return f"{endpoint}|{normalize_title(search)}|{normalized_fields}|{extra}"
+
+
+class IGDBResponseCache:
+    """
+    Cache das respostas da API do IGDB na tabela 'igdb_response_cache'.
+
+    Consultas idênticas feitas ao mesmo tempo (por threads diferentes) viram uma
+    única requisição: as demais esperam o resultado da primeira. Respostas
+    vencidas são devolvidas enquanto a nova é buscada em segundo plano, e
+    continuam valendo se a API estiver fora do ar.
+    """
+    def __init__(self, ttl=CACHE_TTL_SECONDS, empty_ttl=EMPTY_RESULT_TTL_SECONDS, max_stale=MAX_STALE_SECONDS):
+        self.ttl = ttl
+        self.empty_ttl = empty_ttl
+        self.max_stale = max_stale
+        self._in_flight = {}
+        self._last_prune = 0
+        self._lock = threading.Lock()
+        self._revalidate_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="igdb-revalidate")
+
+    def get_or_fetch(self, cache_key, endpoint, fetch):
+        """
+        Retorna a resposta de 'cache_key', chamando fetch() (que devolve o JSON
+        da API ou lança exceção) só quando não houver resposta utilizável.
+        """
+        cached = self._load(cache_key)
+        if cached is not None:
+            response, age = cached
+            ttl = self.ttl if response else self.empty_ttl
+            if age < ttl:
+                return response
+            if age < self.max_stale:
+                self._revalidate_in_background(cache_key, endpoint, fetch)
+                return response
+
+        try:
+            return self._fetch_coalesced(cache_key, endpoint, fetch)
+        except Exception as e:
+            if cached is None: raise
+            # Sem conexão com o IGDB: uma resposta antiga é melhor que nenhuma
+            logging.warning(f"Falha ao consultar o IGDB, usando resposta antiga do cache: {e}")
+            return cached[0]
+
+    def _fetch_coalesced(self, cache_key, endpoint, fetch):
+        with self._lock:
+            future = self._in_flight.get(cache_key)
+            is_leader = future is None
+            if is_leader:
+                future = self._in_flight[cache_key] = Future()
+        if not is_leader:
+            return future.result()
+
+        try:
+            response = fetch()
+            self.store(cache_key, endpoint, response)
+            future.set_result(response)
+            return response
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(cache_key, None)
+
+    def _revalidate_in_background(self, cache_key, endpoint, fetch):
+        with self._lock:
+            if cache_key in self._in_flight: return
+
+        def run():
+            try:
+                self._fetch_coalesced(cache_key, endpoint, fetch)
+            except Exception as e:
+                logging.warning(f"Não foi possível atualizar a resposta do IGDB em cache: {e}")
+
+        self._revalidate_executor.submit(run)
+
+    def lookup(self, cache_key):
+        """Retorna (resposta, ainda_válida) da consulta em cache, ou None se não houver."""
+        cached = self._load(cache_key)
+        if cached is None: return None
+        response, age = cached
+        return response, age < (self.ttl if response else self.empty_ttl)
+
+    def _load(self, cache_key):
+        try:
+            row = get_db_connection().execute(
+                "SELECT response, fetched_at FROM igdb_response_cache WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao ler o cache do IGDB: {e}")
+            return None
+        if not row: return None
+        return json.loads(row['response']), time.time() - row['fetched_at']
+
+    def store(self, cache_key, endpoint, response):
+        now = int(time.time())
+        try:
+            with transaction() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO igdb_response_cache (cache_key, endpoint, response, fetched_at) VALUES (?, ?, ?, ?)",
+                    (cache_key, endpoint, json.dumps(response), now)
+                )
+                # De tempos em tempos (e na primeira gravação da sessão) apaga o que já passou do max_stale
+                if now - self._last_prune >= PRUNE_INTERVAL_SECONDS:
+                    self._last_prune = now
+                    pruned = conn.execute("DELETE FROM igdb_response_cache WHERE fetched_at < ?", (now - self.max_stale,)).rowcount
+                    if pruned:
+                        logging.info(f"Cache do IGDB: {pruned} resposta(s) antiga(s) removida(s).")
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao salvar a resposta do IGDB no cache: {e}")
+
+    def clear(self):
+        with transaction() as conn:
+            conn.execute("DELETE FROM igdb_response_cache")
+
+    def shutdown(self):
+        self._revalidate_executor.shutdown(wait=False, cancel_futures=True)
+
+
+_igdb_cache = None
+_igdb_cache_lock = threading.Lock()
+
+def get_igdb_cache():
+    """Instância compartilhada: a coalescência só funciona se todos usarem o mesmo cache."""
+    global _igdb_cache
+    with _igdb_cache_lock:
+        if _igdb_cache is None:
+            _igdb_cache = IGDBResponseCache()
+        return _igdb_cache
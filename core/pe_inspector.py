@@ -0,0 +1,260 @@
+# core/pe_inspector.py
+
+import os
+import re
+import json
+import mmap
+import math
+import struct
+import logging
+import sqlite3
+import threading
+
+from core.database import get_db_connection, transaction
+
+# Subsistemas do cabeçalho opcional do PE
+SUBSYSTEM_GUI = 2
+SUBSYSTEM_CONSOLE = 3
+
+IMAGE_FILE_DLL = 0x2000
+RT_VERSION = 16
+RESOURCE_DATA_DIRECTORY = 2
+
+# Limites de leitura: só o cabeçalho e o bloco de versão são tocados, nunca o binário inteiro
+MAX_HEADER_OFFSET = 64 * 1024
+MAX_VERSION_INFO_SIZE = 64 * 1024
+MAX_SECTIONS = 96
+
+VERSION_STRING_KEYS = ("ProductName", "FileDescription", "CompanyName", "OriginalFilename")
+
+# Termos que indicam instaladores, ferramentas de suporte e afins (comparados em minúsculas)
+NON_GAME_TERMS = (
+    "setup", "install", "uninstall", "redistributable", "redist", "crash", "report",
+    "updater", "update", "directx", "visual c++", "runtime", "benchmark", "config",
+    "inno setup", "nullsoft", "installshield", "easy anti-cheat", "battleye",
+)
+
+# Cache em memória das inspeções desta sessão, além da tabela 'pe_inspection_cache'
+MEMORY_CACHE_LIMIT = 4096
+
+
+def _read_version_strings(blob):
+    """Extrai as strings do VS_VERSIONINFO (UTF-16) sem montar a árvore inteira."""
+    strings = {}
+    for key in VERSION_STRING_KEYS:
+        encoded_key = (key + "\0").encode("utf-16-le")
+        key_pos = blob.find(encoded_key)
+        # A estrutura String começa 6 bytes antes da chave: wLength, wValueLength, wType
+        if key_pos < 6: continue
+        value_length = struct.unpack_from("<H", blob, key_pos - 4)[0]
+        value_pos = key_pos + len(encoded_key)
+        value_pos += (-value_pos) % 4
+        raw_value = blob[value_pos:value_pos + value_length * 2]
+        value = raw_value.decode("utf-16-le", errors="ignore").split("\0", 1)[0].strip()
+        if value: strings[key] = value
+    return strings
+
+
+def _rva_to_offset(sections, rva):
+    for virtual_address, virtual_size, raw_offset, raw_size in sections:
+        if virtual_address <= rva < virtual_address + max(virtual_size, raw_size):
+            return raw_offset + (rva - virtual_address)
+    return None
+
+
+def _find_version_resource(data, rsrc_offset, sections):
+    """Desce a árvore de recursos até o primeiro RT_VERSION e devolve (offset, tamanho) dos dados."""
+    def entries(directory_offset):
+        named, ids = struct.unpack_from("<HH", data, directory_offset + 12)
+        for i in range(min(named + ids, 256)):
+            yield struct.unpack_from("<II", data, directory_offset + 16 + i * 8)
+
+    for name, target in entries(rsrc_offset):
+        if name != RT_VERSION or not target & 0x80000000: continue
+        # Nível 2 (ID do recurso) e nível 3 (idioma): usa a primeira entrada de cada
+        offset = rsrc_offset + (target & 0x7FFFFFFF)
+        for _ in range(2):
+            first = next(entries(offset), None)
+            if first is None: return None
+            target = first[1]
+            if not target & 0x80000000: break
+            offset = rsrc_offset + (target & 0x7FFFFFFF)
+        if target & 0x80000000: return None
+        data_rva, data_size = struct.unpack_from("<II", data, rsrc_offset + (target & 0x7FFFFFFF))
+        data_offset = _rva_to_offset(sections, data_rva)
+        if data_offset is None: return None
+        return data_offset, min(data_size, MAX_VERSION_INFO_SIZE)
+    return None
+
+
+def read_pe_info(path):
+    """
+    Lê o cabeçalho PE e as strings de versão de um executável via mmap: as
+    páginas efetivamente lidas são as do cabeçalho e as do bloco de versão.
+    Retorna um dicionário com 'is_pe', 'is_dll', 'subsystem', 'machine' e as
+    strings de versão encontradas.
+    """
+    info = {"is_pe": False}
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < 64: return info
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if data[:2] != b"MZ": return info
+                pe_offset = struct.unpack_from("<I", data, 0x3C)[0]
+                if pe_offset > MAX_HEADER_OFFSET or pe_offset + 24 > size or data[pe_offset:pe_offset + 4] != b"PE\0\0":
+                    return info
+                machine, section_count, _, _, _, optional_size, characteristics = struct.unpack_from("<HHIIIHH", data, pe_offset + 4)
+                optional_offset = pe_offset + 24
+                magic = struct.unpack_from("<H", data, optional_offset)[0]
+                if magic not in (0x10B, 0x20B): return info
+                info.update({
+                    "is_pe": True,
+                    "is_dll": bool(characteristics & IMAGE_FILE_DLL),
+                    "machine": machine,
+                    "subsystem": struct.unpack_from("<H", data, optional_offset + 68)[0],
+                })
+
+                # Diretórios de dados: 96 bytes depois do início no PE32, 112 no PE32+
+                directories_offset = optional_offset + (96 if magic == 0x10B else 112)
+                directory_count = struct.unpack_from("<I", data, directories_offset - 4)[0]
+                if directory_count <= RESOURCE_DATA_DIRECTORY: return info
+                rsrc_rva, rsrc_size = struct.unpack_from("<II", data, directories_offset + RESOURCE_DATA_DIRECTORY * 8)
+                if not rsrc_rva or not rsrc_size: return info
+
+                sections_offset = optional_offset + optional_size
+                sections = []
+                for i in range(min(section_count, MAX_SECTIONS)):
+                    virtual_size, virtual_address, raw_size, raw_offset = struct.unpack_from("<IIII", data, sections_offset + i * 40 + 8)
+                    sections.append((virtual_address, virtual_size, raw_offset, raw_size))
+                rsrc_offset = _rva_to_offset(sections, rsrc_rva)
+                if rsrc_offset is None or rsrc_offset >= size: return info
+
+                version_location = _find_version_resource(data, rsrc_offset, sections)
+                if version_location:
+                    version_offset, version_size = version_location
+                    info.update(_read_version_strings(data[version_offset:version_offset + version_size]))
+    except (OSError, ValueError, struct.error) as e:
+        # Arquivo truncado, bloqueado ou com cabeçalho inválido: fica só com o que foi lido
+        logging.debug(f"Não foi possível inspecionar o executável '{path}': {e}")
+    return info
+
+
+def _tokens(text):
+    return {token for token in re.split(r"[^a-z0-9]+", (text or "").lower()) if len(token) > 1}
+
+
+def score_executable(path, size, depth, info, folder_name):
+    """
+    Pontua um executável candidato a principal de um jogo: quanto maior, mais
+    provável. Considera subsistema, strings de versão, tamanho e profundidade.
+    Retorna None para arquivos que não são executáveis de aplicação (DLLs, não-PE).
+    """
+    if not info.get("is_pe") or info.get("is_dll"):
+        return None
+    score = 0.0
+    subsystem = info.get("subsystem")
+    if subsystem == SUBSYSTEM_GUI:
+        score += 30
+    elif subsystem == SUBSYSTEM_CONSOLE:
+        score -= 20
+
+    version_text = " ".join(info.get(key, "") for key in VERSION_STRING_KEYS).lower()
+    file_name = os.path.splitext(os.path.basename(path))[0].lower()
+    if any(term in version_text for term in NON_GAME_TERMS):
+        score -= 40
+    if any(term in file_name for term in NON_GAME_TERMS):
+        score -= 25
+
+    # Nome do produto ou do arquivo parecido com o nome da pasta do jogo
+    folder_tokens = _tokens(folder_name)
+    if folder_tokens:
+        if folder_tokens & _tokens(info.get("ProductName")):
+            score += 25
+        if folder_tokens & _tokens(file_name):
+            score += 15
+
+    # Tamanho pesa pouco (escala logarítmica) e cada nível de pasta desconta um pouco
+    score += min(20.0, 4 * math.log2(size / (1024 * 1024) + 1))
+    score -= 5 * depth
+    return score
+
+
+class PEInspector:
+    """
+    Inspeciona executáveis e guarda o resultado por "impressão digital" do
+    arquivo (caminho, data de modificação e tamanho): um executável só é lido
+    de novo se mudar. O cache fica em memória e na tabela 'pe_inspection_cache'.
+    """
+    def __init__(self):
+        self._memory_cache = {}
+        self._lock = threading.Lock()
+
+    def inspect(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None, {"is_pe": False}
+        fingerprint = (path, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            info = self._memory_cache.get(fingerprint)
+        if info is None:
+            info = self._load_cached(fingerprint)
+        if info is None:
+            info = read_pe_info(path)
+            self._save_cached(fingerprint, info)
+        with self._lock:
+            if len(self._memory_cache) >= MEMORY_CACHE_LIMIT:
+                self._memory_cache.clear()
+            self._memory_cache[fingerprint] = info
+        return stat.st_size, info
+
+    def rank_executables(self, candidates, folder):
+        """
+        Ordena os candidatos ({'path', 'size', 'depth'}) do mais para o menos
+        provável executável principal do jogo em 'folder'. Os que não são
+        executáveis de aplicação ficam de fora.
+        """
+        folder_name = os.path.basename(os.path.normpath(folder))
+        ranked = []
+        for candidate in candidates:
+            size, info = self.inspect(candidate['path'])
+            score = score_executable(candidate['path'], size or candidate.get('size', 0), candidate.get('depth', 0), info, folder_name)
+            if score is not None:
+                ranked.append((score, candidate.get('size', 0), candidate, info))
+        ranked.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        return [dict(candidate, score=score, product_name=info.get("ProductName")) for score, _, candidate, info in ranked]
+
+    def _load_cached(self, fingerprint):
+        path, mtime_ns, size = fingerprint
+        try:
+            row = get_db_connection().execute(
+                "SELECT info FROM pe_inspection_cache WHERE path = ? AND mtime_ns = ? AND size = ?", (path, mtime_ns, size)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao ler o cache de inspeção de executáveis: {e}")
+            return None
+        return json.loads(row['info']) if row else None
+
+    def _save_cached(self, fingerprint, info):
+        path, mtime_ns, size = fingerprint
+        try:
+            with transaction() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO pe_inspection_cache (path, mtime_ns, size, info) VALUES (?, ?, ?, ?)",
+                    (path, mtime_ns, size, json.dumps(info))
+                )
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao salvar o cache de inspeção de executáveis: {e}")
+
+
+_pe_inspector = None
+_pe_inspector_lock = threading.Lock()
+
+def get_pe_inspector():
+    """Instância compartilhada (o cache em memória vale para todas as varreduras)."""
+    global _pe_inspector
+    with _pe_inspector_lock:
+        if _pe_inspector is None:
+            _pe_inspector = PEInspector()
+        return _pe_inspector
@@ -0,0 +1,102 @@
+# core/scan_state_manager.py
+
+import os
+import json
+import logging
+import sqlite3
+from core.database import get_db_connection, transaction
+
+class ScanStateManager:
+    """
+    Guarda o estado das varreduras, para que as seguintes só releiam o que mudou:
+      - a "impressão digital" (data de modificação e tamanho) de cada manifesto
+        da Steam, junto com os dados extraídos dele;
+      - para cada pasta vista pela busca local, sua data de modificação, os
+        executáveis que ela contém e suas subpastas.
+    """
+    def get_manifest_states(self):
+        """Retorna {caminho: estado} com o último estado conhecido de cada manifesto."""
+        conn = get_db_connection()
+        rows = conn.execute("SELECT path, library_path, mtime_ns, size, app_id, name, install_dir FROM steam_manifest_state").fetchall()
+        return {row['path']: dict(row) for row in rows}
+
+    def save_manifest_states(self, changed_states, removed_paths):
+        """
+        Grava os manifestos novos ou alterados e apaga os que sumiram.
+        Retorna False se a gravação falhar; a próxima varredura lerá esses manifestos de novo.
+        """
+        try:
+            with transaction() as conn:
+                conn.executemany(
+                    """INSERT INTO steam_manifest_state (path, library_path, mtime_ns, size, app_id, name, install_dir)
+                       VALUES (:path, :library_path, :mtime_ns, :size, :app_id, :name, :install_dir)
+                       ON CONFLICT(path) DO UPDATE SET
+                           library_path = excluded.library_path, mtime_ns = excluded.mtime_ns, size = excluded.size,
+                           app_id = excluded.app_id, name = excluded.name, install_dir = excluded.install_dir""",
+                    changed_states
+                )
+                conn.executemany("DELETE FROM steam_manifest_state WHERE path = ?", [(path,) for path in removed_paths])
+            return True
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao salvar o estado da varredura da Steam: {e}")
+            return False
+
+    def forget_manifest_states(self, app_ids):
+        """Esquece os manifestos desses AppIDs: a próxima varredura os relê e volta a marcar os jogos como instalados."""
+        app_ids = [str(app_id) for app_id in app_ids if app_id]
+        if not app_ids: return
+        with transaction() as conn:
+            conn.executemany("DELETE FROM steam_manifest_state WHERE app_id = ?", [(app_id,) for app_id in app_ids])
+
+    def clear_manifest_states(self):
+        """Esquece o estado salvo; a próxima varredura relê todos os manifestos."""
+        with transaction() as conn:
+            conn.execute("DELETE FROM steam_manifest_state")
+
+    def _subtree_bounds(self, root):
+        # Os caminhos abaixo de 'root' ficam entre "root/" e "root0" (o caractere seguinte ao separador)
+        prefix = root.rstrip(os.sep) + os.sep
+        return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+    def get_directory_index(self, root):
+        """Retorna {pasta: {'mtime_ns', 'executables', 'subdirs'}} de 'root' e de tudo abaixo dela."""
+        lower, upper = self._subtree_bounds(root)
+        try:
+            conn = get_db_connection()
+            rows = conn.execute(
+                "SELECT path, mtime_ns, executables, subdirs FROM local_scan_index WHERE path = ? OR (path >= ? AND path < ?)",
+                (root, lower, upper)
+            ).fetchall()
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao ler o índice da busca local: {e}")
+            return {}
+        return {
+            row['path']: {
+                'mtime_ns': row['mtime_ns'],
+                'executables': [tuple(item) for item in json.loads(row['executables'])],
+                'subdirs': json.loads(row['subdirs']),
+            }
+            for row in rows
+        }
+
+    def save_directory_index(self, entries, removed_roots=()):
+        """
+        Grava as pastas varridas ({pasta: {'mtime_ns', 'executables', 'subdirs'}}) e
+        apaga do índice as pastas que deixaram de existir, com tudo abaixo delas.
+        """
+        try:
+            with transaction() as conn:
+                for root in removed_roots:
+                    lower, upper = self._subtree_bounds(root)
+                    conn.execute("DELETE FROM local_scan_index WHERE path = ? OR (path >= ? AND path < ?)", (root, lower, upper))
+                conn.executemany(
+                    "INSERT OR REPLACE INTO local_scan_index (path, mtime_ns, executables, subdirs) VALUES (?, ?, ?, ?)",
+                    [(path, entry['mtime_ns'], json.dumps(entry['executables']), json.dumps(entry['subdirs']))
+                     for path, entry in entries.items()]
+                )
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao salvar o índice da busca local: {e}")
+
+    def clear_directory_index(self):
+        with transaction() as conn:
+            conn.execute("DELETE FROM local_scan_index")
@@ -1,7 +1,7 @@
 # core/settings_manager.py
 
 import logging
-from core.database import get_db_connection
+from core.database import get_db_connection, transaction
 
 class SettingsManager:
     def __init__(self):
@@ -12,7 +12,6 @@ class SettingsManager:
         """Busca o valor de uma configuração no banco de dados pela sua chave."""
         conn = get_db_connection()
         row = conn.execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
-        conn.close()
         
         if row:
             return row['value']
@@ -22,13 +21,9 @@ class SettingsManager:
 
     def save_setting(self, key, value):
         """Salva (insere ou atualiza) uma configuração no banco de dados."""
-        conn = get_db_connection()
-        
         # INSERT OR REPLACE é um comando SQLite muito útil.
         # Se a 'key' não existir, ele insere uma nova linha.
         # Se a 'key' já existir, ele atualiza o 'value' da linha existente.
-        conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (key, value))
-        
-        conn.commit()
-        conn.close()
+        with transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (key, value))
         logging.info(f"Configuração salva: {key} = {value}")
\ No newline at end of file
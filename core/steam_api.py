@@ -3,63 +3,29 @@
 import os
 import re
 import sys
-import json
 import requests
 import logging
 from PIL import Image
 from io import BytesIO
 
+from core import steam_app_list
+
 def get_app_root_path():
     if getattr(sys, 'frozen', False):
         return os.path.dirname(sys.executable)
     else:
         return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-def update_steam_app_list(app_list_file="steam_app_list.json"):
-    """Baixa a lista completa de apps da Steam e salva localmente."""
-    print("Tentando atualizar a lista de aplicativos da Steam... (Isso pode levar um momento)")
-    try:
-        url = "https://api.steampowered.com/ISteamApps/GetAppList/v2/"
-        response = requests.get(url)
-        response.raise_for_status()
-        
-        data = response.json()
-        
-        # Salva o arquivo na pasta raiz do projeto
-        file_path = os.path.join(get_app_root_path(), app_list_file)
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(data['applist']['apps'], f, indent=4)
-            
-        print(f"Lista de aplicativos da Steam atualizada com sucesso! {len(data['applist']['apps'])} apps encontrados.")
-        return True
-    except requests.exceptions.RequestException as e:
-        print(f"Erro ao baixar a lista de apps da Steam: {e}")
-        return False
-
-def find_appid_by_name(game_name, app_list_file="steam_app_list.json"):
-    """Procura por uma AppID em um arquivo de lista de apps local."""
-    file_path = os.path.join(get_app_root_path(), app_list_file)
-    if not os.path.exists(file_path):
-        return None # Retorna None se a lista de apps não foi baixada
+def update_steam_app_list(app_list_file=None):
+    """
+    Atualiza a lista de apps da Steam. Mantida por compatibilidade: a lista agora
+    fica na tabela 'steam_apps' (core.steam_app_list) e 'app_list_file' é ignorado.
+    """
+    return steam_app_list.update_steam_app_list(force_update=True)
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        apps = json.load(f)
-
-    # Procura por uma correspondência exata (ignorando maiúsculas/minúsculas)
-    game_name_lower = game_name.lower()
-    for app in apps:
-        if app['name'].lower() == game_name_lower:
-            print(f"Correspondência exata encontrada: '{app['name']}' -> AppID {app['appid']}")
-            return str(app['appid'])
-    
-    print(f"Nenhuma correspondência exata encontrada para '{game_name}'. Tentando busca parcial...")
-    # Se não encontrar, procura por uma correspondência parcial
-    for app in apps:
-        if game_name_lower in app['name'].lower():
-            print(f"Correspondência parcial encontrada: '{app['name']}' -> AppID {app['appid']}")
-            return str(app['appid'])
-
-    return None
+def find_appid_by_name(game_name, app_list_file=None):
+    """Procura a AppID de um jogo na lista de apps local (ver core.steam_app_list)."""
+    return steam_app_list.find_appid_by_name(game_name)
 
 # --- FUNÇÕES ANTIGAS (CONTINUAM IGUAIS) ---
 
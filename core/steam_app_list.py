@@ -1,102 +1,354 @@
 # core/steam_app_list.py
 
 import os
+import re
 import json
+import codecs
 import requests
 import logging
+import sqlite3
 import time
-from difflib import get_close_matches
 
-# Define o nome do arquivo de cache e o tempo de expiração
+from core.database import get_db_connection, transaction
+from core.settings_manager import SettingsManager
+from core.title_matcher import normalize_title, get_title_matcher, invalidate_title_matcher
+
+# Arquivo JSON usado por versões anteriores; é importado uma vez para a tabela 'steam_apps'
 CACHE_FILE = "steam_app_cache.json"
 CACHE_EXPIRATION_SECONDS = 60 * 60 * 24 * 7 # Cache válido por 7 dias
+# Chave na tabela 'settings' com o horário (epoch) da última atualização da lista
+APP_LIST_UPDATED_AT_SETTING = "steam_app_list_updated_at"
+# Validadores HTTP da última lista completa baixada (para pedir só se ela mudou)
+APP_LIST_ETAG_SETTING = "steam_app_list_etag"
+APP_LIST_LAST_MODIFIED_SETTING = "steam_app_list_last_modified"
+# Horário (epoch) da última sincronização, usado como if_modified_since na atualização por delta
+APP_LIST_SYNCED_AT_SETTING = "steam_app_list_synced_at"
+INSERT_BATCH_SIZE = 5000
+
+APP_LIST_URL = "https://api.steampowered.com/ISteamApps/GetAppList/v2/"
+# Endpoint que aceita if_modified_since (exige chave de API) e devolve a lista em páginas
+STORE_APP_LIST_URL = "https://api.steampowered.com/IStoreService/GetAppList/v1/"
+STORE_PAGE_SIZE = 50000
+# Tamanho do final de cada página guardado para ler os campos de paginação, que vêm depois do array "apps"
+PAGE_TRAILER_SIZE = 256
+HAVE_MORE_RESULTS_RE = re.compile(rb'"have_more_results"\s*:\s*true')
+LAST_APPID_RE = re.compile(rb'"last_appid"\s*:\s*(\d+)')
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# Chave do índice de títulos (core.title_matcher) montado sobre a tabela 'steam_apps'
+TITLE_MATCHER_KEY = "steam_apps"
+# Pontuação mínima (0..1) para aceitar uma correspondência aproximada
+FUZZY_MIN_SCORE = 0.8
+
+def _get_updated_at():
+    value = SettingsManager().get_setting(APP_LIST_UPDATED_AT_SETTING)
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
 
 def _is_cache_valid():
-    """Verifica se o cache da lista de apps existe e não está expirado."""
-    if not os.path.exists(CACHE_FILE):
-        return False
-    
+    """Verifica se a lista de apps já foi carregada no banco e não está expirada."""
+    updated_at = _get_updated_at()
+    return updated_at is not None and time.time() - updated_at < CACHE_EXPIRATION_SECONDS
+
+def iter_app_list(chunks, allow_missing=False):
+    """
+    Lê incrementalmente uma resposta da Steam com um array "apps" e gera um
+    dicionário por app, sem montar o documento inteiro na memória.
+    'chunks' é um iterável de pedaços do JSON, em bytes (UTF-8) ou str.
+    Com allow_missing=True, um documento sem o array "apps" é tratado como
+    lista vazia (o IStoreService responde assim quando nada mudou).
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    array_start = re.compile(r'"apps"\s*:\s*\[')
+    buffer = ""
+    pos = 0
+    in_array = False
+    chunks = iter(chunks)
+    exhausted = False
+
+    while True:
+        if not in_array:
+            match = array_start.search(buffer)
+            if match:
+                in_array = True
+                pos = match.end()
+        if in_array:
+            while True:
+                # Pula espaços e vírgulas entre os objetos
+                while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                    pos += 1
+                if pos >= len(buffer): break
+                if buffer[pos] == "]": return
+                try:
+                    app, pos = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    # Objeto cortado no fim do pedaço: espera o próximo (se houver)
+                    if exhausted: raise
+                    break
+                yield app
+            buffer = buffer[pos:]
+            pos = 0
+        elif len(buffer) > 64:
+            # Guarda só o final, onde a chave "apps" pode estar pela metade
+            buffer = buffer[-64:]
+
+        if exhausted:
+            if allow_missing and not in_array: return
+            raise ValueError("Resposta da lista de aplicativos da Steam terminou antes do fim do array 'apps'.")
+        chunk = next(chunks, None)
+        if chunk is None:
+            exhausted = True
+            buffer += text_decoder.decode(b"", final=True)
+        else:
+            buffer += text_decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+
+def _ingest_apps(apps, replace):
+    """
+    Grava os apps na tabela 'steam_apps' em lotes, passando por uma tabela
+    temporária: o banco só é bloqueado para escrita no fim, numa transação curta.
+    Com replace=True, apps que não vieram na lista são removidos (lista completa);
+    senão, os apps recebidos são só inseridos ou atualizados (delta).
+    Retorna (apps recebidos, linhas alteradas).
+    """
+    conn = get_db_connection()
+    conn.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS steam_apps_staging (
+            app_id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            normalized_name TEXT NOT NULL
+        )
+    """)
+    conn.execute("DELETE FROM steam_apps_staging")
+    received = 0
     try:
-        cache_age = time.time() - os.path.getmtime(CACHE_FILE)
-        return cache_age < CACHE_EXPIRATION_SECONDS
-    except FileNotFoundError:
+        batch = []
+        for app in apps:
+            if not app.get('name') or not app.get('appid'): continue
+            batch.append((int(app['appid']), app['name'], normalize_title(app['name'])))
+            if len(batch) >= INSERT_BATCH_SIZE:
+                conn.executemany("INSERT OR REPLACE INTO steam_apps_staging (app_id, name, normalized_name) VALUES (?, ?, ?)", batch)
+                received += len(batch); batch = []
+        if batch:
+            conn.executemany("INSERT OR REPLACE INTO steam_apps_staging (app_id, name, normalized_name) VALUES (?, ?, ?)", batch)
+            received += len(batch)
+
+        if replace and not received:
+            # Uma lista completa vazia é resposta quebrada, não motivo para apagar tudo
+            raise ValueError("A lista de aplicativos da Steam veio vazia.")
+
+        with transaction() as conn:
+            changes_before = conn.total_changes
+            if replace:
+                conn.execute("DELETE FROM steam_apps WHERE app_id NOT IN (SELECT app_id FROM steam_apps_staging)")
+            conn.execute("""
+                INSERT INTO steam_apps (app_id, name, normalized_name)
+                SELECT app_id, name, normalized_name FROM steam_apps_staging WHERE true
+                ON CONFLICT(app_id) DO UPDATE
+                    SET name = excluded.name, normalized_name = excluded.normalized_name
+                    WHERE steam_apps.name IS NOT excluded.name
+            """)
+            changed = conn.total_changes - changes_before
+            conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (APP_LIST_UPDATED_AT_SETTING, str(time.time())))
+    finally:
+        conn.execute("DELETE FROM steam_apps_staging")
+    if changed:
+        invalidate_title_matcher(TITLE_MATCHER_KEY)
+    return received, changed
+
+def _store_apps(apps):
+    """Substitui o conteúdo da tabela 'steam_apps' pelos apps informados."""
+    received, _ = _ingest_apps(apps, replace=True)
+    return received
+
+def _import_legacy_cache_file():
+    """Importa o steam_app_cache.json de versões anteriores, se ainda existir."""
+    if not os.path.exists(CACHE_FILE): return False
+    try:
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            count = _store_apps(iter_app_list(iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), '')))
+        os.remove(CACHE_FILE)
+        logging.info(f"Lista de aplicativos da Steam importada do arquivo antigo: {count} apps.")
+        return count > 0
+    except (OSError, ValueError, sqlite3.Error) as e:
+        logging.error(f"Erro ao importar o cache antigo da lista de aplicativos da Steam: {e}")
         return False
 
-def update_steam_app_list(force_update=False):
+def _has_app_list():
+    return get_db_connection().execute("SELECT 1 FROM steam_apps LIMIT 1").fetchone() is not None
+
+def _download_full_app_list(settings):
     """
-    Baixa e salva a lista de todos os aplicativos da Steam.
-    Só faz o download se o cache estiver expirado ou se forçado.
+    Baixa a lista completa (GetAppList v2) em streaming. Se a lista local existir,
+    envia o ETag/Last-Modified da última resposta: um 304 dispensa o download.
     """
-    if not force_update and _is_cache_valid():
+    headers = {}
+    if _has_app_list():
+        etag = settings.get_setting(APP_LIST_ETAG_SETTING)
+        last_modified = settings.get_setting(APP_LIST_LAST_MODIFIED_SETTING)
+        if etag: headers["If-None-Match"] = etag
+        if last_modified: headers["If-Modified-Since"] = last_modified
+
+    with requests.get(APP_LIST_URL, headers=headers, stream=True, timeout=30) as response:
+        if response.status_code == 304:
+            logging.info("Lista de aplicativos da Steam não mudou desde o último download.")
+            with transaction() as conn:
+                conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (APP_LIST_UPDATED_AT_SETTING, str(time.time())))
+            return 0, 0
+        response.raise_for_status() # Lança um erro para status HTTP ruins (4xx ou 5xx)
+        received, changed = _ingest_apps(iter_app_list(response.iter_content(DOWNLOAD_CHUNK_SIZE)), replace=True)
+        validators = ((APP_LIST_ETAG_SETTING, response.headers.get("ETag")),
+                      (APP_LIST_LAST_MODIFIED_SETTING, response.headers.get("Last-Modified")))
+
+    with transaction() as conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+            [(key, value or "") for key, value in validators]
+        )
+    return received, changed
+
+def _download_app_list_delta(api_key, modified_since):
+    """
+    Baixa só os apps alterados desde 'modified_since' (IStoreService/GetAppList), página por página.
+    A paginação segue os campos 'have_more_results'/'last_appid' da resposta.
+    """
+    received = changed = 0
+    last_appid = 0
+    while True:
+        params = {
+            "key": api_key, "if_modified_since": modified_since, "last_appid": last_appid,
+            "max_results": STORE_PAGE_SIZE, "include_games": "true", "include_dlc": "true", "include_software": "true",
+        }
+        with requests.get(STORE_APP_LIST_URL, params=params, stream=True, timeout=30) as response:
+            response.raise_for_status()
+            page = []
+            trailer = [b""]
+
+            def chunks():
+                for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    trailer[0] = (trailer[0] + chunk)[-PAGE_TRAILER_SIZE:]
+                    yield chunk
+
+            def apps():
+                page_chunks = chunks()
+                for app in iter_app_list(page_chunks, allow_missing=True):
+                    page.append(app['appid'])
+                    yield app
+                # O resto do documento (depois do array) traz os campos de paginação
+                for _ in page_chunks: pass
+
+            page_received, page_changed = _ingest_apps(apps(), replace=False)
+        received += page_received
+        changed += page_changed
+        if not page or not HAVE_MORE_RESULTS_RE.search(trailer[0]): break
+        next_appid = LAST_APPID_RE.search(trailer[0])
+        last_appid = int(next_appid.group(1)) if next_appid else max(page)
+    return received, changed
+
+def update_steam_app_list(force_update=False, api_key=None):
+    """
+    Atualiza a tabela 'steam_apps' com a lista de aplicativos da Steam.
+    Só faz o download se a lista estiver expirada ou se forçado. Com uma chave
+    de API e uma lista já carregada, baixa apenas os apps alterados desde a
+    última sincronização; sem ela, baixa a lista completa (se tiver mudado).
+    """
+    if not force_update and _is_cache_valid() and _has_app_list():
         logging.info("Cache da lista de aplicativos da Steam ainda é válido. Nenhuma atualização necessária.")
         return True
 
     logging.info("Tentando atualizar a lista de aplicativos da Steam...")
+    settings = SettingsManager()
+    started_at = int(time.time())
     try:
-        # URL oficial da API da Steam para a lista de apps
-        url = "https://api.steampowered.com/ISteamApps/GetAppList/v2/"
-        response = requests.get(url, timeout=30)
-        response.raise_for_status() # Lança um erro para status HTTP ruins (4xx ou 5xx)
-        
-        data = response.json()
-        
-        # Salva os dados no arquivo de cache
-        with open(CACHE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f)
-            
-        app_count = len(data.get('applist', {}).get('apps', []))
-        logging.info(f"Lista de aplicativos da Steam atualizada com sucesso. {app_count} apps cacheados.")
+        synced_at = settings.get_setting(APP_LIST_SYNCED_AT_SETTING)
+        if api_key and synced_at and _has_app_list():
+            received, changed = _download_app_list_delta(api_key, int(synced_at))
+            logging.info(f"Lista de aplicativos da Steam atualizada por delta: {received} apps recebidos, {changed} alterações.")
+        else:
+            received, changed = _download_full_app_list(settings)
+            logging.info(f"Lista de aplicativos da Steam atualizada com sucesso. {received} apps recebidos, {changed} alterações.")
+        with transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (APP_LIST_SYNCED_AT_SETTING, str(started_at)))
         return True
     except requests.RequestException as e:
         logging.error(f"Erro de rede ao baixar a lista de aplicativos da Steam: {e}")
         return False
-    except json.JSONDecodeError:
-        logging.error("Erro ao decodificar a resposta JSON da API da Steam. A API pode estar offline.")
+    except ValueError as e:
+        # Inclui json.JSONDecodeError
+        logging.error(f"Erro ao decodificar a resposta JSON da API da Steam. A API pode estar offline. ({e})")
+        return False
+    except sqlite3.Error as e:
+        logging.error(f"Erro ao gravar a lista de aplicativos da Steam: {e}")
         return False
 
+def _ensure_app_list():
+    """Garante que a tabela tenha a lista (importando o arquivo antigo ou baixando, na primeira vez)."""
+    if _has_app_list(): return True
+    logging.warning("Lista de aplicativos da Steam ainda não carregada.")
+    return _import_legacy_cache_file() or update_steam_app_list(force_update=True)
+
+def _load_titles():
+    # Em nomes repetidos, o índice fica com o menor AppID (o mesmo da busca exata)
+    return get_db_connection().execute("SELECT app_id, name FROM steam_apps ORDER BY app_id").fetchall()
+
+def _get_matcher():
+    """Índice de trigramas da lista de apps, montado na primeira busca aproximada e reaproveitado."""
+    return get_title_matcher(TITLE_MATCHER_KEY, _load_titles)
+
+def _find_exact_appids(names):
+    """{nome: AppID} dos nomes cujo nome normalizado existe na lista (uma consulta para todos)."""
+    names_by_normalized = {}
+    for name in names:
+        names_by_normalized.setdefault(normalize_title(name), []).append(name)
+    rows = get_db_connection().execute(
+        """SELECT normalized_name, MIN(app_id) AS app_id FROM steam_apps
+           WHERE normalized_name IN (SELECT value FROM json_each(?))
+           GROUP BY normalized_name""",
+        (json.dumps(list(names_by_normalized)),)
+    ).fetchall()
+    return {name: str(row['app_id']) for row in rows for name in names_by_normalized[row['normalized_name']]}
+
+def find_appids_by_names(game_names, min_score=FUZZY_MIN_SCORE):
+    """
+    Versão em lote de find_appid_by_name: {nome: AppID ou None}.
+    As buscas exatas saem de uma única consulta; as demais passam pelo índice de trigramas.
+    """
+    game_names = [name for name in dict.fromkeys(game_names) if name]
+    if not game_names or not _ensure_app_list():
+        return {name: None for name in game_names}
+
+    appids = _find_exact_appids(game_names)
+    remaining = [name for name in game_names if name not in appids]
+    if remaining:
+        for name, matches in _get_matcher().match_many(remaining, limit=1, min_score=min_score).items():
+            if matches:
+                appid, match_name, score = matches[0]
+                logging.info(f"Encontrada correspondência aproximada para '{name}': '{match_name}' (AppID: {appid}, {score:.2f})")
+                appids[name] = str(appid)
+    logging.info(f"AppIDs encontrados para {len(appids)} de {len(game_names)} nome(s).")
+    return {name: appids.get(name) for name in game_names}
+
 def find_appid_by_name(game_name):
     """
-    Encontra o AppID mais provável para um nome de jogo usando o cache local.
+    Encontra o AppID mais provável para um nome de jogo usando a lista local.
     Retorna o AppID como string, ou None se não encontrar.
     """
-    if not os.path.exists(CACHE_FILE):
-        logging.warning("Cache da lista de aplicativos não encontrado. Execute update_steam_app_list() primeiro.")
-        # Tenta baixar a lista se ela não existir
-        if not update_steam_app_list():
-            return None
-
-    with open(CACHE_FILE, 'r', encoding='utf-8') as f:
-        # --- INÍCIO DA CORREÇÃO ---
-        # Passa o arquivo 'f' para a função json.load()
-        data = json.load(f)
-        # --- FIM DA CORREÇÃO ---
-
-    apps = data.get('applist', {}).get('apps', [])
-    if not apps:
+    if not game_name or not _ensure_app_list():
         return None
 
-    # Cria um dicionário para busca rápida: {nome_em_minusculo: appid}
-    # Filtra para remover apps sem nome, que são comuns
-    app_map = {app['name'].lower(): str(app['appid']) for app in apps if app.get('name')}
-    
-    lower_game_name = game_name.lower()
-    
-    # 1. Tenta uma busca exata (ignorando maiúsculas/minúsculas)
-    if lower_game_name in app_map:
-        appid = app_map[lower_game_name]
+    # 1. Busca exata pelo nome normalizado (usa o índice)
+    appid = _find_exact_appids([game_name]).get(game_name)
+    if appid:
         logging.info(f"Encontrada correspondência exata para '{game_name}': AppID {appid}")
         return appid
 
-    # 2. Se falhar, tenta uma busca por aproximação (fuzzy search) para encontrar nomes similares
-    all_names = list(app_map.keys())
-    # O cutoff=0.8 garante uma similaridade alta para evitar falsos positivos
-    best_matches = get_close_matches(lower_game_name, all_names, n=1, cutoff=0.8)
-    
-    if best_matches:
-        best_match_name = best_matches[0]
-        appid = app_map[best_match_name]
-        logging.info(f"Encontrada correspondência aproximada para '{game_name}': '{best_match_name}' (AppID: {appid})")
-        return appid
+    # 2. Se falhar, busca aproximada pelo índice de trigramas
+    matches = _get_matcher().match(game_name, limit=1, min_score=FUZZY_MIN_SCORE)
+    if matches:
+        appid, match_name, score = matches[0]
+        logging.info(f"Encontrada correspondência aproximada para '{game_name}': '{match_name}' (AppID: {appid}, {score:.2f})")
+        return str(appid)
         
     logging.warning(f"Nenhuma correspondência encontrada para o jogo '{game_name}' na lista da Steam.")
     return None
@@ -0,0 +1,180 @@
+# core/title_matcher.py
+
+import re
+import heapq
+import logging
+import threading
+from array import array
+from collections import Counter
+
+# Trigramas presentes em mais nomes que isso são ignorados na seleção de candidatos
+# (ex.: " th", "the"): quase não discriminam e custariam caro para contar.
+MAX_POSTING_SIZE = 20000
+# Candidatos pré-selecionados pelos trigramas que passam pela distância de edição
+RERANK_CANDIDATES = 50
+DEFAULT_MIN_SCORE = 0.8
+# Nomes iguais só na forma canônica ("Skyrim Special Edition" x "Skyrim") pontuam no máximo isso:
+# 1.0 fica reservado para nomes realmente iguais
+CANONICAL_MATCH_SCORE = 0.95
+
+# "v" e "x" sozinhos ficam de fora: costumam ser parte do nome ("Mega Man X"), não numerais
+ROMAN_NUMERALS = {
+    "ii": "2", "iii": "3", "iv": "4", "vi": "6", "vii": "7", "viii": "8",
+    "ix": "9", "xi": "11", "xii": "12", "xiii": "13", "xiv": "14", "xv": "15",
+}
+# Sufixos de edição que não mudam o jogo ("Skyrim Special Edition" -> "skyrim"). Palavras que
+# sozinhas podem ser outro jogo ("Persona 5 Royal") só saem quando seguidas de "edition".
+EDITION_SUFFIX_RE = re.compile(
+    r"\b(?:game of the year|goty|definitive|deluxe|digital deluxe|ultimate|premium|enhanced|"
+    r"anniversary|collectors|collector s|legendary|director s cut|directors cut)(?:\s+edition)?$"
+    r"|\b(?:complete|gold|royal|special|standard)\s+edition$|\s+edition$"
+)
+
+
+def normalize_title(name):
+    """Forma usada para comparar nomes: minúsculas, sem símbolos de marca e pontuação."""
+    name = re.sub(r"[™®©]", "", name or "").lower()
+    return " ".join(re.sub(r"[^\w]+", " ", name).split())
+
+
+def canonical_title(name):
+    """
+    Forma canônica para a busca aproximada: além de normalize_title, troca
+    numerais romanos por arábicos e remove sufixos de edição.
+    """
+    words = [ROMAN_NUMERALS.get(word, word) for word in normalize_title(name).split()]
+    title = " ".join(words)
+    # Remove sufixos repetidos ("... goty edition", "... complete edition")
+    while True:
+        stripped = EDITION_SUFFIX_RE.sub("", title).strip()
+        if stripped == title or not stripped: break
+        title = stripped
+    return title
+
+
+def _sequel_numbers(canonical):
+    """Números soltos do nome canônico: títulos com números diferentes são jogos diferentes ("Mega Man X" x "Mega Man 10")."""
+    return tuple(word for word in canonical.split() if word.isdigit())
+
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_levenshtein(a, b, max_distance):
+    """Distância de edição entre a e b, ou max_distance + 1 se passar do limite (para cedo)."""
+    if abs(len(a) - len(b)) > max_distance: return max_distance + 1
+    if len(a) < len(b): a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i]
+        row_min = i
+        for j, char_b in enumerate(b, start=1):
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b))
+            current.append(value)
+            if value < row_min: row_min = value
+        if row_min > max_distance: return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+class TitleMatcher:
+    """
+    Busca aproximada de nomes de jogos numa lista grande de títulos.
+
+    Monta um índice invertido de trigramas sobre as formas canônicas dos nomes;
+    cada busca conta os trigramas em comum para pré-selecionar poucos candidatos
+    e só nesses calcula a distância de edição (limitada) para a pontuação final.
+    """
+    def __init__(self, titles):
+        """'titles' é um iterável de (id, nome)."""
+        self._ids = []
+        self._names = []
+        self._normalized = []
+        self._canonical = []
+        self._exact = {}
+        postings = {}
+        for title_id, name in titles:
+            canonical = canonical_title(name)
+            if not canonical: continue
+            doc = len(self._ids)
+            self._ids.append(title_id); self._names.append(name)
+            self._normalized.append(normalize_title(name)); self._canonical.append(canonical)
+            self._exact.setdefault(canonical, doc)
+            for gram in _trigrams(canonical):
+                posting = postings.get(gram)
+                if posting is None:
+                    posting = postings[gram] = array("I")
+                posting.append(doc)
+        self._postings = postings
+        logging.info(f"Índice de títulos montado: {len(self._ids)} nomes, {len(postings)} trigramas.")
+
+    def __len__(self):
+        return len(self._ids)
+
+    def match(self, name, limit=1, min_score=DEFAULT_MIN_SCORE):
+        """Retorna até 'limit' correspondências [(id, nome, pontuação 0..1)], da melhor para a pior."""
+        query = canonical_title(name)
+        if not query: return []
+        normalized_query = normalize_title(name)
+        exact = self._exact.get(query)
+        if exact is not None and limit == 1 and self._normalized[exact] == normalized_query:
+            return [(self._ids[exact], self._names[exact], 1.0)]
+
+        query_grams = _trigrams(query)
+        counts = Counter()
+        for gram in query_grams:
+            posting = self._postings.get(gram)
+            if posting is not None and len(posting) <= MAX_POSTING_SIZE:
+                counts.update(posting)
+        if exact is not None:
+            counts[exact] = len(query_grams)
+
+        # Pré-seleção pelo coeficiente de Dice dos trigramas, aproximado pelo tamanho do nome
+        query_size = len(query_grams)
+        candidates = heapq.nlargest(
+            RERANK_CANDIDATES, counts.items(),
+            key=lambda item: 2 * item[1] / (query_size + len(self._canonical[item[0]]) + 1)
+        )
+
+        query_numbers = _sequel_numbers(query)
+        results = []
+        for doc, _ in candidates:
+            candidate = self._canonical[doc]
+            if _sequel_numbers(candidate) != query_numbers: continue
+            longest = max(len(query), len(candidate))
+            max_distance = int(longest * (1 - min_score))
+            distance = bounded_levenshtein(query, candidate, max_distance)
+            if distance > max_distance: continue
+            # A pontuação final compara os nomes normalizados; a forma canônica só garante um piso abaixo de 1.0
+            normalized = self._normalized[doc]
+            normalized_longest = max(len(normalized_query), len(normalized))
+            normalized_score = 1 - bounded_levenshtein(normalized_query, normalized, normalized_longest) / normalized_longest
+            score = max(normalized_score, CANONICAL_MATCH_SCORE * (1 - distance / longest))
+            results.append((self._ids[doc], self._names[doc], score))
+        results.sort(key=lambda item: item[2], reverse=True)
+        return results[:limit]
+
+    def match_many(self, names, limit=1, min_score=DEFAULT_MIN_SCORE):
+        """Resolve vários nomes de uma vez: {nome: [(id, nome, pontuação)]}. Nomes repetidos são buscados uma vez só."""
+        return {name: self.match(name, limit, min_score) for name in dict.fromkeys(names)}
+
+
+_matchers = {}
+_matchers_lock = threading.Lock()
+
+def get_title_matcher(key, load_titles):
+    """
+    Matcher compartilhado identificado por 'key', montado na primeira chamada com
+    load_titles() (que devolve os (id, nome)). invalidate_title_matcher(key) o descarta.
+    """
+    with _matchers_lock:
+        matcher = _matchers.get(key)
+        if matcher is None:
+            matcher = _matchers[key] = TitleMatcher(load_titles())
+        return matcher
+
+def invalidate_title_matcher(key):
+    with _matchers_lock:
+        _matchers.pop(key, None)
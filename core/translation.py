@@ -0,0 +1,140 @@
+# core/translation.py
+
+import json
+import time
+import hashlib
+import logging
+import sqlite3
+import threading
+
+from core.database import get_db_connection, transaction
+
+try:
+    from googletrans import Translator as _GoogleTranslator
+except ImportError:
+    _GoogleTranslator = None
+
+DEFAULT_DEST_LANGUAGE = "pt"
+# Textos enviados ao serviço de tradução em cada chamada
+TRANSLATION_BATCH_SIZE = 20
+
+
+class TranslationBackend:
+    """
+    Interface dos serviços de tradução. translate_batch(textos, idioma) devolve
+    uma lista do mesmo tamanho, com None onde a tradução falhou.
+    """
+    name = "none"
+
+    def translate_batch(self, texts, dest_language):
+        return [None] * len(texts)
+
+
+class GoogleTransBackend(TranslationBackend):
+    """Tradução pelo googletrans (dependência opcional), com vários textos por chamada."""
+    name = "googletrans"
+
+    def __init__(self):
+        self._translator = _GoogleTranslator()
+        self._lock = threading.Lock()
+
+    def translate_batch(self, texts, dest_language):
+        # O Translator não é seguro para uso simultâneo por várias threads
+        with self._lock:
+            try:
+                results = self._translator.translate(list(texts), dest=dest_language)
+                return [result.text if result and result.text else None for result in results]
+            except Exception as e:
+                logging.warning(f"Erro na tradução em lote, traduzindo um texto por vez: {e}")
+            translated = []
+            for text in texts:
+                try:
+                    result = self._translator.translate(text, dest=dest_language)
+                    translated.append(result.text if result and result.text else None)
+                except Exception as e:
+                    logging.warning(f"Erro na tradução: {e}")
+                    translated.append(None)
+            return translated
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+def set_translation_backend(backend):
+    """Troca o serviço de tradução (ex.: por um stub offline); None volta ao padrão."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+def get_translation_backend():
+    """Serviço em uso: o googletrans, se estiver instalado; senão, nenhum (os textos ficam como estão)."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            if _GoogleTranslator is not None:
+                _backend = GoogleTransBackend()
+            else:
+                logging.info("googletrans não está instalado; os textos do IGDB não serão traduzidos.")
+                _backend = TranslationBackend()
+        return _backend
+
+
+def _source_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def _load_cached(hashes, dest_language):
+    try:
+        rows = get_db_connection().execute(
+            """SELECT source_hash, translated_text FROM translation_cache
+               WHERE dest_language = ? AND source_hash IN (SELECT value FROM json_each(?))""",
+            (dest_language, json.dumps(hashes))
+        ).fetchall()
+    except sqlite3.Error as e:
+        logging.error(f"Erro ao ler o cache de traduções: {e}")
+        return {}
+    return {row['source_hash']: row['translated_text'] for row in rows}
+
+def _save_cached(translations, dest_language):
+    now = int(time.time())
+    try:
+        with transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO translation_cache (source_hash, dest_language, translated_text, created_at) VALUES (?, ?, ?, ?)",
+                [(source_hash, dest_language, text, now) for source_hash, text in translations.items()]
+            )
+    except sqlite3.Error as e:
+        logging.error(f"Erro ao salvar o cache de traduções: {e}")
+
+def translate_texts(texts, dest_language=DEFAULT_DEST_LANGUAGE):
+    """
+    Traduz uma lista de textos e devolve as traduções na mesma ordem.
+    Traduções já feitas vêm do cache ('translation_cache'); as demais são
+    pedidas ao serviço em lotes. Textos que não puderem ser traduzidos voltam como estão.
+    """
+    texts = list(texts)
+    hashes = [_source_hash(text) if text else None for text in texts]
+    cached = _load_cached([h for h in dict.fromkeys(hashes) if h], dest_language)
+
+    pending = {}
+    for text, source_hash in zip(texts, hashes):
+        if source_hash and source_hash not in cached:
+            pending.setdefault(source_hash, text)
+
+    if pending:
+        backend = get_translation_backend()
+        new_translations = {}
+        items = list(pending.items())
+        for i in range(0, len(items), TRANSLATION_BATCH_SIZE):
+            batch = items[i:i + TRANSLATION_BATCH_SIZE]
+            results = backend.translate_batch([text for _, text in batch], dest_language)
+            for (source_hash, _), translated in zip(batch, results):
+                if translated: new_translations[source_hash] = translated
+        if new_translations:
+            _save_cached(new_translations, dest_language)
+            cached.update(new_translations)
+        logging.info(f"Tradução ({backend.name}): {len(new_translations)} de {len(pending)} texto(s) traduzido(s).")
+
+    return [cached.get(source_hash, text) if source_hash else text for text, source_hash in zip(texts, hashes)]
+
+def translate_text(text, dest_language=DEFAULT_DEST_LANGUAGE):
+    return translate_texts([text], dest_language)[0]
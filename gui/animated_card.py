@@ -5,6 +5,8 @@ from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame, Q
 from PyQt6.QtGui import QPixmap, QColor, QPainter
 from PyQt6.QtCore import QPropertyAnimation, QRect, QEasingCurve, Qt, pyqtSignal, QSize, QRectF, QPoint
 
+from gui.image_loader import get_image_loader
+
 class AnimatedGameCard(QFrame):
     clicked = pyqtSignal()
     
@@ -82,34 +84,30 @@ class AnimatedGameCard(QFrame):
 
         if target_size.width() == 0 or target_size.height() == 0: return
 
-        if not (image_path and os.path.exists(image_path)):
-            placeholder = QPixmap(target_size); placeholder.fill(QColor("#333"))
-            painter = QPainter(placeholder); painter.setPen(QColor("#FFFFFF"))
-            font = self.font(); font.setPointSize(12); painter.setFont(font)
-            painter.drawText(placeholder.rect(), int(Qt.AlignmentFlag.AlignCenter | Qt.TextFlag.TextWordWrap), self.game["name"])
-            painter.end(); self.image_label.setPixmap(placeholder)
-        else:
-            source_pixmap = QPixmap(image_path)
-            is_vertical = source_pixmap.height() > source_pixmap.width()
-            
-            if is_vertical:
-                scaled_pixmap = source_pixmap.scaled(target_size, Qt.AspectRatioMode.KeepAspectRatioByExpanding, Qt.TransformationMode.SmoothTransformation)
-            else:
-                canvas = QPixmap(target_size); canvas.fill(QColor("#333"))
-                scaled_art = source_pixmap.scaled(target_size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-                painter = QPainter(canvas)
-                x = (target_size.width() - scaled_art.width()) / 2
-                y = (target_size.height() - scaled_art.height()) / 2
-                painter.drawPixmap(int(x), int(y), scaled_art); painter.end()
-                scaled_pixmap = canvas
-
-            self.image_label.setPixmap(scaled_pixmap)
+        # Mostra o nome como placeholder até a capa ser decodificada em segundo plano
+        self.image_label.setPixmap(self._name_placeholder(target_size))
+        get_image_loader().load(self, image_path, "card", self._set_cover)
         
         # --- INÍCIO DA ADIÇÃO ---
         # Após carregar a imagem, aplica o efeito visual com base no status do jogo
         self._apply_status_effect()
         # --- FIM DA ADIÇÃO ---
 
+    def _name_placeholder(self, target_size):
+        placeholder = QPixmap(target_size); placeholder.fill(QColor("#333"))
+        painter = QPainter(placeholder); painter.setPen(QColor("#FFFFFF"))
+        font = self.font(); font.setPointSize(12); painter.setFont(font)
+        painter.drawText(placeholder.rect(), int(Qt.AlignmentFlag.AlignCenter | Qt.TextFlag.TextWordWrap), self.game["name"])
+        painter.end()
+        return placeholder
+
+    def _set_cover(self, cover):
+        # O cache já entrega a capa no tamanho do card (recortada ou centralizada)
+        target_size = self.image_label.size()
+        if cover.size() != target_size:
+            cover = cover.scaled(target_size, Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        self.image_label.setPixmap(cover)
+
     def _apply_status_effect(self):
         """Aplica um efeito de escala de cinza se o jogo não estiver instalado."""
         is_installed = self.game.get("status", "UNINSTALLED") == "INSTALLED"
@@ -4,6 +4,8 @@ from PyQt6.QtWidgets import QWidget, QLabel, QVBoxLayout
 from PyQt6.QtGui import QPixmap, QPainter, QBitmap, QColor
 from PyQt6.QtCore import Qt, QSize, QPoint
 
+from gui.image_loader import get_image_loader
+
 
 class AvatarWidget(QWidget):
     def __init__(self, size=150, parent=None):
@@ -27,9 +29,13 @@ class AvatarWidget(QWidget):
             self.image_label.setMovie(self.movie)
             self.movie.start()
         elif image_path:
-            pixmap = QPixmap(image_path)
-            self.image_label.setPixmap(pixmap)
+            self.image_label.clear()
+            get_image_loader().load(self, image_path, "avatar", self._set_pixmap)
         else:
             self.image_label.setText("SEM\nAVATAR")
             self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-    
\ No newline at end of file
+
+    def _set_pixmap(self, pixmap):
+        if pixmap.size() != self.size():
+            pixmap = pixmap.scaled(self.size(), Qt.AspectRatioMode.KeepAspectRatioByExpanding, Qt.TransformationMode.SmoothTransformation)
+        self.image_label.setPixmap(pixmap)
@@ -0,0 +1,388 @@
+# gui/game_delegates.py
+
+import os
+from PyQt6.QtWidgets import QStyledItemDelegate
+from PyQt6.QtGui import QPixmap, QPixmapCache, QColor, QPainter, QPainterPath, QImage, QFont, QIcon, QPen, QCursor
+from PyQt6.QtCore import Qt, QObject, QEvent, QRect, QRectF, QSize, QVariantAnimation, QEasingCurve, QPersistentModelIndex, pyqtSignal
+
+from gui.animated_card import AnimatedGameCard
+from gui.game_list_model import GameListModel
+from gui.image_loader import get_image_loader, request_key, PRIORITY_VISIBLE
+
+# Cores do tema (as mesmas de THEME_COLORS em main.py e de styles/main.qss);
+# os itens são pintados pelo delegate e não passam pela folha de estilo.
+CARD_COLOR = QColor("#2e2e2e")
+CARD_BORDER_COLOR = QColor("#3a3d40")
+CARD_HOVER_BORDER_COLOR = QColor("#8A4DFF")
+LIST_HOVER_BORDER_COLOR = QColor("#4a90e2")
+TEXT_PRIMARY_COLOR = QColor("#ffffff")
+TEXT_SECONDARY_COLOR = QColor("#cccccc")
+PLACEHOLDER_COLOR = QColor("#333")
+IMAGE_BACKGROUND_COLOR = QColor("#1E1F22")
+PLAY_BUTTON_COLOR = QColor("#4a90e2")
+PLAY_BUTTON_HOVER_COLOR = QColor("#9B6BFF")
+PLAY_BUTTON_BORDER_COLOR = QColor("#A06FFF")
+
+
+def is_installed(game):
+    return game.get("status", "UNINSTALLED") == "INSTALLED"
+
+
+def _cached_pixmap(key, build):
+    """Busca um pixmap no QPixmapCache; se não existir, constrói e guarda."""
+    pixmap = QPixmapCache.find(key)
+    if pixmap is None:
+        pixmap = build()
+        if pixmap is not None and not pixmap.isNull():
+            QPixmapCache.insert(key, pixmap)
+    return pixmap
+
+
+def _platform_icon(source, size):
+    source = (source or "local").lower()
+    icon_path = f"assets/icons/platform/{source}.svg"
+    if not os.path.exists(icon_path):
+        icon_path = "assets/icons/platform/local.svg"
+    if not os.path.exists(icon_path):
+        return None
+    return _cached_pixmap(f"platform:{icon_path}:{size}", lambda: QIcon(icon_path).pixmap(size, size))
+
+
+def _shadow_pixmap(size, blur_radius=25):
+    """Sombra desfocada do card, gerada uma vez por tamanho (substitui o QGraphicsDropShadowEffect)."""
+    def build():
+        # Desenha o retângulo em baixa resolução e amplia com suavização: sai um desfoque barato
+        factor = 8
+        full = QSize(size.width() + blur_radius * 2, size.height() + blur_radius * 2)
+        small = QImage(max(1, full.width() // factor), max(1, full.height() // factor), QImage.Format.Format_ARGB32_Premultiplied)
+        small.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(small)
+        painter.fillRect(QRectF(blur_radius / factor, blur_radius / factor, size.width() / factor, size.height() / factor), QColor(0, 0, 0, 160))
+        painter.end()
+        return QPixmap.fromImage(small.scaled(full, Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation))
+    return _cached_pixmap(f"shadow:{size.width()}x{size.height()}:{blur_radius}", build)
+
+
+class HoverAnimator(QObject):
+    """
+    Anima o "hover" dos itens de uma view: guarda um progresso de 0.0 a 1.0
+    por jogo, que o delegate usa para desenhar o item ampliado.
+    Só existem animações para os itens sob o mouse ou saindo dele.
+    """
+    def __init__(self, view, duration):
+        super().__init__(view)
+        self.view = view
+        self.duration = duration
+        self._progress = {}
+        self._animations = {}
+        self._indexes = {}
+        self._hovered_key = None
+        view.setMouseTracking(True)
+        view.viewport().installEventFilter(self)
+
+    def progress(self, index):
+        return self._progress.get(self._key(index), 0.0)
+
+    def is_hovered(self, index):
+        key = self._key(index)
+        return key is not None and key == self._hovered_key
+
+    def reset(self):
+        for animation in self._animations.values():
+            animation.stop()
+        self._progress.clear(); self._animations.clear(); self._indexes.clear()
+        self._hovered_key = None
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.MouseMove:
+            index = self.view.indexAt(event.position().toPoint())
+            self._set_hovered(index)
+            # Partes do item (como o botão "Jogar") também reagem ao mouse
+            if index.isValid(): self.view.viewport().update(self.view.visualRect(index))
+        elif event.type() == QEvent.Type.Leave:
+            self._set_hovered(None)
+        return False
+
+    def _key(self, index):
+        if index is None or not index.isValid(): return None
+        game = index.data(GameListModel.GameRole)
+        return game.get("id") if game else None
+
+    def _set_hovered(self, index):
+        key = self._key(index)
+        if key == self._hovered_key: return
+        if self._hovered_key is not None:
+            self._animate(self._hovered_key, 0.0)
+        if key is not None:
+            self._indexes[key] = QPersistentModelIndex(index)
+            self._animate(key, 1.0)
+        self._hovered_key = key
+
+    def _animate(self, key, end_value):
+        animation = self._animations.get(key)
+        if animation is None:
+            animation = QVariantAnimation(self)
+            animation.setDuration(self.duration)
+            animation.setEasingCurve(QEasingCurve.Type.OutQuad)
+            animation.valueChanged.connect(lambda value, k=key: self._on_value_changed(k, value))
+            animation.finished.connect(lambda k=key: self._on_finished(k))
+            self._animations[key] = animation
+        animation.stop()
+        animation.setStartValue(float(self._progress.get(key, 0.0)))
+        animation.setEndValue(float(end_value))
+        animation.start()
+
+    def _on_value_changed(self, key, value):
+        self._progress[key] = value
+        index = self._indexes.get(key)
+        if index is not None and index.isValid():
+            # A sombra do card passa um pouco da área do item
+            rect = self.view.visualRect(self.view.model().index(index.row(), 0))
+            self.view.viewport().update(rect.adjusted(-30, -30, 30, 30))
+
+    def _on_finished(self, key):
+        if key != self._hovered_key and self._progress.get(key, 0.0) <= 0.0:
+            # Item voltou ao repouso: descarta a animação para não acumular objetos
+            self._progress.pop(key, None); self._indexes.pop(key, None)
+            animation = self._animations.pop(key, None)
+            if animation is not None: animation.deleteLater()
+
+
+class ViewImageRequests(QObject):
+    """
+    Pede ao ImageLoader as artes dos itens pintados por um delegate.
+    Os itens sendo pintados são os visíveis, então entram com prioridade alta;
+    quando um item sai da tela antes de sua imagem ficar pronta, o pedido é
+    cancelado. Ao chegar a imagem, só o item correspondente é redesenhado.
+    """
+    def __init__(self, view):
+        super().__init__(view)
+        self.view = view
+        self.loader = get_image_loader()
+        self._waiting = {}
+        self.loader.image_ready.connect(self._on_image_ready)
+        view.verticalScrollBar().valueChanged.connect(self._cancel_invisible)
+
+    def pixmap(self, index, path, preset, grey=False):
+        pixmap = self.loader.request(path, preset, grey, PRIORITY_VISIBLE)
+        if pixmap is None and path:
+            key = request_key(path, preset, grey)
+            if self.loader.is_pending(key):
+                self._waiting.setdefault(key, {})[index.row()] = QPersistentModelIndex(index)
+        return pixmap
+
+    def reset(self):
+        for key in self._waiting:
+            self.loader.cancel(key)
+        self._waiting.clear()
+
+    def _on_image_ready(self, key, pixmap):
+        indexes = self._waiting.pop(key, None)
+        if not indexes: return
+        for index in indexes.values():
+            if index.isValid():
+                self.view.viewport().update(self.view.visualRect(self.view.model().index(index.row(), 0)))
+
+    def _cancel_invisible(self):
+        viewport_rect = self.view.viewport().rect()
+        for key, indexes in list(self._waiting.items()):
+            still_visible = any(
+                index.isValid() and self.view.visualRect(self.view.model().index(index.row(), 0)).intersects(viewport_rect)
+                for index in indexes.values()
+            )
+            if not still_visible and self.loader.cancel(key):
+                del self._waiting[key]
+
+
+class GameGridDelegate(QStyledItemDelegate):
+    """Pinta os cards da grade no lugar dos antigos AnimatedGameCard."""
+    clicked = pyqtSignal(dict)
+
+    CARD_WIDTH = AnimatedGameCard.CARD_WIDTH
+    CARD_HEIGHT = AnimatedGameCard.CARD_HEIGHT
+    IMAGE_HEIGHT = AnimatedGameCard.IMAGE_HEIGHT
+    TEXT_AREA_HEIGHT = AnimatedGameCard.TEXT_AREA_HEIGHT
+    # Margem em volta do card, ocupada por ele quando ampliado pelo hover
+    HOVER_MARGIN = 5
+    CELL_SIZE = QSize(CARD_WIDTH + HOVER_MARGIN * 2, CARD_HEIGHT + HOVER_MARGIN * 2)
+
+    def __init__(self, view):
+        super().__init__(view)
+        self.hover = HoverAnimator(view, duration=120)
+        self.images = ViewImageRequests(view)
+
+    def sizeHint(self, option, index):
+        return self.CELL_SIZE
+
+    def cover_pixmap(self, index, game):
+        """Capa já dimensionada para o card; None enquanto ela é carregada em segundo plano."""
+        return self.images.pixmap(index, game.get("image_path"), "card", grey=not is_installed(game))
+
+    def paint(self, painter, option, index):
+        game = index.data(GameListModel.GameRole)
+        if not game: return
+        progress = self.hover.progress(index)
+        inset = round(self.HOVER_MARGIN * (1.0 - progress))
+        card_rect = option.rect.adjusted(inset, inset, -inset, -inset)
+
+        painter.save()
+        painter.setRenderHints(QPainter.RenderHint.Antialiasing | QPainter.RenderHint.SmoothPixmapTransform)
+
+        shadow = _shadow_pixmap(QSize(self.CARD_WIDTH, self.CARD_HEIGHT))
+        if shadow is not None:
+            painter.drawPixmap(card_rect.adjusted(-25, -25 + 5, 25, 25 + 5), shadow)
+
+        painter.fillRect(card_rect, CARD_COLOR)
+
+        image_rect = QRect(card_rect.x(), card_rect.y(), card_rect.width(), card_rect.height() - self.TEXT_AREA_HEIGHT)
+        clip = QPainterPath(); clip.addRoundedRect(QRectF(image_rect).adjusted(0, 0, 0, 7), 7, 7)
+        painter.save(); painter.setClipPath(clip)
+        painter.fillRect(image_rect, IMAGE_BACKGROUND_COLOR)
+        cover = self.cover_pixmap(index, game)
+        if cover is not None:
+            painter.drawPixmap(image_rect, cover)
+        else:
+            self._paint_name_placeholder(painter, image_rect, game)
+        painter.restore()
+
+        text_rect = QRect(card_rect.x(), image_rect.bottom() + 1, card_rect.width(), self.TEXT_AREA_HEIGHT)
+        painter.setPen(CARD_BORDER_COLOR)
+        painter.drawLine(text_rect.topLeft(), text_rect.topRight())
+
+        icon = _platform_icon(game.get("source"), 24)
+        content_rect = text_rect.adjusted(12, 0, -12, 0)
+        if icon is not None:
+            icon_rect = QRect(content_rect.right() - 24 + 1, content_rect.center().y() - 12, 24, 24)
+            painter.drawPixmap(icon_rect, icon)
+            content_rect.setRight(icon_rect.left() - 10)
+
+        font = QFont(option.font); font.setPixelSize(14); font.setBold(True)
+        painter.setFont(font)
+        painter.setPen(TEXT_PRIMARY_COLOR if self.hover.is_hovered(index) else TEXT_SECONDARY_COLOR)
+        painter.drawText(content_rect, int(Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft | Qt.TextFlag.TextWordWrap), game.get("name", ""))
+
+        painter.setPen(QPen(CARD_HOVER_BORDER_COLOR if progress > 0 else CARD_BORDER_COLOR, 1))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawRect(card_rect.adjusted(0, 0, -1, -1))
+        painter.restore()
+
+    def _paint_name_placeholder(self, painter, rect, game):
+        painter.fillRect(rect, PLACEHOLDER_COLOR)
+        painter.setPen(TEXT_PRIMARY_COLOR)
+        font = QFont(painter.font()); font.setPointSize(12); painter.setFont(font)
+        painter.drawText(rect, int(Qt.AlignmentFlag.AlignCenter | Qt.TextFlag.TextWordWrap), game.get("name", ""))
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseButtonPress and event.button() == Qt.MouseButton.LeftButton:
+            game = index.data(GameListModel.GameRole)
+            if game:
+                self.clicked.emit(game)
+                return True
+        return super().editorEvent(event, model, option, index)
+
+
+class GameListDelegate(QStyledItemDelegate):
+    """Pinta as linhas do modo lista no lugar dos antigos GameListItemWidget."""
+    details_clicked = pyqtSignal(dict)
+    play_clicked = pyqtSignal(dict)
+
+    ITEM_HEIGHT = 100
+    ITEM_SPACING = 10
+    IMAGE_SIZE = QSize(160, 75)
+    PLAY_BUTTON_SIZE = QSize(120, 45)
+
+    def __init__(self, view):
+        super().__init__(view)
+        self.hover = HoverAnimator(view, duration=150)
+        self.images = ViewImageRequests(view)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ITEM_HEIGHT + self.ITEM_SPACING)
+
+    def _item_rect(self, option_rect, progress=0.0):
+        rect = QRect(option_rect.x(), option_rect.y() + self.ITEM_SPACING // 2, option_rect.width(), self.ITEM_HEIGHT)
+        # No hover o item sobe 2px e cresce 4px, como a animação de geometria antiga
+        grow = round(2 * progress)
+        return rect.adjusted(0, -grow, 0, grow)
+
+    def _play_button_rect(self, item_rect):
+        return QRect(item_rect.right() - 20 - self.PLAY_BUTTON_SIZE.width() + 1,
+                     item_rect.center().y() - self.PLAY_BUTTON_SIZE.height() // 2,
+                     self.PLAY_BUTTON_SIZE.width(), self.PLAY_BUTTON_SIZE.height())
+
+    def header_pixmap(self, index, game):
+        image_path = game.get("header_path") or game.get("image_path")
+        return self.images.pixmap(index, image_path, "list", grey=not is_installed(game))
+
+    def paint(self, painter, option, index):
+        game = index.data(GameListModel.GameRole)
+        if not game: return
+        progress = self.hover.progress(index)
+        hovered = self.hover.is_hovered(index)
+        item_rect = self._item_rect(option.rect, progress)
+
+        painter.save()
+        painter.setRenderHints(QPainter.RenderHint.Antialiasing | QPainter.RenderHint.SmoothPixmapTransform)
+        painter.fillRect(item_rect, CARD_COLOR)
+        painter.setPen(QPen(LIST_HOVER_BORDER_COLOR if progress > 0 else CARD_BORDER_COLOR, 1))
+        painter.drawRect(item_rect.adjusted(0, 0, -1, -1))
+
+        image_rect = QRect(item_rect.x() + 10, item_rect.y() + 10, self.IMAGE_SIZE.width(), self.IMAGE_SIZE.height())
+        header = self.header_pixmap(index, game)
+        if header is not None:
+            painter.drawPixmap(image_rect, header)
+        else:
+            painter.setPen(TEXT_SECONDARY_COLOR)
+            painter.drawText(image_rect, int(Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft), "Sem Arte")
+
+        button_rect = self._play_button_rect(item_rect)
+        info_rect = QRect(image_rect.right() + 16, item_rect.y() + 10, button_rect.left() - image_rect.right() - 31, item_rect.height() - 20)
+        name_font = QFont(option.font); name_font.setPixelSize(16); name_font.setBold(True)
+        painter.setFont(name_font); painter.setPen(TEXT_PRIMARY_COLOR)
+        name_height = painter.fontMetrics().height()
+        name = painter.fontMetrics().elidedText(game.get("name", ""), Qt.TextElideMode.ElideRight, info_rect.width())
+        painter.drawText(QRect(info_rect.x(), info_rect.y(), info_rect.width(), name_height), int(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter), name)
+
+        playtime_hours = game.get("playtime_local", 0) / 3600
+        painter.setFont(option.font); painter.setPen(TEXT_SECONDARY_COLOR)
+        painter.drawText(QRect(info_rect.x(), info_rect.y() + name_height + 4, info_rect.width(), painter.fontMetrics().height()),
+                         int(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter), f"{playtime_hours:.1f} horas jogadas")
+
+        self._paint_play_button(painter, option, button_rect, game, hovered)
+        painter.restore()
+
+    def _paint_play_button(self, painter, option, rect, game, hovered):
+        cursor_over_button = False
+        if hovered:
+            view = self.parent()
+            cursor_pos = view.viewport().mapFromGlobal(QCursor.pos())
+            cursor_over_button = rect.contains(cursor_pos)
+        painter.setPen(QPen(PLAY_BUTTON_BORDER_COLOR, 1))
+        painter.setBrush(PLAY_BUTTON_HOVER_COLOR if cursor_over_button else PLAY_BUTTON_COLOR)
+        painter.drawRoundedRect(QRectF(rect).adjusted(0.5, 0.5, -0.5, -0.5), 5, 5)
+
+        if is_installed(game):
+            text, icon_path, icon_size = " Jogar", "assets/icons/play.svg", 16
+        else:
+            text, icon_path, icon_size = " Instalar", "assets/icons/download.svg", 18
+        font = QFont(option.font); font.setPixelSize(14); font.setBold(True)
+        painter.setFont(font)
+        text_width = painter.fontMetrics().horizontalAdvance(text)
+        content_x = rect.x() + (rect.width() - icon_size - text_width) // 2
+        icon = _cached_pixmap(f"button-icon:{icon_path}:{icon_size}", lambda: QIcon(icon_path).pixmap(icon_size, icon_size))
+        if icon is not None and not icon.isNull():
+            painter.drawPixmap(QRect(content_x, rect.center().y() - icon_size // 2, icon_size, icon_size), icon)
+        painter.setPen(TEXT_PRIMARY_COLOR)
+        painter.drawText(QRect(content_x + icon_size, rect.y(), text_width + 2, rect.height()), int(Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft), text)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseButtonPress and event.button() == Qt.MouseButton.LeftButton:
+            game = index.data(GameListModel.GameRole)
+            if game:
+                button_rect = self._play_button_rect(self._item_rect(option.rect))
+                if button_rect.contains(event.position().toPoint()):
+                    self.play_clicked.emit(game)
+                else:
+                    self.details_clicked.emit(game)
+                return True
+        return super().editorEvent(event, model, option, index)
@@ -1,86 +1,93 @@
 # gui/game_display_widget.py
 
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QScrollArea, QLabel, QSpacerItem, QSizePolicy, QStackedLayout, QGridLayout
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QStackedLayout, QListView, QAbstractItemView
 # --- INÍCIO DA ALTERAÇÃO ---
 # Importa o QTimer para a restauração da posição da barra de rolagem
 from PyQt6.QtCore import Qt, QTimer
 # --- FIM DA ALTERAÇÃO ---
-from gui.animated_card import AnimatedGameCard
-from gui.game_list_item_widget import GameListItemWidget
+from gui.game_list_model import GameListModel
+from gui.game_delegates import GameGridDelegate, GameListDelegate
 
 class GameDisplayWidget(QWidget):
+    # Grade e lista são QListViews sobre o mesmo modelo: só os itens visíveis
+    # são pintados, e as capas já dimensionadas ficam no QPixmapCache.
+    GRID_SPACING = 20
+
     def __init__(self, main_window_ref):
         super().__init__()
         self.main_window_ref = main_window_ref
+        self.view_mode = "Grade"
+        self.model = GameListModel(self)
         self._setup_ui()
 
     def _setup_ui(self):
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(0, 0, 0, 0)
-        
+
         self.stacked_layout = QStackedLayout()
 
-        self.grid_scroll_area = QScrollArea()
-        self.grid_scroll_area.setWidgetResizable(True)
-        grid_container = QWidget()
-        self.grid_scroll_area.setWidget(grid_container)
-        self.grid_layout = QGridLayout(grid_container)
-        self.grid_layout.setSpacing(30)
-        self.grid_layout.setAlignment(Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft)
-        
-        self.list_scroll_area = QScrollArea()
-        self.list_scroll_area.setWidgetResizable(True)
-        list_container = QWidget()
-        self.list_scroll_area.setWidget(list_container)
-        self.list_layout = QVBoxLayout(list_container)
-        self.list_layout.setSpacing(10)
-        self.list_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-
-        self.stacked_layout.addWidget(self.grid_scroll_area)
-        self.stacked_layout.addWidget(self.list_scroll_area)
-        
+        self.grid_view = QListView()
+        self.grid_view.setObjectName("GameGridView")
+        self.grid_view.setViewMode(QListView.ViewMode.IconMode)
+        self.grid_view.setFlow(QListView.Flow.LeftToRight)
+        self.grid_view.setWrapping(True)
+        self.grid_view.setResizeMode(QListView.ResizeMode.Adjust)
+        self.grid_view.setMovement(QListView.Movement.Static)
+        self.grid_view.setSpacing(self.GRID_SPACING)
+        self.grid_delegate = GameGridDelegate(self.grid_view)
+        self.grid_delegate.clicked.connect(self.main_window_ref.show_game_details)
+        self._configure_view(self.grid_view, self.grid_delegate)
+
+        self.list_view = QListView()
+        self.list_view.setObjectName("GameListView")
+        self.list_delegate = GameListDelegate(self.list_view)
+        self.list_delegate.details_clicked.connect(self.main_window_ref.show_game_details)
+        self.list_delegate.play_clicked.connect(self.main_window_ref.launch_game_from_list)
+        self._configure_view(self.list_view, self.list_delegate)
+
+        self.empty_label = QLabel("Nenhum jogo encontrado.")
+        self.empty_label.setObjectName("EmptyLibraryLabel")
+        self.empty_label.setAlignment(Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop)
+
+        self.stacked_layout.addWidget(self.grid_view)
+        self.stacked_layout.addWidget(self.list_view)
+        self.stacked_layout.addWidget(self.empty_label)
+
         main_layout.addLayout(self.stacked_layout)
 
+    def _configure_view(self, view, delegate):
+        view.setModel(self.model)
+        view.setItemDelegate(delegate)
+        view.setUniformItemSizes(True)
+        view.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        view.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        view.verticalScrollBar().setSingleStep(40)
+
     def set_view_mode(self, mode):
-        if mode == "Grade":
-            self.stacked_layout.setCurrentIndex(0)
-        elif mode == "Lista":
-            self.stacked_layout.setCurrentIndex(1)
+        if mode in ("Grade", "Lista"):
+            self.view_mode = mode
+        self._update_current_page()
+
+    def _update_current_page(self):
+        if self.model.rowCount() == 0:
+            self.stacked_layout.setCurrentWidget(self.empty_label)
+        elif self.view_mode == "Lista":
+            self.stacked_layout.setCurrentWidget(self.list_view)
+        else:
+            self.stacked_layout.setCurrentWidget(self.grid_view)
+
+    def _current_view(self):
+        return self.list_view if self.view_mode == "Lista" else self.grid_view
 
     def populate_games(self, games_list, scroll_pos=0):
-        self._clear_layout(self.grid_layout)
-        self._clear_layout(self.list_layout)
-        
-        if not games_list:
-            no_games_label_grid = QLabel("Nenhum jogo encontrado.")
-            no_games_label_grid.setObjectName("EmptyLibraryLabel")
-            self.grid_layout.addWidget(no_games_label_grid, 0, 0, Qt.AlignmentFlag.AlignCenter)
-            
-            no_games_label_list = QLabel("Nenhum jogo encontrado.")
-            no_games_label_list.setObjectName("EmptyLibraryLabel")
-            self.list_layout.addWidget(no_games_label_list, 0, Qt.AlignmentFlag.AlignCenter)
-            return
-
-        columns = 6
-        for idx, game in enumerate(games_list):
-            card = AnimatedGameCard(game)
-            card.clicked.connect(lambda g=game: self.main_window_ref.show_game_details(g))
-
-            container = QWidget()
-            container.setFixedSize(card.width() + 10, card.height() + 10)
-            
-            card.setParent(container)
-            card.move(5, 5)
-
-            row, col = idx // columns, idx % columns
-            self.grid_layout.addWidget(container, row, col, Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignLeft)
-            
-            list_item = GameListItemWidget(game)
-            list_item.details_clicked.connect(lambda g=game: self.main_window_ref.show_game_details(g))
-            list_item.play_clicked.connect(lambda g=game: self.main_window_ref.launch_game_from_list(g))
-            self.list_layout.addWidget(list_item)
-        
-        self.list_layout.addStretch()
+        for delegate in (self.grid_delegate, self.list_delegate):
+            delegate.hover.reset()
+            delegate.images.reset()
+        self.model.set_games(games_list or [])
+        self._update_current_page()
 
         # --- INÍCIO DA ALTERAÇÃO ---
         # Se uma posição de rolagem foi passada, restaura-a usando um QTimer
@@ -91,28 +98,14 @@ class GameDisplayWidget(QWidget):
             QTimer.singleShot(0, lambda: self.set_scroll_position(scroll_pos))
         # --- FIM DA ALTERAÇÃO ---
 
-
-    def _clear_layout(self, layout):
-        if layout is None: return
-        while layout.count():
-            item = layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-            sub_layout = item.layout()
-            if sub_layout:
-                self._clear_layout(sub_layout)
+    def update_games(self, games):
+        """Atualiza no lugar os cards dos jogos informados; retorna os ids que não estão na lista."""
+        return self.model.update_games(games)
 
     def get_scroll_position(self):
         """Retorna a posição vertical atual da barra de rolagem da vista ativa."""
-        if self.stacked_layout.currentIndex() == 0: # Grade
-            return self.grid_scroll_area.verticalScrollBar().value()
-        else: # Lista
-            return self.list_scroll_area.verticalScrollBar().value()
+        return self._current_view().verticalScrollBar().value()
 
     def set_scroll_position(self, position):
         """Define a posição vertical da barra de rolagem da vista ativa."""
-        if self.stacked_layout.currentIndex() == 0: # Grade
-            self.grid_scroll_area.verticalScrollBar().setValue(position)
-        else: # Lista
-            self.list_scroll_area.verticalScrollBar().setValue(position)
+        self._current_view().verticalScrollBar().setValue(position)
@@ -8,7 +8,7 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt
 
-from core.igdb_api import IGDB_API, download_and_save_images
+from core.igdb_api import get_igdb_api, download_and_save_images, translate_game_summaries
 from gui.igdb_search_dialog import IGDBSearchDialog
 
 class GameEditDialog(QDialog):
@@ -19,7 +19,7 @@ class GameEditDialog(QDialog):
         self.game_id = game_id
         self.game_manager = game_manager
         self.main_window_ref = main_window_ref
-        self.igdb_api = IGDB_API()
+        self.igdb_api = get_igdb_api()
         
         # --- INÍCIO DA CORREÇÃO ---
         # 1. Busca os dados completos do jogo usando o ID recebido.
@@ -136,6 +136,8 @@ class GameEditDialog(QDialog):
             selected_game = results_dialog.get_selected_game()
             
             if selected_game:
+                # Só o resumo do jogo escolhido é traduzido
+                selected_game = translate_game_summaries([selected_game])[0]
                 data_was_changed = False
                 should_download_art = True
                 if self.current_edited_game.get("image_path") or self.current_edited_game.get("background_path"):
@@ -1,10 +1,11 @@
 # gui/game_list_item_widget.py
 
-import os
 from PyQt6.QtWidgets import QFrame, QHBoxLayout, QVBoxLayout, QLabel, QPushButton, QGraphicsColorizeEffect
-from PyQt6.QtGui import QPixmap, QColor, QIcon
+from PyQt6.QtGui import QColor, QIcon
 from PyQt6.QtCore import pyqtSignal, Qt, QSize, QPropertyAnimation, QRect, QEasingCurve
 
+from gui.image_loader import get_image_loader
+
 class GameListItemWidget(QFrame):
     details_clicked = pyqtSignal()
     play_clicked = pyqtSignal()
@@ -29,11 +30,9 @@ class GameListItemWidget(QFrame):
         # --- INÍCIO DA ALTERAÇÃO ---
         # Usa header_path como prioridade, depois image_path
         image_path = self.game.get("header_path") or self.game.get("image_path")
-        if image_path and os.path.exists(image_path):
-            pixmap = QPixmap(image_path).scaled(self.image_label.size(), Qt.AspectRatioMode.KeepAspectRatioByExpanding, Qt.TransformationMode.SmoothTransformation)
-            self.image_label.setPixmap(pixmap)
-        else:
-            self.image_label.setText("Sem Arte")
+        # "Sem Arte" fica como placeholder até a imagem chegar do carregador em segundo plano
+        self.image_label.setText("Sem Arte")
+        get_image_loader().load(self, image_path, "list", self.image_label.setPixmap)
         
         # Aplica o efeito de "cinza" se o jogo não estiver instalado
         self._apply_status_effect()
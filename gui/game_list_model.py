@@ -0,0 +1,47 @@
+# gui/game_list_model.py
+
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+
+class GameListModel(QAbstractListModel):
+    """Modelo com a lista de jogos exibida na biblioteca (grade e lista usam o mesmo)."""
+    GameRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._games = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._games)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not (0 <= index.row() < len(self._games)):
+            return None
+        game = self._games[index.row()]
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return game.get("name")
+        if role == self.GameRole:
+            return game
+        return None
+
+    def set_games(self, games):
+        self.beginResetModel()
+        self._games = list(games)
+        self.endResetModel()
+
+    def game_at(self, row):
+        return self._games[row] if 0 <= row < len(self._games) else None
+
+    def update_games(self, games):
+        """Substitui os jogos já presentes no modelo (pelo id) e redesenha só essas linhas.
+        Retorna os ids dos jogos que não estavam no modelo."""
+        rows_by_id = {game.get("id"): row for row, game in enumerate(self._games)}
+        missing_ids = set()
+        for game in games:
+            row = rows_by_id.get(game.get("id"))
+            if row is None:
+                missing_ids.add(game.get("id"))
+                continue
+            self._games[row] = game
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+        return missing_ids
@@ -12,6 +12,7 @@ from PyQt6.QtCore import pyqtSignal, Qt, QPoint, QSize, QTimer
 
 from gui.game_edit_dialog import GameEditDialog
 from utils.path_utils import get_absolute_path
+from gui.image_loader import get_image_loader
 
 class GamePageWidget(QWidget):
     back_clicked = pyqtSignal()
@@ -23,6 +24,7 @@ class GamePageWidget(QWidget):
         self.game_launcher = game_launcher
         self.main_window_ref = main_window_ref
         self.background_pixmap = None
+        self._scaled_background = None
         self._setup_ui()
         self.load_game_data(self.game_data)
 
@@ -30,7 +32,10 @@ class GamePageWidget(QWidget):
         painter = QPainter(self)
         if self.background_pixmap and not self.background_pixmap.isNull():
             target_rect = self.rect()
-            scaled_pixmap = self.background_pixmap.scaled(target_rect.size(), Qt.AspectRatioMode.KeepAspectRatioByExpanding, Qt.TransformationMode.SmoothTransformation)
+            # Reescala só quando o tamanho da página muda, não a cada pintura
+            if self._scaled_background is None or self._scaled_background[0] != target_rect.size():
+                self._scaled_background = (target_rect.size(), self.background_pixmap.scaled(target_rect.size(), Qt.AspectRatioMode.KeepAspectRatioByExpanding, Qt.TransformationMode.SmoothTransformation))
+            scaled_pixmap = self._scaled_background[1]
             point = QPoint((target_rect.width() - scaled_pixmap.width()) // 2, (target_rect.height() - scaled_pixmap.height()) // 2)
             painter.drawPixmap(point, scaled_pixmap)
             overlay_color = QColor(20, 21, 24, 217)
@@ -125,6 +130,7 @@ class GamePageWidget(QWidget):
                 webbrowser.open(executable_path)
                 self.game_manager.update_last_played(self.game_data['id'])
                 self.load_game_data(self.game_manager.get_game_by_id(self.game_data['id']))
+                self.main_window_ref.refresh_views()
                 self.play_button.setEnabled(False)
                 self.play_button.setText("INICIANDO...")
                 QTimer.singleShot(5000, self.enable_play_button)
@@ -178,23 +184,19 @@ class GamePageWidget(QWidget):
         bg_path_raw = self.game_data.get("background_path") or self.game_data.get("image_path")
         cover_path_raw = self.game_data.get("image_path")
         bg_path_abs = get_absolute_path(bg_path_raw)
-        if bg_path_abs and os.path.exists(bg_path_abs):
-            self.background_pixmap = QPixmap(bg_path_abs)
-        else:
-            self.background_pixmap = None
+        self.background_pixmap = None
+        self._scaled_background = None
+        self._background_path = bg_path_abs
+        get_image_loader().load(self, bg_path_abs, "page_background", lambda pixmap, path=bg_path_abs: self._set_background(path, pixmap))
         self.update() 
         self.title_label.setText(self.game_data.get("name", "Nome Indisponível"))
         cover_path_abs = get_absolute_path(cover_path_raw)
+        # "Sem Capa" fica como placeholder até a capa chegar do carregador em segundo plano
+        self._cover_path = cover_path_abs
+        self.cover_label.setText("Sem Capa")
+        self.cover_label.setFixedSize(self.cover_label.maximumWidth(), int(self.cover_label.maximumWidth() * 1.5))
         if cover_path_abs and os.path.exists(cover_path_abs):
-            pixmap = QPixmap(cover_path_abs)
-            scaled_pixmap = pixmap.scaledToWidth(self.cover_label.maximumWidth(), Qt.TransformationMode.SmoothTransformation)
-            self.cover_label.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Preferred)
-            self.cover_label.setMinimumSize(0, 0)
-            self.cover_label.setPixmap(scaled_pixmap)
-            self.cover_label.adjustSize()
-        else:
-            self.cover_label.setText("Sem Capa")
-            self.cover_label.setFixedSize(self.cover_label.maximumWidth(), int(self.cover_label.maximumWidth() * 1.5))
+            get_image_loader().load(self, cover_path_abs, "page_cover", lambda pixmap, path=cover_path_abs: self._set_cover(path, pixmap))
         is_favorite = self.game_data.get("favorite", False)
         self.fav_button.setIcon(QIcon("assets/icons/star.svg"))
         self.fav_button.setText(" Favorito" if is_favorite else " Favoritar")
@@ -235,6 +237,20 @@ class GamePageWidget(QWidget):
                 self.genres_layout.addWidget(genre_label)
         self.genres_layout.addStretch()
 
+    def _set_background(self, path, pixmap):
+        if path != self._background_path: return
+        self.background_pixmap = pixmap
+        self._scaled_background = None
+        self.update()
+
+    def _set_cover(self, path, scaled_pixmap):
+        if path != self._cover_path: return
+        self.cover_label.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Preferred)
+        self.cover_label.setMinimumSize(0, 0)
+        self.cover_label.setMaximumHeight(16777215)
+        self.cover_label.setPixmap(scaled_pixmap)
+        self.cover_label.adjustSize()
+
     def _toggle_favorite(self):
         self.game_manager.toggle_favorite(self.game_data['id'])
         updated_game_data = self.game_manager.get_game_by_id(self.game_data["id"])
@@ -0,0 +1,153 @@
+# gui/image_loader.py
+
+import time
+import logging
+from collections import OrderedDict, defaultdict
+from PyQt6 import sip
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from gui.thumbnail_cache import get_thumbnail_cache
+
+# Prioridades no QThreadPool: quanto maior, antes a imagem é decodificada
+PRIORITY_VISIBLE = 10
+PRIORITY_NORMAL = 0
+
+# Últimas imagens entregues, para o caso de o QPixmapCache descartá-las antes do redesenho
+RECENT_RESULTS_LIMIT = 64
+
+# Uma arte que falhou só é tentada de novo depois deste intervalo (ela pode ainda estar sendo baixada)
+FAILED_RETRY_SECONDS = 30
+
+
+def request_key(path, preset, grey=False):
+    return f"{preset}|{int(bool(grey))}|{path}"
+
+
+class _DecodeTask(QRunnable):
+    """Decodifica (ou lê do cache em disco) um derivado da arte em uma thread do pool."""
+    def __init__(self, loader, key, path, preset, grey):
+        super().__init__()
+        self.loader = loader
+        self.key, self.path, self.preset, self.grey = key, path, preset, grey
+
+    def run(self):
+        try:
+            image = get_thumbnail_cache().get_image(self.path, self.preset, self.grey)
+        except Exception as e:
+            logging.error(f"Erro ao decodificar a imagem '{self.path}': {e}", exc_info=True)
+            image = None
+        # O sinal é entregue na thread da GUI, onde o loader vive
+        self.loader._decoded.emit(self.key, image)
+
+
+class ImageLoader(QObject):
+    """
+    Carrega as artes dos jogos fora da thread da GUI.
+
+    request() devolve o pixmap na hora se ele já estiver em memória; senão agenda
+    a decodificação e devolve None. Quando a imagem fica pronta, image_ready é
+    emitido com a chave do pedido (request_key) e o pixmap, e o widget troca o
+    placeholder pela imagem. Pedidos ainda na fila podem ser cancelados.
+    """
+    image_ready = pyqtSignal(str, object)
+    _decoded = pyqtSignal(str, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.thread_pool = QThreadPool(self)
+        # Deixa núcleos livres para a GUI e para as outras tarefas em segundo plano
+        self.thread_pool.setMaxThreadCount(max(2, QThreadPool.globalInstance().maxThreadCount() // 2))
+        self._pending = {}
+        self._failed = {}
+        self._recent = OrderedDict()
+        self._callbacks = defaultdict(list)
+        self._decoded.connect(self._on_decoded)
+
+    def request(self, path, preset, grey=False, priority=PRIORITY_NORMAL):
+        if not path: return None
+        cache = get_thumbnail_cache()
+        key = request_key(path, preset, grey)
+        pixmap = cache.find_pixmap(path, preset, grey)
+        if pixmap is None:
+            pixmap = self._recent.get(self._recent_key(path, preset, grey))
+        if pixmap is not None:
+            return pixmap
+        failed_at = self._failed.get(key)
+        if failed_at is not None and time.monotonic() - failed_at < FAILED_RETRY_SECONDS:
+            return None
+        if key not in self._pending:
+            task = _DecodeTask(self, key, path, preset, grey)
+            self._pending[key] = task
+            self.thread_pool.start(task, priority)
+        return None
+
+    def load(self, owner, path, preset, callback, grey=False, priority=PRIORITY_NORMAL):
+        """
+        Entrega o pixmap a callback(pixmap): na hora, se já estiver em memória,
+        ou quando a decodificação terminar. O callback é ignorado se o widget
+        'owner' tiver sido destruído nesse meio tempo.
+        """
+        pixmap = self.request(path, preset, grey, priority)
+        if pixmap is not None:
+            callback(pixmap)
+        elif self.is_pending(request_key(path, preset, grey)):
+            self._callbacks[request_key(path, preset, grey)].append((owner, callback))
+
+    def cancel(self, key):
+        """Desiste de um pedido que ainda não começou a ser decodificado."""
+        task = self._pending.get(key)
+        if task is None: return False
+        try:
+            taken = self.thread_pool.tryTake(task)
+        except RuntimeError:
+            # A tarefa já rodou e foi apagada pelo pool; o resultado está a caminho
+            taken = False
+        if taken:
+            del self._pending[key]
+            self._callbacks.pop(key, None)
+        return taken
+
+    def is_pending(self, key):
+        return key in self._pending
+
+    def shutdown(self):
+        self.thread_pool.clear()
+        self.thread_pool.waitForDone(2000)
+
+    def _recent_key(self, path, preset, grey):
+        # Mesma impressão digital do ThumbnailCache (caminho, data, tamanho): uma arte
+        # sobrescrita no mesmo caminho não devolve o pixmap antigo
+        fingerprint = get_thumbnail_cache().cache_key(path, preset)
+        return f"{fingerprint}:{int(bool(grey))}" if fingerprint else None
+
+    def _on_decoded(self, key, image):
+        task = self._pending.pop(key, None)
+        callbacks = self._callbacks.pop(key, [])
+        if task is None: return
+        if image is None or image.isNull():
+            # Não tenta de novo a cada redesenho; a arte continua com o placeholder
+            self._failed[key] = time.monotonic()
+            return
+        pixmap = get_thumbnail_cache().insert_pixmap(task.path, task.preset, task.grey, image)
+        if pixmap is None: return
+        self._failed.pop(key, None)
+        recent_key = self._recent_key(task.path, task.preset, task.grey)
+        if recent_key is not None:
+            self._recent[recent_key] = pixmap
+            self._recent.move_to_end(recent_key)
+        while len(self._recent) > RECENT_RESULTS_LIMIT:
+            self._recent.popitem(last=False)
+        self.image_ready.emit(key, pixmap)
+        for owner, callback in callbacks:
+            if not sip.isdeleted(owner):
+                callback(pixmap)
+
+
+_image_loader = None
+
+def get_image_loader():
+    """Instância compartilhada; precisa ser criada na thread da GUI."""
+    global _image_loader
+    if _image_loader is None:
+        _image_loader = ImageLoader()
+    return _image_loader
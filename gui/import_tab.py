@@ -2,22 +2,56 @@
 
 import os
 import logging
+import threading
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QFileDialog,
     QListWidget, QListWidgetItem, QCheckBox, QLabel, QMessageBox, QFrame, QApplication
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
 
 from core.folder_scanner import SteamScanner, LocalGameScanner
 from core.settings_manager import SettingsManager
-from core.steam_app_list import find_appid_by_name, update_steam_app_list
-from core.artwork_manager import download_steam_artwork
+from core.steam_app_list import find_appids_by_names, update_steam_app_list
+from core.artwork_manager import download_steam_artwork_batch
 from gui.metadata_review_dialog import MetadataReviewDialog
-from core.igdb_api import IGDB_API, download_and_save_images
+from core.igdb_api import get_igdb_api, download_and_save_images, translate_game_summaries
 from gui.igdb_search_dialog import IGDBSearchDialog
 from core.steam_web_api import get_owned_games
 
+class LocalScanThread(QThread):
+    """Roda LocalGameScanner.iter_scan_folder fora da thread da GUI e repassa cada resultado por sinal."""
+    game_found = pyqtSignal(dict)
+    progress = pyqtSignal(int, int, int)  # pastas concluídas, total de pastas, jogos encontrados
+    scan_finished = pyqtSignal(bool)      # True se foi cancelada
+
+    def __init__(self, local_scanner, path, is_deep, parent=None):
+        super().__init__(parent)
+        self.local_scanner = local_scanner
+        self.path = path
+        self.is_deep = is_deep
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        found_count = 0
+        try:
+            for _, game_data, completed, total in self.local_scanner.iter_scan_folder(
+                    self.path, is_deep_scan=self.is_deep, cancel_event=self.cancel_event):
+                if game_data:
+                    found_count += 1
+                    self.game_found.emit(game_data)
+                self.progress.emit(completed, total, found_count)
+        except Exception as e:
+            logging.error(f"Erro durante a varredura local em '{self.path}': {e}", exc_info=True)
+        self.scan_finished.emit(self.cancel_event.is_set())
+
+
 class ImportTab(QWidget):
+    # Emitido de uma thread de fundo quando as artes dos jogos sincronizados terminam de baixar
+    steam_artwork_ready = pyqtSignal()
+
     def __init__(self, game_manager, main_window_ref):
         super().__init__()
         self.game_manager = game_manager
@@ -25,10 +59,12 @@ class ImportTab(QWidget):
         
         self.steam_scanner = SteamScanner(self.game_manager)
         self.local_scanner = LocalGameScanner(self.game_manager)
-        self.igdb_api = IGDB_API()
+        self.igdb_api = get_igdb_api()
         
         self.settings_manager = SettingsManager()
         self.found_games_list = []
+        self.scan_thread = None
+        self.steam_artwork_ready.connect(lambda: self.main_window_ref.refresh_views())
         
         self._setup_ui()
 
@@ -63,13 +99,22 @@ class ImportTab(QWidget):
         manual_scan_label = QLabel("Adicionar Jogos Locais (Busca Manual)")
         main_layout.addWidget(manual_scan_label)
         manual_buttons_layout = QHBoxLayout()
-        simple_scan_btn = QPushButton("📂 Selecionar Pasta (Busca Rápida)")
-        simple_scan_btn.clicked.connect(self.run_simple_scan_manual)
-        manual_buttons_layout.addWidget(simple_scan_btn)
-        deep_scan_btn = QPushButton("🔎 Selecionar Pasta (Busca Completa)")
-        deep_scan_btn.clicked.connect(self.run_deep_scan_manual)
-        manual_buttons_layout.addWidget(deep_scan_btn)
+        self.simple_scan_btn = QPushButton("📂 Selecionar Pasta (Busca Rápida)")
+        self.simple_scan_btn.clicked.connect(self.run_simple_scan_manual)
+        manual_buttons_layout.addWidget(self.simple_scan_btn)
+        self.deep_scan_btn = QPushButton("🔎 Selecionar Pasta (Busca Completa)")
+        self.deep_scan_btn.clicked.connect(self.run_deep_scan_manual)
+        manual_buttons_layout.addWidget(self.deep_scan_btn)
         main_layout.addLayout(manual_buttons_layout)
+
+        scan_progress_layout = QHBoxLayout()
+        self.scan_progress_label = QLabel()
+        scan_progress_layout.addWidget(self.scan_progress_label, 1)
+        self.cancel_scan_btn = QPushButton("Cancelar Busca")
+        self.cancel_scan_btn.clicked.connect(self.cancel_local_scan)
+        self.cancel_scan_btn.setVisible(False)
+        scan_progress_layout.addWidget(self.cancel_scan_btn)
+        main_layout.addLayout(scan_progress_layout)
         
         line = QFrame(); line.setFrameShape(QFrame.Shape.HLine); line.setFrameShadow(QFrame.Shadow.Sunken)
         main_layout.addWidget(line)
@@ -115,11 +160,12 @@ class ImportTab(QWidget):
         
         self.main_window_ref.show_loading_overlay("Sincronizando jogos e artes...")
         QApplication.processEvents()
-        self.game_manager.sync_full_steam_library(owned_games)
+        self.game_manager.sync_full_steam_library(owned_games, progress_callback=self._show_artwork_progress)
 
         self.main_window_ref.show_loading_overlay("Verificando jogos instalados...")
         QApplication.processEvents()
-        self.steam_scanner.sync_steam_games()
+        # Sincronização pedida pelo usuário: relê todos os manifestos em vez de confiar no estado salvo
+        self.steam_scanner.sync_steam_games(on_artwork_ready=self.steam_artwork_ready.emit, full_rescan=True)
 
         self.main_window_ref.hide_loading_overlay()
         self.main_window_ref.show_message_box("Sucesso", "Sua biblioteca Steam foi completamente sincronizada!", "info")
@@ -129,7 +175,8 @@ class ImportTab(QWidget):
     def run_metadata_search(self):
         self.main_window_ref.show_loading_overlay("Buscando jogos sem arte...")
         QApplication.processEvents()
-        update_steam_app_list()
+        # Com a chave de API, a lista de apps da Steam é atualizada só com o que mudou
+        update_steam_app_list(api_key=self.main_window_ref.profile_manager.get_data().get('steam_api_key'))
         all_games = self.game_manager.get_all_games()
         games_to_search = [g for g in all_games if not g.get('image_path')]
         if not games_to_search:
@@ -138,8 +185,14 @@ class ImportTab(QWidget):
             return
         suggestions = []
         self.main_window_ref.show_loading_overlay("Procurando correspondências...")
+        QApplication.processEvents()
+        appids_by_name = find_appids_by_names([game['name'] for game in games_to_search])
+        # Os jogos que não estão na Steam são buscados no IGDB de uma vez, em lotes
+        igdb_results_by_id = self.igdb_api.search_games_many(
+            {game['id']: game['name'] for game in games_to_search if not appids_by_name.get(game['name'])}
+        )
         for game in games_to_search:
-            appid = find_appid_by_name(game['name'])
+            appid = appids_by_name.get(game['name'])
             if appid:
                 suggestion = {
                     'game_id': game['id'], 'original_name': game['name'], 'suggestion_name': game['name'], 
@@ -148,7 +201,7 @@ class ImportTab(QWidget):
                 }
                 suggestions.append(suggestion)
                 continue
-            igdb_results = self.igdb_api.search_games(game['name'])
+            igdb_results = igdb_results_by_id.get(game['id'])
             if igdb_results:
                 best_match = igdb_results[0]
                 preview_url = best_match.get('cover_url', '')
@@ -169,13 +222,28 @@ class ImportTab(QWidget):
             if approved_suggestions:
                 self.apply_metadata(approved_suggestions)
 
+    def _show_artwork_progress(self, completed, total):
+        self.main_window_ref.show_loading_overlay(f"Baixando artes... {completed}/{total}")
+        QApplication.processEvents()
+
     def apply_metadata(self, suggestions):
         self.main_window_ref.show_loading_overlay("Aplicando metadados...")
         QApplication.processEvents()
+        # Todas as artes da Steam são baixadas de uma vez, em paralelo
+        steam_artwork = download_steam_artwork_batch(
+            [s['appid'] for s in suggestions if s['source'] == 'steam'],
+            progress_callback=self._show_artwork_progress
+        )
+        self.main_window_ref.show_loading_overlay("Aplicando metadados...")
+        QApplication.processEvents()
+        # Traduz de uma vez os resumos das sugestões do IGDB que foram aprovadas
+        igdb_suggestions = [s for s in suggestions if s['source'] == 'igdb']
+        for s, igdb_data in zip(igdb_suggestions, translate_game_summaries([s['igdb_data'] for s in igdb_suggestions])):
+            s['igdb_data'] = igdb_data
         applied_count = 0
         for s in suggestions:
             if s['source'] == 'steam':
-                artwork_paths = download_steam_artwork(s['appid'])
+                artwork_paths = steam_artwork.get(str(s['appid']))
                 if artwork_paths:
                     self.game_manager.update_game_artwork(
                         game_id=s['game_id'], app_id=s['appid'],
@@ -198,27 +266,75 @@ class ImportTab(QWidget):
 
     def run_simple_scan_manual(self):
         folder_path = QFileDialog.getExistingDirectory(self, "Selecionar Pasta (Busca Rápida)")
-        if folder_path: self._execute_local_scan(self.local_scanner.scan_folder, folder_path, is_deep=False)
+        if folder_path: self._execute_local_scan(folder_path, is_deep=False)
 
     def run_deep_scan_manual(self):
         folder_path = QFileDialog.getExistingDirectory(self, "Selecionar Pasta (Completa)")
-        if folder_path: self._execute_local_scan(self.local_scanner.scan_folder, folder_path, is_deep=True)
+        if folder_path: self._execute_local_scan(folder_path, is_deep=True)
 
-    def _execute_local_scan(self, scan_method, path, is_deep):
+    def _execute_local_scan(self, path, is_deep):
+        if self.scan_thread is not None: return
         self.results_list.clear()
-        self.main_window_ref.show_loading_overlay("Buscando jogos locais...")
-        QApplication.processEvents()
-        self.found_games_list = scan_method(path, is_deep_scan=is_deep)
-        self.main_window_ref.hide_loading_overlay()
-        self.populate_results()
-        
+        self.found_games_list = []
+        self._set_scanning(True)
+        self.scan_progress_label.setText("Buscando jogos locais...")
+
+        # Os resultados chegam pela fila de eventos conforme cada pasta termina
+        self.scan_thread = LocalScanThread(self.local_scanner, path, is_deep, self)
+        self.scan_thread.game_found.connect(self._add_result)
+        self.scan_thread.progress.connect(self._show_scan_progress)
+        self.scan_thread.scan_finished.connect(self._on_local_scan_finished)
+        # A thread só é destruída depois que run() retornar de fato
+        self.scan_thread.finished.connect(self.scan_thread.deleteLater)
+        self.scan_thread.finished.connect(self._on_scan_thread_finished)
+        self.scan_thread.start()
+
+    def cancel_local_scan(self):
+        if self.scan_thread is None: return
+        self.scan_thread.cancel()
+        self.cancel_scan_btn.setEnabled(False)
+        self.scan_progress_label.setText("Cancelando a busca...")
+
+    def shutdown(self):
+        """Interrompe uma varredura em andamento (usado no encerramento do app)."""
+        if self.scan_thread is not None:
+            self.scan_thread.cancel()
+            self.scan_thread.wait(5000)
+
+    def _set_scanning(self, scanning):
+        self.simple_scan_btn.setEnabled(not scanning)
+        self.deep_scan_btn.setEnabled(not scanning)
+        self.cancel_scan_btn.setEnabled(scanning)
+        self.cancel_scan_btn.setVisible(scanning)
+
+    def _show_scan_progress(self, completed, total, found_count):
+        self.scan_progress_label.setText(f"Pastas verificadas: {completed} de {total} — {found_count} jogo(s) encontrado(s)")
+
+    def _on_scan_thread_finished(self):
+        self.scan_thread = None
+
+    def _on_local_scan_finished(self, cancelled):
+        self._set_scanning(False)
+        found_count = len(self.found_games_list)
+        if cancelled:
+            self.scan_progress_label.setText(f"Busca cancelada. {found_count} jogo(s) encontrado(s).")
+        else:
+            self.scan_progress_label.setText(f"Busca concluída. {found_count} jogo(s) encontrado(s).")
+        if not self.found_games_list:
+            self.results_list.addItem("Nenhum novo jogo encontrado nesta pasta.")
+
+    def _add_result(self, game):
+        self.found_games_list.append(game)
+        item = QListWidgetItem(self.results_list)
+        checkbox = QCheckBox(f"{game['name']}  ({game['path']})"); checkbox.setChecked(True)
+        self.results_list.addItem(item); self.results_list.setItemWidget(item, checkbox)
+
     def populate_results(self):
         self.results_list.clear()
         if not self.found_games_list: self.results_list.addItem("Nenhum novo jogo encontrado nesta pasta."); return
-        for game in self.found_games_list:
-            item = QListWidgetItem(self.results_list)
-            checkbox = QCheckBox(f"{game['name']}  ({game['path']})"); checkbox.setChecked(True)
-            self.results_list.addItem(item); self.results_list.setItemWidget(item, checkbox)
+        games, self.found_games_list = self.found_games_list, []
+        for game in games:
+            self._add_result(game)
 
     def select_all(self):
         for i in range(self.results_list.count()):
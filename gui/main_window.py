@@ -17,6 +17,8 @@ from core.game_launcher import GameLauncher
 from core.profile_manager import ProfileManager
 from core.settings_manager import SettingsManager
 from core.folder_scanner import SteamScanner, LocalGameScanner
+from core.igdb_cache import get_igdb_cache
+from core.igdb_api import get_igdb_api
 
 from gui.game_display_widget import GameDisplayWidget
 from gui.game_page_widget import GamePageWidget
@@ -25,6 +27,9 @@ from gui.recent_favorites_tabs import RecentTab
 from gui.profile_tab import ProfileTab
 from gui.import_tab import ImportTab
 from gui.settings_tab import SettingsTab
+from gui.refresh_scheduler import LibraryRefreshScheduler
+from gui.image_loader import get_image_loader
+from gui.steam_library_watcher import SteamLibraryWatcher
 
 class MainWindow(QMainWindow):
 
@@ -147,7 +152,23 @@ class MainWindow(QMainWindow):
         self.playtime_tracker.timeout.connect(self._check_running_games)
         self.playtime_tracker.start()
         
-        self.search_input.textChanged.connect(self.refresh_views)
+        self.refresh_scheduler = LibraryRefreshScheduler(self)
+        self.refresh_scheduler.register_view("library", self.library_display, self._make_library_query, self._apply_library_games)
+        self.refresh_scheduler.register_view("favorites", self.favorites_display, self._make_favorites_query, self._apply_favorite_games)
+        self.refresh_scheduler.register_view("recent", self.recent_tab_widget, lambda: self.game_manager.get_recent_games, lambda games, _: self.recent_tab_widget.populate_recent_games(games))
+        self.refresh_scheduler.register_view("profile", self.profile_tab_widget, lambda: self.profile_tab_widget.fetch_profile_snapshot, lambda snapshot, _: self.profile_tab_widget.apply_profile_snapshot(snapshot))
+        self.app.aboutToQuit.connect(self.refresh_scheduler.shutdown)
+        self.app.aboutToQuit.connect(get_image_loader().shutdown)
+
+        self.steam_library_watcher = SteamLibraryWatcher(self.game_manager, SteamScanner(self.game_manager), self)
+        self.steam_library_watcher.games_changed.connect(self._on_steam_games_changed)
+        self.app.aboutToQuit.connect(self.steam_library_watcher.shutdown)
+        self.app.aboutToQuit.connect(self.import_tab_widget.shutdown)
+        self.app.aboutToQuit.connect(get_igdb_cache().shutdown)
+        self.app.aboutToQuit.connect(get_igdb_api().shutdown)
+        self.steam_library_watcher.start()
+
+        self.search_input.textChanged.connect(self._on_search_text_changed)
         self.view_options_btn.clicked.connect(self.show_options_menu)
 
         btn_library.clicked.connect(lambda: self.stacked_widget.setCurrentWidget(self.library_display))
@@ -160,7 +181,6 @@ class MainWindow(QMainWindow):
         
         self.stacked_widget.currentChanged.connect(self._on_page_changed)
 
-        self.refresh_views()
         self._on_page_changed(self.stacked_widget.currentIndex())
 
     def _on_page_changed(self, index):
@@ -181,8 +201,7 @@ class MainWindow(QMainWindow):
             self.content_layout.setContentsMargins(0, 0, 0, 0)
         else:
             self.content_layout.setContentsMargins(50, 40, 50, 40)
-        if shows_top_bar:
-            self.refresh_views()
+        self.refresh_scheduler.view_shown(current_widget)
 
     def start_tracking_game(self, process, game):
         if process and game:
@@ -244,6 +263,8 @@ class MainWindow(QMainWindow):
             logging.info(f"Iniciando jogo da Steam via protocolo: {executable_path}")
             webbrowser.open(executable_path)
             self.game_manager.update_last_played(game['id'])
+            # "Recentes", o perfil e a ordem por jogado recentemente mudam
+            self.refresh_views(restore_scroll=True)
         else:
             result, data = self.game_launcher.launch_game(game, executable_path)
             if isinstance(result, str) and result == "error":
@@ -318,25 +339,58 @@ class MainWindow(QMainWindow):
         self.stacked_widget.setCurrentWidget(self.current_game_page)
 
     def refresh_views(self, restore_scroll=False):
+        # As consultas rodam em segundo plano; só as visualizações visíveis são
+        # redesenhadas agora, as demais quando forem exibidas.
         logging.info("Atualizando todas as visualizações...")
+        self.refresh_scheduler.request(restore_scroll=restore_scroll)
+
+    def _on_steam_games_changed(self, games):
+        # Os cards já exibidos são atualizados no lugar; se um jogo precisa entrar
+        # ou sair de uma lista (jogo novo, filtro de status), ela é reconsultada.
+        stale_views = ["recent", "profile"]
+        filtered_by_status = self.current_status_filter != "Todos"
+        if self.library_display.update_games(games) or filtered_by_status:
+            stale_views.append("library")
+        favorite_games = [game for game in games if game.get('favorite')]
+        if self.favorites_display.update_games(favorite_games) or (filtered_by_status and favorite_games):
+            stale_views.append("favorites")
+        current_display = self.stacked_widget.currentWidget()
+        if current_display in (self.library_display, self.favorites_display):
+            # Mantém a rolagem de quem está olhando a lista durante a atualização
+            self.last_scroll_position = current_display.get_scroll_position()
+            self.refresh_scheduler.request(stale_views, restore_scroll=True)
+        else:
+            self.refresh_scheduler.request(stale_views)
+
+    def _on_search_text_changed(self, _text):
+        self.refresh_scheduler.request(("library", "favorites"), debounce=True)
+
+    def _make_library_query(self):
+        # Captura os filtros agora, na thread da GUI; a consulta roda depois
         search_term = self.search_input.text()
-        library_games = self.game_manager.get_filtered_games(
-            search_text=search_term, 
-            tag=self.current_tag_filter, 
-            sort_by=self.current_sort_by,
-            status_filter=self.current_status_filter
+        tag, sort_by, status_filter = self.current_tag_filter, self.current_sort_by, self.current_status_filter
+        return lambda: self.game_manager.get_filtered_games(
+            search_text=search_term,
+            tag=tag,
+            sort_by=sort_by,
+            status_filter=status_filter
         )
-        
+
+    def _make_favorites_query(self):
+        search_term = self.search_input.text()
+        status_filter = self.current_status_filter
+        return lambda: self.game_manager.get_favorite_games(
+            status_filter=status_filter,
+            search_text=search_term
+        )
+
+    def _apply_library_games(self, games, restore_scroll):
         scroll_pos = self.last_scroll_position if restore_scroll else 0
-        self.library_display.populate_games(library_games, scroll_pos=scroll_pos)
-        
-        favorite_games = self.game_manager.get_favorite_games(status_filter=self.current_status_filter)
-        if search_term:
-            favorite_games = [g for g in favorite_games if search_term.lower() in g['name'].lower()]
-        self.favorites_display.populate_games(favorite_games, scroll_pos=scroll_pos)
-        
-        self.recent_tab_widget.populate_recent_games(self.game_manager.get_recent_games())
-        self.profile_tab_widget.load_profile_data()
+        self.library_display.populate_games(games, scroll_pos=scroll_pos)
+
+    def _apply_favorite_games(self, games, restore_scroll):
+        scroll_pos = self.last_scroll_position if restore_scroll else 0
+        self.favorites_display.populate_games(games, scroll_pos=scroll_pos)
 
     def show_message_box(self, title, message, icon_type="info", buttons=QMessageBox.StandardButton.Ok):
         msg_box = QMessageBox(self)
@@ -1,29 +1,52 @@
 # gui/metadata_review_dialog.py
 
-import os
-import requests
-import logging # Adicionado para um logging mais claro
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6 import sip
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
-                             QScrollArea, QWidget, QFrame, QCheckBox, QSpacerItem, QSizePolicy, QMessageBox)
-from PyQt6.QtGui import QPixmap, QColor
-from PyQt6.QtCore import Qt, QSize, pyqtSignal
-
+                             QScrollArea, QWidget, QFrame, QCheckBox, QMessageBox)
+from PyQt6.QtGui import QPixmap
+from PyQt6.QtCore import Qt, pyqtSignal
+
+from core.artwork_fetcher import get_artwork_fetcher, FETCH_OK_STATUSES
+from core.artwork_manager import get_steam_artwork_job
+from core.igdb_api import get_igdb_artwork_jobs
+from gui.image_loader import get_image_loader
 # Precisamos do diálogo de busca do IGDB aqui
 from gui.igdb_search_dialog import IGDBSearchDialog
 
+# Downloads de preview simultâneos (o ArtworkFetcher ainda limita o ritmo por servidor)
+PREVIEW_FETCH_WORKERS = 4
+PREVIEW_PRESET = "review"
+
+
+def get_preview_job(suggestion_data):
+    """
+    (url, caminho local) do preview de uma sugestão. O caminho é o mesmo em que
+    a capa é salva ao aplicar a sugestão, então o download não se repete depois.
+    """
+    if suggestion_data.get('source') == 'steam' and suggestion_data.get('appid'):
+        return get_steam_artwork_job(suggestion_data['appid'], 'image_path')
+    if suggestion_data.get('source') == 'igdb':
+        for key, url, path in get_igdb_artwork_jobs(suggestion_data.get('igdb_data')):
+            if key == 'image': return url, path
+    return None
+
 class MetadataSuggestionWidget(QFrame):
     """
     Widget customizado para exibir uma sugestão, agora com um botão para alterar a seleção.
     """
     change_requested = pyqtSignal(object) 
+    # Pede ao diálogo o preview da sugestão atual (baixado em segundo plano)
+    preview_requested = pyqtSignal(object)
 
     def __init__(self, suggestion_data, parent=None):
         super().__init__(parent)
         self.suggestion_data = suggestion_data
+        self.pending_preview_path = None
         self.setObjectName("SuggestionCard")
         self.setFrameShape(QFrame.Shape.StyledPanel)
         self._setup_ui()
-        self.load_artwork_preview()
 
     def _setup_ui(self):
         main_layout = QHBoxLayout(self)
@@ -79,52 +102,36 @@ class MetadataSuggestionWidget(QFrame):
         self.load_artwork_preview()
 
     def load_artwork_preview(self):
-        """Baixa a imagem de preview e a exibe diretamente da memória."""
-        preview_url = self.suggestion_data.get('preview_url')
-        if not preview_url:
+        """Mostra o placeholder e pede o preview; set_preview() o exibe quando ficar pronto."""
+        self.artwork_label.setPixmap(QPixmap())
+        if not get_preview_job(self.suggestion_data):
+            self.pending_preview_path = None
             self.artwork_label.setText("Sem Arte")
             return
+        self.artwork_label.setText("A carregar...")
+        self.preview_requested.emit(self)
 
-        try:
-            full_url = f"https:{preview_url}" if preview_url.startswith("//") else preview_url
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
-            
-            response = requests.get(full_url, headers=headers, stream=True, timeout=15)
-            
-            if response.status_code == 200:
-                image_data = response.content
-                pixmap = QPixmap()
-                
-                # --- INÍCIO DO DIAGNÓSTICO ---
-                # Tentamos carregar os dados e capturamos qualquer erro
-                load_successful = pixmap.loadFromData(image_data)
-                
-                if not load_successful:
-                    logging.error("Falha ao carregar a imagem a partir dos dados. Os dados podem estar corrompidos ou num formato não suportado.")
-                    self.artwork_label.setText("Inválida")
-                    return
-                # --- FIM DO DIAGNÓSTICO ---
-
-                self.artwork_label.setPixmap(pixmap.scaled(
-                    self.artwork_label.size(), 
-                    Qt.AspectRatioMode.KeepAspectRatio, 
-                    Qt.TransformationMode.SmoothTransformation
-                ))
-            else:
-                logging.warning(f"Falha ao baixar a imagem de preview de {full_url}. Status: {response.status_code}")
-                self.artwork_label.setText(f"Erro {response.status_code}")
-                return
-
-        except Exception as e:
-            # Captura e exibe o erro completo no terminal
-            logging.error(f"Ocorreu uma exceção ao carregar a imagem de preview: {e}", exc_info=True)
-            self.artwork_label.setText("Falha")
+    def set_preview(self, pixmap):
+        self.artwork_label.setPixmap(pixmap)
+
+    def set_preview_failed(self, text="Falha"):
+        self.artwork_label.setText(text)
 
     def is_approved(self):
         return self.approve_checkbox.isChecked()
 
 
 class MetadataReviewDialog(QDialog):
+    """
+    Lista as sugestões de metadados para o usuário aprovar ou trocar.
+
+    Os cards aparecem na hora com um placeholder; os previews são baixados num
+    pool pequeno de threads para o mesmo arquivo usado depois pela aplicação
+    das sugestões, e decodificados fora da thread da GUI pelo ImageLoader.
+    """
+    # (card, caminho do preview, sucesso), emitido das threads de download
+    _preview_fetched = pyqtSignal(object, str, bool)
+
     def __init__(self, suggestions, igdb_api, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Rever Metadados Encontrados")
@@ -132,6 +139,10 @@ class MetadataReviewDialog(QDialog):
         self.suggestions = suggestions
         self.igdb_api = igdb_api
         self.suggestion_widgets = []
+        # Downloads dos previews: poucos por vez, cancelados quando o diálogo fecha
+        self._preview_executor = ThreadPoolExecutor(max_workers=PREVIEW_FETCH_WORKERS, thread_name_prefix="review-preview")
+        self._closed = threading.Event()
+        self._preview_fetched.connect(self._on_preview_fetched)
 
         main_layout = QVBoxLayout(self)
         title_label = QLabel("Encontrámos as seguintes sugestões. Desmarque ou altere as que não estiverem corretas.")
@@ -161,8 +172,10 @@ class MetadataReviewDialog(QDialog):
         for suggestion in self.suggestions:
             widget = MetadataSuggestionWidget(suggestion)
             widget.change_requested.connect(self.handle_change_request)
+            widget.preview_requested.connect(self._request_preview)
             self.suggestion_widgets.append(widget)
             self.list_layout.addWidget(widget)
+            widget.load_artwork_preview()
         
         self.list_layout.addStretch()
 
@@ -181,6 +194,45 @@ class MetadataReviewDialog(QDialog):
             if new_selection:
                 suggestion_widget.update_suggestion(new_selection)
 
+    def _request_preview(self, widget):
+        job = get_preview_job(widget.suggestion_data)
+        if job is None or self._closed.is_set(): return
+        url, path = job
+        widget.pending_preview_path = path
+        self._preview_executor.submit(self._fetch_preview, widget, url, path)
+
+    def _fetch_preview(self, widget, url, path):
+        """Roda numa thread do pool: baixa a capa (ou reaproveita a que já está em disco)."""
+        if self._closed.is_set(): return
+        result = get_artwork_fetcher().fetch(url, path)
+        if self._closed.is_set(): return
+        try:
+            self._preview_fetched.emit(widget, path, result["status"] in FETCH_OK_STATUSES)
+        except RuntimeError:
+            # O diálogo já foi destruído
+            pass
+
+    def _on_preview_fetched(self, widget, path, ok):
+        # O card pode ter trocado de sugestão enquanto o download acontecia
+        if sip.isdeleted(widget) or widget.pending_preview_path != path: return
+        if not ok:
+            widget.set_preview_failed()
+            return
+
+        def show_preview(pixmap):
+            if widget.pending_preview_path == path:
+                widget.set_preview(pixmap)
+
+        get_image_loader().load(widget, path, PREVIEW_PRESET, show_preview)
+
+    def done(self, result):
+        # Ao fechar (aplicar ou cancelar), descarta os downloads que ainda estão na fila.
+        # Os que já começaram terminam: ao aplicar, o ArtworkFetcher junta o download
+        # da mesma arte a eles (mesmo destino) em vez de gravar o arquivo duas vezes.
+        self._closed.set()
+        self._preview_executor.shutdown(wait=False, cancel_futures=True)
+        super().done(result)
+
     def get_approved_suggestions(self):
         approved = []
         for widget in self.suggestion_widgets:
@@ -13,6 +13,7 @@ from PyQt6.QtCore import Qt, QPoint, QSize
 from gui.edit_profile_dialog import EditProfileDialog
 from gui.profile_widgets import StatBox
 from gui.avatar_widget import AvatarWidget
+from gui.image_loader import get_image_loader
 
 
 class ShowcaseCardWidget(QFrame):
@@ -33,18 +34,10 @@ class ShowcaseCardWidget(QFrame):
         image_label.setStyleSheet("background-color: black;")
 
         image_path = self.game.get("header_path") or self.game.get("background") or self.game.get("image")
-        if image_path and os.path.exists(image_path):
-            pixmap = QPixmap(image_path)
-            
-            # MUDANÇA: De KeepAspectRatioByExpanding para KeepAspectRatio
-            # Isso garante que a imagem inteira seja visível (efeito letterbox)
-            scaled_pixmap = pixmap.scaled(
-                self.size(), 
-                Qt.AspectRatioMode.KeepAspectRatio, # <--- MUDANÇA AQUI
-                Qt.TransformationMode.SmoothTransformation
-            )
-            image_label.setPixmap(scaled_pixmap)
-            image_label.setAlignment(Qt.AlignmentFlag.AlignCenter) # Centraliza a imagem no label
+        # O preset "showcase" já vem com KeepAspectRatio no tamanho do card,
+        # garantindo que a imagem inteira seja visível (efeito letterbox)
+        image_label.setAlignment(Qt.AlignmentFlag.AlignCenter) # Centraliza a imagem no label
+        get_image_loader().load(self, image_path, "showcase", image_label.setPixmap)
 
         main_layout.addWidget(image_label)
 
@@ -182,10 +175,26 @@ class ProfileTab(QWidget):
         self.scroll_area.setGeometry(self.rect())
 
     def load_profile_data(self):
-        profile_data = self.profile_manager.get_data()
+        self.apply_profile_snapshot(self.fetch_profile_snapshot())
+
+    def fetch_profile_snapshot(self):
+        # Só acessa o banco, sem tocar em widgets: pode rodar fora da thread da GUI
+        all_games = self.game_manager.get_all_games(); profile_data = self.profile_manager.get_data()
+        showcased_favorite_id = profile_data.get("showcased_favorite_id")
+        recent_games = self.game_manager.get_recent_games()
+        return {
+            "profile": profile_data,
+            "all_games": all_games,
+            "showcased_favorite": self.game_manager.get_game_by_id(showcased_favorite_id) if showcased_favorite_id else None,
+            "last_played": recent_games[0] if recent_games else None,
+            "most_common_genre": self.game_manager.get_most_common_genre(all_games),
+        }
+
+    def apply_profile_snapshot(self, snapshot):
+        profile_data = snapshot["profile"]
         bg_path = profile_data.get("background_path")
-        if bg_path and os.path.exists(bg_path): self.background_label.setPixmap(QPixmap(bg_path))
-        else: self.background_label.clear()
+        self.background_label.clear()
+        if bg_path and os.path.exists(bg_path): get_image_loader().load(self, bg_path, "page_background", self.background_label.setPixmap)
 
         self.username_label.setText(profile_data.get("username", "Player1"))
         self.bio_label.setText(profile_data.get("bio", "Adicione sua bio aqui..."))
@@ -204,7 +213,7 @@ class ProfileTab(QWidget):
                 self.flag_label.setVisible(True)
 
         self.avatar_widget.set_image(profile_data.get("avatar_path"))
-        self._populate_stats_and_showcase()
+        self._populate_stats_and_showcase(snapshot)
     
     def _clear_layout(self, layout):
         if layout is not None:
@@ -212,12 +221,11 @@ class ProfileTab(QWidget):
                 item = layout.takeAt(0)
                 widget = item.widget()
                 if widget is not None: widget.deleteLater()
-    def _populate_stats_and_showcase(self):
+    def _populate_stats_and_showcase(self, snapshot):
         self._clear_layout(self.showcase_layout); self._clear_layout(self.stats_layout)
-        all_games = self.game_manager.get_all_games(); profile_data = self.profile_manager.get_data()
+        all_games = snapshot["all_games"]
         most_played = max(all_games, key=lambda g: g.get("playtime_local", 0)) if all_games else None
-        showcased_favorite_id = profile_data.get("showcased_favorite_id"); showcased_favorite = self.game_manager.get_game_by_id(showcased_favorite_id) if showcased_favorite_id else None
-        recent_games = self.game_manager.get_recent_games(); last_played = recent_games[0] if recent_games else None
+        showcased_favorite = snapshot["showcased_favorite"]; last_played = snapshot["last_played"]
         self.showcase_layout.addStretch(1)
         if showcased_favorite: self.showcase_layout.addWidget(ShowcaseCardWidget(showcased_favorite, "Jogo Favorito"))
         if most_played and most_played.get("playtime_local", 0) > 0: self.showcase_layout.addWidget(ShowcaseCardWidget(most_played, "Mais Jogado"))
@@ -225,7 +233,7 @@ class ProfileTab(QWidget):
         self.showcase_layout.addStretch(1)
         playtime_local = sum(g.get("playtime_local", 0) for g in all_games); total_hours = playtime_local / 3600
         self.stats_layout.addStretch(1)
-        self.stats_layout.addWidget(StatBox("HORAS TOTAIS", f"~{int(total_hours)}")); self.stats_layout.addWidget(StatBox("JOGOS NA BIBLIOTECA", str(len(all_games)))); self.stats_layout.addWidget(StatBox("GÊNERO FAVORITO", self.game_manager.get_most_common_genre())); self.stats_layout.addStretch(1)
+        self.stats_layout.addWidget(StatBox("HORAS TOTAIS", f"~{int(total_hours)}")); self.stats_layout.addWidget(StatBox("JOGOS NA BIBLIOTECA", str(len(all_games)))); self.stats_layout.addWidget(StatBox("GÊNERO FAVORITO", snapshot["most_common_genre"])); self.stats_layout.addStretch(1)
     def edit_profile(self):
         dialog = EditProfileDialog(self.profile_manager, self.game_manager, self)
         if dialog.exec(): self.load_profile_data()
\ No newline at end of file
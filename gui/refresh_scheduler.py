@@ -0,0 +1,128 @@
+# gui/refresh_scheduler.py
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+# Intervalo de espera após a última tecla digitada antes de consultar o banco
+SEARCH_DEBOUNCE_MS = 250
+
+
+class LibraryRefreshScheduler(QObject):
+    """
+    Coordena a atualização das visualizações da janela principal.
+
+    Cada visualização é registrada com duas funções:
+      - make_query(): roda na thread da GUI, lê o estado atual (busca, filtros...)
+        e devolve uma função sem argumentos que fará a consulta ao banco;
+      - apply(result, restore_scroll): roda na thread da GUI e redesenha a visualização.
+
+    Pedidos em rajada são agrupados (debounce), as consultas rodam em uma thread
+    de trabalho, resultados superados por uma consulta mais nova são descartados
+    e só as visualizações visíveis são redesenhadas; as demais ficam marcadas
+    como "sujas" e são atualizadas quando forem exibidas.
+    """
+    _result_ready = pyqtSignal(str, int, object)
+
+    def __init__(self, main_window):
+        super().__init__(main_window)
+        self.main_window = main_window
+        # Uma única thread: as consultas são curtas e rodar em série evita
+        # que uma consulta antiga termine depois de uma nova.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="library-refresh")
+        self._views = {}
+        self._dirty = set()
+        self._restore_scroll = set()
+        self._generation = {}
+        self._pending = {}
+
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self._debounce_timer.timeout.connect(self.flush)
+
+        self._result_ready.connect(self._on_result_ready)
+
+    def register_view(self, name, widget, make_query, apply):
+        self._views[name] = (widget, make_query, apply)
+        self._generation[name] = 0
+        self._dirty.add(name)
+
+    def request(self, views=None, debounce=False, restore_scroll=False):
+        """Marca as visualizações como sujas e agenda a atualização."""
+        names = list(views) if views else list(self._views)
+        self._dirty.update(names)
+        if restore_scroll:
+            self._restore_scroll.update(names)
+        if debounce:
+            # Reinicia o timer: só consulta quando o usuário parar de digitar
+            self._debounce_timer.start()
+        else:
+            self._debounce_timer.stop()
+            self.flush()
+
+    def flush(self):
+        """Dispara as consultas das visualizações sujas que estão visíveis."""
+        for name in list(self._dirty):
+            widget = self._views[name][0]
+            if self._is_visible(widget):
+                self._start_query(name)
+
+    def view_shown(self, widget):
+        """Atualiza a visualização recém-exibida, se ela for uma das registradas e estiver suja."""
+        for name, (view_widget, _, _) in self._views.items():
+            # Uma visualização limpa já mostra os dados atuais: trocar de aba não consulta o banco
+            if view_widget is widget and name in self._dirty:
+                self._start_query(name)
+
+    def shutdown(self):
+        self._debounce_timer.stop()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _is_visible(self, widget):
+        # O QStackedWidget esconde as páginas que não estão em primeiro plano
+        return widget.isVisibleTo(self.main_window)
+
+    def _start_query(self, name):
+        _, make_query, _ = self._views[name]
+        self._dirty.discard(name)
+        self._generation[name] += 1
+        generation = self._generation[name]
+
+        # Uma consulta ainda na fila já foi superada por esta
+        previous = self._pending.pop(name, None)
+        if previous is not None:
+            previous.cancel()
+
+        try:
+            query = make_query()
+        except Exception as e:
+            logging.error(f"Erro ao preparar a atualização de '{name}': {e}", exc_info=True)
+            return
+
+        future = self._executor.submit(query)
+        self._pending[name] = future
+        future.add_done_callback(lambda f, n=name, g=generation: self._on_query_done(n, g, f))
+
+    def _on_query_done(self, name, generation, future):
+        # Roda na thread de trabalho; o sinal entrega o resultado à thread da GUI
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logging.error(f"Erro ao consultar dados para '{name}': {error}", exc_info=error)
+            return
+        self._result_ready.emit(name, generation, future.result())
+
+    def _on_result_ready(self, name, generation, result):
+        if generation != self._generation.get(name):
+            logging.debug(f"Resultado obsoleto de '{name}' descartado (geração {generation}).")
+            return
+        self._pending.pop(name, None)
+        if name in self._dirty:
+            # Ficou suja enquanto a consulta rodava; a próxima atualização cuidará dela
+            return
+        _, _, apply = self._views[name]
+        restore_scroll = name in self._restore_scroll
+        self._restore_scroll.discard(name)
+        apply(result, restore_scroll)
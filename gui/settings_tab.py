@@ -2,10 +2,12 @@
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QLineEdit, QFormLayout, QMessageBox, QFrame
+    QLineEdit, QFormLayout, QMessageBox, QFrame, QSpinBox
 )
 from PyQt6.QtCore import Qt
 
+from gui.thumbnail_cache import get_thumbnail_cache, THUMBNAIL_DISK_BUDGET_SETTING
+
 class SettingsTab(QWidget):
     def __init__(self, profile_manager, main_window_ref, parent=None):
         super().__init__(parent)
@@ -66,7 +68,24 @@ class SettingsTab(QWidget):
         save_btn.clicked.connect(self.save_settings)
         save_button_layout.addWidget(save_btn)
 
+        # --- Seção de Cache de Imagens ---
+        cache_group_frame = QFrame()
+        cache_group_frame.setObjectName("SettingsGroupFrame")
+        cache_group_layout = QHBoxLayout(cache_group_frame)
+        cache_group_layout.addWidget(QLabel("<b>Cache de miniaturas:</b>"))
+        self.thumbnail_budget_input = QSpinBox()
+        self.thumbnail_budget_input.setRange(16, 8192)
+        self.thumbnail_budget_input.setSingleStep(64)
+        self.thumbnail_budget_input.setSuffix(" MB")
+        self.thumbnail_budget_input.editingFinished.connect(self.save_thumbnail_budget)
+        clear_cache_btn = QPushButton("Limpar Cache")
+        clear_cache_btn.clicked.connect(self.clear_thumbnail_cache)
+        cache_group_layout.addWidget(self.thumbnail_budget_input)
+        cache_group_layout.addStretch()
+        cache_group_layout.addWidget(clear_cache_btn)
+
         main_layout.addWidget(steam_group_frame)
+        main_layout.addWidget(cache_group_frame)
         main_layout.addStretch() # Empurra tudo para cima
         main_layout.addLayout(save_button_layout)
 
@@ -88,6 +107,19 @@ class SettingsTab(QWidget):
             self.link_steam_btn.setText("Vincular Conta")
             self.steam_fields_container.show()
 
+        self.thumbnail_budget_input.setValue(int(get_thumbnail_cache().disk_budget_bytes / (1024 * 1024)))
+
+    def save_thumbnail_budget(self):
+        """Salva o limite do cache de miniaturas e já o aplica, removendo o excesso."""
+        budget_mb = self.thumbnail_budget_input.value()
+        self.main_window_ref.settings_manager.save_setting(THUMBNAIL_DISK_BUDGET_SETTING, str(budget_mb))
+        get_thumbnail_cache().set_disk_budget(budget_mb)
+
+    def clear_thumbnail_cache(self):
+        get_thumbnail_cache().clear()
+        self.main_window_ref.refresh_views()
+        self.main_window_ref.show_message_box("Cache Limpo", "As miniaturas serão geradas novamente quando forem exibidas.", "info")
+
     def toggle_steam_fields(self):
         """Mostra ou esconde os campos de entrada da Steam."""
         if self.steam_fields_container.isVisible():
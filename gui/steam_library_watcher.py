@@ -0,0 +1,134 @@
+# gui/steam_library_watcher.py
+
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, QTimer, QFileSystemWatcher, pyqtSignal
+
+# A Steam regrava o manifesto várias vezes durante uma instalação; espera as
+# alterações pararem antes de reler a biblioteca.
+WATCH_DEBOUNCE_MS = 2000
+
+
+def _is_manifest(path):
+    name = os.path.basename(path)
+    return name.startswith('appmanifest_') and name.endswith('.acf')
+
+
+class SteamLibraryWatcher(QObject):
+    """
+    Monitora as pastas 'steamapps' das bibliotecas da Steam.
+
+    Quando um appmanifest_*.acf é criado, alterado ou apagado, a biblioteca
+    afetada passa pela varredura incremental do SteamScanner em uma thread de
+    trabalho, e games_changed é emitido (na thread da GUI) com os jogos que
+    mudaram, já relidos do banco, para que só os cards deles sejam redesenhados.
+    O sinal pode ser emitido de outras threads; a conexão entrega na thread da GUI.
+    """
+    games_changed = pyqtSignal(list)
+    _scan_finished = pyqtSignal(object, object)
+
+    def __init__(self, game_manager, steam_scanner, parent=None):
+        super().__init__(parent)
+        self.game_manager = game_manager
+        self.steam_scanner = steam_scanner
+        self.library_paths = []
+        self._libraries_by_normpath = {}
+        self._pending_libraries = set()
+        self._scan_running = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="steam-watch")
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_path_changed)
+        self._watcher.fileChanged.connect(self._on_path_changed)
+
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(WATCH_DEBOUNCE_MS)
+        self._debounce_timer.timeout.connect(self._flush)
+
+        self._scan_finished.connect(self._on_scan_finished)
+
+    def start(self):
+        """Começa a monitorar as bibliotecas e agenda uma varredura incremental inicial."""
+        # Os caminhos são usados como vieram do scanner: é com eles que o estado da varredura é salvo
+        self.library_paths = self.steam_scanner._find_steam_library_paths()
+        self._libraries_by_normpath = {os.path.normpath(path): path for path in self.library_paths}
+        if not self.library_paths:
+            logging.info("Nenhuma biblioteca da Steam para monitorar.")
+            return
+        failed = self._watcher.addPaths(self.library_paths)
+        for path in failed:
+            logging.warning(f"Não foi possível monitorar a biblioteca da Steam em: {path}")
+        for library_path in self.library_paths:
+            self._watch_manifests(library_path)
+        logging.info(f"Monitorando {len(self.library_paths)} biblioteca(s) da Steam.")
+        # Pega o que mudou enquanto o launcher estava fechado
+        self._pending_libraries.update(self.library_paths)
+        self._debounce_timer.start()
+
+    def shutdown(self):
+        self._debounce_timer.stop()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _watch_manifests(self, library_path):
+        """Monitora também cada manifesto: alterações no conteúdo não avisam a pasta."""
+        try:
+            with os.scandir(library_path) as entries:
+                manifests = [entry.path for entry in entries if _is_manifest(entry.name)]
+        except OSError as e:
+            logging.warning(f"Não foi possível listar a biblioteca da Steam em '{library_path}': {e}")
+            return
+        watched = set(self._watcher.files())
+        new_paths = [path for path in manifests if path not in watched]
+        if new_paths:
+            self._watcher.addPaths(new_paths)
+
+    def _on_path_changed(self, path):
+        path = os.path.normpath(path)
+        if _is_manifest(path):
+            path = os.path.dirname(path)
+        library_path = self._libraries_by_normpath.get(path)
+        if library_path is None: return
+        self._pending_libraries.add(library_path)
+        self._debounce_timer.start()
+
+    def _flush(self):
+        # Uma varredura por vez; o que chegar nesse meio tempo espera a próxima
+        if self._scan_running or not self._pending_libraries: return
+        libraries = sorted(self._pending_libraries)
+        self._pending_libraries.clear()
+        self._scan_running = True
+        self._executor.submit(self._scan, libraries)
+
+    def _scan(self, libraries):
+        """Roda na thread de trabalho."""
+        games = []
+        changed_app_ids = set()
+        scan_done = threading.Event()
+
+        def on_artwork_ready():
+            # Roda na fila de artes: os cards dos jogos novos são atualizados de novo, já com a capa
+            scan_done.wait()
+            reloaded = self.game_manager.get_steam_games_by_app_ids(changed_app_ids)
+            if reloaded: self.games_changed.emit(reloaded)
+
+        try:
+            changed_app_ids.update(self.steam_scanner.sync_steam_games(library_paths=libraries, on_artwork_ready=on_artwork_ready))
+            games = self.game_manager.get_steam_games_by_app_ids(changed_app_ids)
+        except Exception as e:
+            logging.error(f"Erro ao atualizar as bibliotecas da Steam monitoradas: {e}", exc_info=True)
+        finally:
+            scan_done.set()
+        self._scan_finished.emit(libraries, games)
+
+    def _on_scan_finished(self, libraries, games):
+        self._scan_running = False
+        for library_path in libraries:
+            self._watch_manifests(library_path)
+        if games:
+            logging.info(f"Bibliotecas da Steam: {len(games)} jogo(s) atualizado(s).")
+            self.games_changed.emit(games)
+        if self._pending_libraries:
+            self._debounce_timer.start()
@@ -0,0 +1,305 @@
+# gui/thumbnail_cache.py
+
+import os
+import time
+import hashlib
+import logging
+import threading
+from PyQt6.QtGui import QImage, QImageReader, QPainter, QPixmap, QPixmapCache, QColor
+from PyQt6.QtCore import Qt, QSize
+
+THUMBNAIL_CACHE_DIR = os.path.join("cache", "thumbnails")
+
+# Chaves na tabela 'settings' (valores em MB)
+THUMBNAIL_DISK_BUDGET_SETTING = "thumbnail_cache_mb"
+THUMBNAIL_MEMORY_BUDGET_SETTING = "thumbnail_memory_cache_mb"
+DEFAULT_DISK_BUDGET_MB = 256
+DEFAULT_MEMORY_BUDGET_MB = 64
+
+# Ao estourar o orçamento, apaga até sobrar esta fração dele (evita limpar a cada gravação)
+EVICTION_TARGET_RATIO = 0.9
+
+# Por quanto tempo a data/tamanho de uma arte original é reaproveitada sem novo os.stat:
+# cada redesenho da lista consulta a chave, e um stat por pintura pesa em discos lentos
+FINGERPRINT_TTL_SECONDS = 1.0
+
+# Derivados gerados a partir das artes originais: nome -> (tamanho alvo, modo de ajuste)
+#   cover: capa vertical recortada; arte horizontal centralizada sobre fundo escuro
+#   crop:  preenche o tamanho e recorta o excesso
+#   width: ajusta à largura (altura proporcional)
+#   fit:   cabe inteira no tamanho, sem ampliar
+THUMBNAIL_PRESETS = {
+    "card": (QSize(210, 315), "cover"),
+    "list": (QSize(160, 75), "crop"),
+    "showcase": (QSize(300, 220), "fit"),
+    "avatar": (QSize(150, 150), "crop"),
+    "page_cover": (QSize(320, 0), "width"),
+    "page_background": (QSize(1920, 1080), "fit"),
+    "review": (QSize(60, 90), "cover"),
+}
+
+COVER_BACKGROUND_COLOR = QColor("#333")
+
+# Mesma força do QGraphicsColorizeEffect (cinza, 0.8) usado antes nos widgets
+UNINSTALLED_GREY_STRENGTH = 0.8
+
+
+def apply_uninstalled_effect(image):
+    """Dessatura a imagem como o QGraphicsColorizeEffect dos jogos não instalados."""
+    grey = image.convertToFormat(QImage.Format.Format_Grayscale8).convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+    tinted = image.convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+    painter = QPainter(tinted)
+    painter.setOpacity(UNINSTALLED_GREY_STRENGTH)
+    painter.drawImage(0, 0, grey)
+    painter.end()
+    return tinted
+
+
+class ThumbnailCache:
+    """
+    Gera e guarda versões reduzidas das artes dos jogos.
+
+    Cada derivado é identificado pelo caminho da arte original, sua data de
+    modificação e tamanho em bytes, e pelo preset pedido; se a arte mudar, a
+    chave muda e o derivado antigo acaba removido pela política de LRU.
+    Os derivados ficam em disco (JPEG, ou PNG quando há transparência) e,
+    já convertidos em QPixmap, no QPixmapCache.
+
+    get_image() pode ser chamado de qualquer thread; get_pixmap() só da thread da GUI.
+    """
+    def __init__(self, cache_dir=THUMBNAIL_CACHE_DIR, disk_budget_mb=DEFAULT_DISK_BUDGET_MB, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB):
+        self.cache_dir = cache_dir
+        self.disk_budget_bytes = int(disk_budget_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._disk_usage = None
+        self._fingerprints = {}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        QPixmapCache.setCacheLimit(int(memory_budget_mb * 1024))
+
+    def cache_key(self, path, preset):
+        """Chave do derivado, ou None se a arte original não existir."""
+        if not path or preset not in THUMBNAIL_PRESETS: return None
+        fingerprint = self._fingerprint(path)
+        if fingerprint is None: return None
+        size, _ = THUMBNAIL_PRESETS[preset]
+        raw_key = f"{fingerprint}|{preset}|{size.width()}x{size.height()}"
+        return hashlib.sha1(raw_key.encode("utf-8")).hexdigest()
+
+    def _fingerprint(self, path):
+        """Caminho, data de modificação e tamanho da arte original (ou None se ela não existir), com cache curto."""
+        now = time.monotonic()
+        cached = self._fingerprints.get(path)
+        if cached is not None and now - cached[0] < FINGERPRINT_TTL_SECONDS:
+            return cached[1]
+        try:
+            stat = os.stat(path)
+            fingerprint = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}"
+        except OSError:
+            fingerprint = None
+        self._fingerprints[path] = (now, fingerprint)
+        return fingerprint
+
+    def get_pixmap(self, path, preset, grey=False):
+        key = self.cache_key(path, preset)
+        if key is None: return None
+        memory_key = f"thumb:{key}:{int(grey)}"
+        pixmap = QPixmapCache.find(memory_key)
+        if pixmap is None:
+            image = self._get_image_for_key(key, path, preset, grey)
+            if image is None: return None
+            pixmap = QPixmap.fromImage(image)
+            QPixmapCache.insert(memory_key, pixmap)
+        return pixmap
+
+    def find_pixmap(self, path, preset, grey=False):
+        """Só consulta a camada em memória; não toca no disco nem decodifica nada."""
+        key = self.cache_key(path, preset)
+        return QPixmapCache.find(f"thumb:{key}:{int(grey)}") if key else None
+
+    def insert_pixmap(self, path, preset, grey, image):
+        """Guarda na camada em memória uma imagem produzida por get_image() em outra thread."""
+        key = self.cache_key(path, preset)
+        if key is None or image is None: return None
+        pixmap = QPixmap.fromImage(image)
+        QPixmapCache.insert(f"thumb:{key}:{int(grey)}", pixmap)
+        return pixmap
+
+    def get_image(self, path, preset, grey=False):
+        key = self.cache_key(path, preset)
+        if key is None: return None
+        return self._get_image_for_key(key, path, preset, grey)
+
+    def _get_image_for_key(self, key, path, preset, grey):
+        image = self._load_from_disk(key)
+        if image is None:
+            image = self._render(path, preset)
+            if image is None: return None
+            self._save_to_disk(key, image)
+        return apply_uninstalled_effect(image) if grey else image
+
+    def _disk_path(self, key, extension):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.{extension}")
+
+    def _load_from_disk(self, key):
+        for extension in ("jpg", "png"):
+            file_path = self._disk_path(key, extension)
+            if os.path.exists(file_path):
+                image = QImage(file_path)
+                if image.isNull():
+                    logging.warning(f"Miniatura corrompida descartada: {file_path}")
+                    self._discard_file(file_path)
+                    return None
+                try:
+                    # Atualiza a data de modificação: é ela que define a ordem do LRU
+                    os.utime(file_path)
+                except OSError:
+                    pass
+                return image
+        return None
+
+    def _render(self, path, preset):
+        target, mode = THUMBNAIL_PRESETS[preset]
+        reader = QImageReader(path)
+        reader.setAutoTransform(True)
+        source_size = reader.size()
+        if source_size.isValid():
+            # Decodifica já reduzido quando o formato permite (ex.: JPEG), sem passar do necessário
+            decode_size = self._decode_size(source_size, target, mode)
+            if decode_size is not None: reader.setScaledSize(decode_size)
+        source = reader.read()
+        if source.isNull():
+            logging.warning(f"Não foi possível ler a imagem '{path}': {reader.errorString()}")
+            return None
+
+        if mode == "width":
+            if source.width() == target.width(): return source
+            return source.scaledToWidth(target.width(), Qt.TransformationMode.SmoothTransformation)
+        if mode == "fit":
+            if source.width() <= target.width() and source.height() <= target.height(): return source
+            return source.scaled(target, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        if mode == "crop" or (mode == "cover" and source.height() > source.width()):
+            scaled = source.scaled(target, Qt.AspectRatioMode.KeepAspectRatioByExpanding, Qt.TransformationMode.SmoothTransformation)
+            x = (scaled.width() - target.width()) // 2; y = (scaled.height() - target.height()) // 2
+            return scaled.copy(x, y, target.width(), target.height())
+        # cover com arte horizontal: centraliza sobre o fundo, como o card fazia
+        canvas = QImage(target, QImage.Format.Format_RGB32); canvas.fill(COVER_BACKGROUND_COLOR)
+        scaled_art = source.scaled(target, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        painter = QPainter(canvas)
+        painter.drawImage((target.width() - scaled_art.width()) // 2, (target.height() - scaled_art.height()) // 2, scaled_art)
+        painter.end()
+        return canvas
+
+    def _decode_size(self, source_size, target, mode):
+        width, height = source_size.width(), source_size.height()
+        if mode == "width":
+            factor = target.width() / width
+        elif mode in ("crop", "cover"):
+            factor = max(target.width() / width, target.height() / height)
+        else:
+            factor = min(target.width() / width, target.height() / height)
+        # Mantém o dobro da resolução final para o SmoothTransformation ter material
+        factor *= 2
+        if factor >= 1: return None
+        return QSize(max(1, round(width * factor)), max(1, round(height * factor)))
+
+    def _save_to_disk(self, key, image):
+        extension = "png" if image.hasAlphaChannel() else "jpg"
+        file_path = self._disk_path(key, extension)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        # Grava num arquivo temporário e renomeia: outra thread nunca lê um arquivo pela metade
+        temp_path = f"{file_path}.{threading.get_ident()}.tmp"
+        if not image.save(temp_path, extension.upper(), 90 if extension == "jpg" else -1):
+            logging.warning(f"Não foi possível gravar a miniatura em '{file_path}'.")
+            self._remove_file(temp_path)
+            return
+        os.replace(temp_path, file_path)
+        self._account(os.path.getsize(file_path))
+
+    def _account(self, added_bytes):
+        with self._lock:
+            if self._disk_usage is None:
+                self._disk_usage = sum(size for _, _, size in self._scan_files())
+            else:
+                self._disk_usage += added_bytes
+            if self._disk_usage > self.disk_budget_bytes:
+                self._evict_locked()
+
+    def _scan_files(self):
+        files = []
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                if name.endswith(".tmp"): continue
+                file_path = os.path.join(root, name)
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, file_path, stat.st_size))
+        return files
+
+    def _evict_locked(self):
+        files = sorted(self._scan_files())
+        usage = sum(size for _, _, size in files)
+        target = self.disk_budget_bytes * EVICTION_TARGET_RATIO
+        removed = 0
+        for _, file_path, size in files:
+            if usage <= target: break
+            if self._remove_file(file_path):
+                usage -= size; removed += 1
+        self._disk_usage = usage
+        logging.info(f"Cache de miniaturas: {removed} arquivo(s) removido(s), {usage / (1024 * 1024):.1f} MB em uso.")
+
+    def set_disk_budget(self, disk_budget_mb):
+        with self._lock:
+            self.disk_budget_bytes = int(disk_budget_mb * 1024 * 1024)
+            if self._disk_usage is not None and self._disk_usage > self.disk_budget_bytes:
+                self._evict_locked()
+
+    def clear(self):
+        with self._lock:
+            for _, file_path, _ in self._scan_files():
+                self._remove_file(file_path)
+            self._disk_usage = 0
+        self._fingerprints.clear()
+        QPixmapCache.clear()
+
+    def _discard_file(self, file_path):
+        """Apaga um derivado fora da limpeza do LRU, descontando seu tamanho do uso em disco."""
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            return
+        if self._remove_file(file_path):
+            with self._lock:
+                if self._disk_usage is not None:
+                    self._disk_usage = max(0, self._disk_usage - size)
+
+    def _remove_file(self, file_path):
+        try:
+            os.remove(file_path)
+            return True
+        except OSError:
+            return False
+
+
+_thumbnail_cache = None
+
+def get_thumbnail_cache():
+    """Instância compartilhada do cache, criada no primeiro uso com os limites salvos nas configurações."""
+    global _thumbnail_cache
+    if _thumbnail_cache is None:
+        from core.settings_manager import SettingsManager
+        settings = SettingsManager()
+        _thumbnail_cache = ThumbnailCache(
+            disk_budget_mb=_read_budget(settings, THUMBNAIL_DISK_BUDGET_SETTING, DEFAULT_DISK_BUDGET_MB),
+            memory_budget_mb=_read_budget(settings, THUMBNAIL_MEMORY_BUDGET_SETTING, DEFAULT_MEMORY_BUDGET_MB),
+        )
+    return _thumbnail_cache
+
+def _read_budget(settings, key, default):
+    value = settings.get_setting(key)
+    try:
+        return max(1, int(value)) if value is not None else default
+    except (TypeError, ValueError):
+        logging.warning(f"Valor inválido para '{key}': {value!r}. Usando {default} MB.")
+        return default
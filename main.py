@@ -7,7 +7,7 @@ from PyQt6.QtWidgets import QApplication
 from PyQt6.QtCore import QFileSystemWatcher
 
 from gui.main_window import MainWindow
-from core.database import initialize_database, update_database_schema
+from core.database import initialize_database, update_database_schema, close_db_connection
 from core.folder_scanner import SteamScanner
 from core.game_manager import GameManager
 
@@ -52,6 +52,7 @@ def main():
     logging.info("Iniciando a aplicação Game Launcher...")
 
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect(close_db_connection)
     
     load_stylesheet(app)
 
@@ -0,0 +1,57 @@
+# tests/support.py
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+from core import database
+
+
+@contextmanager
+def temporary_database():
+    """
+    Aponta o core.database para um launcher.db novo num diretório temporário,
+    já com o schema completo, e devolve a conexão da thread atual.
+    """
+    previous_file = database.DATABASE_FILE
+    with tempfile.TemporaryDirectory() as directory:
+        database.close_db_connection()
+        database.DATABASE_FILE = os.path.join(directory, "launcher.db")
+        try:
+            database.initialize_database()
+            yield database.get_db_connection()
+        finally:
+            database.close_db_connection()
+            database.DATABASE_FILE = previous_file
+
+
+def seed_library(conn, game_count, executables_per_game=2, tags_per_game=2):
+    """Cria 'game_count' jogos locais com executáveis e tags; um a cada três é favorito e já foi jogado."""
+    with database.transaction():
+        conn.executemany(
+            "INSERT INTO games (id, name, source, status, favorite, playtime_local, last_played_timestamp) VALUES (?, ?, 'local', ?, ?, ?, ?)",
+            [(game_id, f"Jogo {game_id:05d}", "INSTALLED" if game_id % 2 else "UNINSTALLED",
+              int(game_id % 3 == 0), game_id * 60, 1_600_000_000 + game_id if game_id % 3 == 0 else None)
+             for game_id in range(1, game_count + 1)]
+        )
+        conn.executemany(
+            "INSERT INTO executables (game_id, path, display_name) VALUES (?, ?, ?)",
+            [(game_id, f"C:/Jogos/{game_id}/bin{index}.exe", f"bin{index}")
+             for game_id in range(1, game_count + 1) for index in range(executables_per_game)]
+        )
+        conn.executemany("INSERT INTO tags (id, name) VALUES (?, ?)", [(index + 1, f"Tag {index}") for index in range(tags_per_game)])
+        conn.executemany(
+            "INSERT INTO game_tags (game_id, tag_id) VALUES (?, ?)",
+            [(game_id, index + 1) for game_id in range(1, game_count + 1) for index in range(tags_per_game)]
+        )
+
+
+@contextmanager
+def capture_statements(conn):
+    """Guarda numa lista os comandos SQL executados na conexão (sem os internos do FTS, que vêm com '--')."""
+    statements = []
+    conn.set_trace_callback(lambda sql: None if sql.lstrip().startswith("--") else statements.append(sql))
+    try:
+        yield statements
+    finally:
+        conn.set_trace_callback(None)
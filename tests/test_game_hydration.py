@@ -0,0 +1,52 @@
+# tests/test_game_hydration.py
+
+import unittest
+
+from core.game_manager import GameManager
+from tests.support import temporary_database, seed_library, capture_statements
+
+# Tamanhos de biblioteca comparados: o número de consultas não pode crescer com eles
+LIBRARY_SIZES = (10, 200, 1000)
+
+
+def _list_calls(manager):
+    """Métodos que devolvem listas de jogos, cada um com a chamada usada no teste."""
+    return {
+        "get_all_games": lambda: manager.get_all_games(),
+        "get_filtered_games": lambda: manager.get_filtered_games("", sort_by="Mais Jogado"),
+        "get_filtered_games (busca)": lambda: manager.get_filtered_games("jogo", tag="Tag 0", status_filter="Instalados"),
+        "get_favorite_games": lambda: manager.get_favorite_games(),
+        "get_recent_games": lambda: manager.get_recent_games(),
+    }
+
+
+def _count_selects(conn, call):
+    with capture_statements(conn) as statements:
+        games = call()
+    return sum(1 for sql in statements if sql.lstrip().upper().startswith("SELECT")), games
+
+
+class GameHydrationQueryCountTest(unittest.TestCase):
+    """As listas de jogos são montadas com um número fixo de consultas, sem o N+1 de executáveis e tags."""
+
+    def test_query_count_does_not_grow_with_library(self):
+        counts = {}
+        for size in LIBRARY_SIZES:
+            with temporary_database() as conn:
+                seed_library(conn, size)
+                manager = GameManager()
+                for name, call in _list_calls(manager).items():
+                    count, games = _count_selects(conn, call)
+                    counts.setdefault(name, {})[size] = count
+                    self.assertTrue(games, f"{name} não devolveu jogos com {size} jogos")
+                    self.assertTrue(all(len(game['paths']) == 2 and len(game['tags']) == 2 for game in games),
+                                    f"{name} devolveu jogos sem executáveis ou tags")
+
+        for name, by_size in counts.items():
+            with self.subTest(method=name):
+                self.assertEqual(len(set(by_size.values())), 1, f"{name}: consultas por tamanho de biblioteca {by_size}")
+                self.assertLessEqual(max(by_size.values()), 6, f"{name}: consultas demais {by_size}")
+
+
+if __name__ == "__main__":
+    unittest.main()
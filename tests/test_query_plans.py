@@ -0,0 +1,79 @@
+# tests/test_query_plans.py
+
+import re
+import unittest
+from unittest import mock
+
+import core.game_manager as game_manager_module
+from core.game_manager import GameManager
+from tests.support import temporary_database, seed_library, capture_statements
+
+# Linhas do EXPLAIN QUERY PLAN que são buscas ou percursos por índice, não varreduras da tabela
+INDEXED_SCAN_RE = re.compile(r"USING (?:COVERING )?INDEX|USING INTEGER PRIMARY KEY|VIRTUAL TABLE|CONSTANT ROW")
+# Tabelas que podem ser lidas inteiras de propósito
+ALLOWED_FULL_SCANS = {
+    "sqlite_master",        # descoberta das tabelas FTS disponíveis (uma vez por GameManager)
+    "steam_owned_staging",  # tabela temporária com a lista da conta, lida inteira na reconciliação
+}
+SKIPPED_COMMANDS = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE", "PRAGMA", "CREATE", "DROP")
+
+
+def _exercise_game_manager(manager):
+    """Chama cada método do GameManager que fala com o banco, com todas as variações de filtro e ordem."""
+    game_id = manager.get_all_games()[0]['id']
+    manager.get_game_by_id(game_id)
+    manager.get_executables_for_game(game_id)
+    manager.toggle_favorite(game_id)
+    manager.add_playtime(game_id, 30)
+    manager.update_last_played(game_id)
+    game = manager.get_game_by_id(game_id)
+    manager.update_game(game, dict(game, tags=["Tag 0", "Nova"], genres=["RPG"]))
+    for sort_by in ("Nome (A-Z)", "Mais Jogado", "Jogado Recentemente"):
+        for status_filter in ("Todos", "Instalados"):
+            manager.get_filtered_games("", sort_by=sort_by, status_filter=status_filter)
+            manager.get_filtered_games("jogo", tag="Tag 1", sort_by=sort_by, status_filter=status_filter)
+            manager.get_filtered_games("ogo 000", sort_by=sort_by, status_filter=status_filter)
+            manager.get_filtered_games("jgoo", sort_by=sort_by, status_filter=status_filter)
+    manager.get_favorite_games()
+    manager.get_favorite_games("Instalados", "jogo")
+    manager.get_recent_games()
+    manager.get_all_unique_tags()
+    manager.get_all_executable_paths()
+    manager.get_most_common_genre()
+    manager.add_game("Jogo Novo", [{'path': "C:/Novo/novo.exe", 'display_name': "novo"}])
+    manager.add_or_update_steam_game("10", "Steam 10", "C:/Steam/10", "INSTALLED")
+    manager.get_steam_games_by_app_ids(["10", "11"])
+    manager.sync_installed_steam_games([("11", "Steam 11", "C:/Steam/11")], {"10"})
+    manager.update_uninstalled_steam_games(["11"])
+    manager.update_game_artwork(game_id, "10", image_path="capa.jpg")
+    manager.sync_full_steam_library([{'appid': 10, 'name': "Steam 10"}, {'appid': 12, 'name': "Steam 12", 'playtime_forever': 5}])
+    manager.delete_game(game_id)
+
+
+class GameManagerQueryPlanTest(unittest.TestCase):
+    """Nenhuma consulta do GameManager pode varrer uma tabela inteira sem índice."""
+
+    def test_no_statement_falls_back_to_a_table_scan(self):
+        with temporary_database() as conn, \
+                mock.patch.object(game_manager_module, "download_steam_artwork", return_value=None), \
+                mock.patch.object(game_manager_module, "download_steam_artwork_batch", return_value={}), \
+                mock.patch.object(game_manager_module, "queue_steam_artwork_download"):
+            seed_library(conn, 300)
+            with capture_statements(conn) as statements:
+                _exercise_game_manager(GameManager())
+
+            checked = 0
+            for sql in dict.fromkeys(statements):
+                if sql.lstrip().split(None, 1)[0].upper() in SKIPPED_COMMANDS: continue
+                plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+                checked += 1
+                scans = [line for line in plan
+                         if line.startswith("SCAN") and not INDEXED_SCAN_RE.search(line)
+                         and line.split()[1] not in ALLOWED_FULL_SCANS]
+                with self.subTest(sql=" ".join(sql.split())[:120]):
+                    self.assertEqual(scans, [], f"varredura sem índice: {plan}")
+            self.assertGreater(checked, 30)
+
+
+if __name__ == "__main__":
+    unittest.main()